@@ -21,8 +21,9 @@ def clear_database():
             count_before = result_before.fetchone()[0]
             print(f"📊 Propiedades antes de limpiar: {count_before}")
             
-            # Limpiar base de datos
-            result_delete = conn.execute(text("DELETE FROM properties"))
+            # Limpiar base de datos (properties es una vista sobre listings):
+            # TRUNCATE vacía listings y todas las particiones de observations sin borrar fila a fila
+            conn.execute(text("TRUNCATE listings, observations"))
             conn.commit()
             
             # Verificar después
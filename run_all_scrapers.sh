@@ -13,17 +13,33 @@ PROJECT_DIR="/root/scraper_project"
 
 start_time=$(date +%s)
 
+echo "🗄️ Aplicando migraciones del esquema..."
+docker run --rm \
+    --network "$DOCKER_NETWORK" \
+    -e DATABASE_URL="$DATABASE_URL" \
+    -v "$PROJECT_DIR:/app" \
+    -w /app \
+    "$DOCKER_IMAGE" \
+    alembic upgrade head
+
+if [ $? -ne 0 ]; then
+    echo "❌ ERROR AL APLICAR LAS MIGRACIONES: no se ejecutan los scrapers"
+    exit 2
+fi
+
 echo "📋 Ejecutando todos los scrapers con runner optimizado..."
 echo ""
 
-# Ejecutar todos los scrapers usando el runner con timeout de 60 minutos
+# Ejecutar todos los scrapers en paralelo (cada uno con su timeout, SCRAPER_TIMEOUT);
+# el timeout de 60 minutos sólo es la red de seguridad del contenedor.
+# Código de salida del runner: 0 = todos bien, 1 = fallo parcial, 2 = fallan todos
 timeout 3600 docker run --rm \
     --network "$DOCKER_NETWORK" \
     -e DATABASE_URL="$DATABASE_URL" \
     -v "$PROJECT_DIR:/app" \
     -w /app \
     "$DOCKER_IMAGE" \
-    python -c "from src.scrapers.runner import run_all_scrapers; run_all_scrapers()"
+    python -m src.scrapers.runner
 
 exit_code=$?
 end_time=$(date +%s)
@@ -34,12 +50,25 @@ echo "=================================================="
 
 if [ $exit_code -eq 0 ]; then
     echo "✅ SCRAPING COMPLETADO EXITOSAMENTE"
+elif [ $exit_code -eq 1 ]; then
+    echo "⚠️ SCRAPING COMPLETADO CON FALLOS PARCIALES (código: $exit_code)"
 else
     echo "❌ ERROR EN EL SCRAPING (código: $exit_code)"
 fi
 
 echo "⏱️  Tiempo total: ${execution_time} segundos"
 
+# Retención del historial: elimina las particiones mensuales caducadas (OBSERVATIONS_RETENTION_MONTHS)
+echo ""
+echo "🧹 Retención del historial..."
+docker run --rm \
+    --network "$DOCKER_NETWORK" \
+    -e DATABASE_URL="$DATABASE_URL" \
+    -v "$PROJECT_DIR:/app" \
+    -w /app \
+    "$DOCKER_IMAGE" \
+    python -m src.database.partitions retention
+
 # Estadísticas de vigencia después del scraping
 echo ""
 echo "📊 ESTADÍSTICAS DE VIGENCIA:"
@@ -51,44 +80,7 @@ docker run --rm \
     -v "$PROJECT_DIR:/app" \
     -w /app \
     "$DOCKER_IMAGE" \
-    python -c "
-from src.database.connection import engine
-from sqlalchemy import text
-from datetime import datetime, timedelta
-
-with engine.connect() as conn:
-    # Total de propiedades
-    total_result = conn.execute(text('SELECT COUNT(*) FROM properties WHERE price IS NOT NULL AND price > 0'))
-    total = total_result.fetchone()[0]
-    
-    # Propiedades vigentes (menos de 3 días)
-    vigent_result = conn.execute(text(
-        'SELECT COUNT(*) FROM properties WHERE price IS NOT NULL AND price > 0 AND scraping_date >= %s'
-    ), (datetime.now() - timedelta(days=3),))
-    vigent = vigent_result.fetchone()[0]
-    
-    # Propiedades inactivas (más de 7 días)
-    inactive_result = conn.execute(text(
-        'SELECT COUNT(*) FROM properties WHERE price IS NOT NULL AND price > 0 AND scraping_date < %s'
-    ), (datetime.now() - timedelta(days=7),))
-    inactive = inactive_result.fetchone()[0]
-    
-    vigency_percentage = (vigent / total * 100) if total > 0 else 0
-    
-    print(f'📈 Total propiedades: {total}')
-    print(f'🟢 Propiedades vigentes (≤3 días): {vigent} ({vigency_percentage:.1f}%)')
-    print(f'🔴 Propiedades inactivas (≥7 días): {inactive}')
-    
-    # Ubicaciones especiales
-    special_result = conn.execute(text(
-        \"SELECT location, COUNT(*) as count FROM properties WHERE location IN ('Pas de la Casa', 'Arinsal', 'Bordes d\\'Envalira') AND price IS NOT NULL AND price > 0 GROUP BY location ORDER BY count DESC\"
-    ))
-    
-    print('')
-    print('🏔️  Ubicaciones especiales detectadas:')
-    for row in special_result:
-        print(f'   • {row[0]}: {row[1]} propiedades')
-"
+    python -m src.database.stats
 
 echo ""
 echo "🏁 PROCESO COMPLETO FINALIZADO - $(date)"
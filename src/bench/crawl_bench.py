@@ -0,0 +1,128 @@
+"""
+Benchmark de carga de los scrapers contra los sitios sintéticos
+===============================================================
+
+Arranca MockSiteServer en segundo plano, apunta cada scraper a él
+y mide páginas/s y filas/s.
+
+Uso:
+    python -m src.bench.crawl_bench --listings 100000 --latency-ms 20
+    python -m src.bench.crawl_bench --listings 5000 --scraper ClausScraper --with-db
+"""
+
+import argparse
+import threading
+import time
+
+from ..fetch import FetchClient, set_client
+from ..scrapers.claus_sql import ClausScraper
+from ..scrapers.nouaire_sql import NouaireScraper
+from ..scrapers.expofinques_sql import ExpofinquesScraper
+from ..scrapers.pisoscom_sql import PisoscomScraper
+from .instrument import instrument_writes, print_results_table
+from .mock_sites import MockSiteServer, PISOSCOM_PAGE_SIZE
+
+
+def point_claus(scraper, base_url, listings):
+    scraper.base_url = f"{base_url}/7claus"
+    scraper.listing_url = f"{base_url}/7claus/cercador/pisos/"
+
+
+def point_nouaire(scraper, base_url, listings):
+    scraper.base_url = f"{base_url}/nouaire"
+
+
+def point_expofinques(scraper, base_url, listings):
+    scraper.base_url = f"{base_url}/expofinques"
+    scraper.search_url = f"{base_url}/expofinques/es/venta"
+
+
+def point_pisoscom(scraper, base_url, listings):
+    scraper.base_url = base_url
+    scraper.search_url = f"{base_url}/venta/pisos-andorra/hasta-400000/"
+    scraper.max_pages = listings // PISOSCOM_PAGE_SIZE + 1
+
+
+# Scrapers cubiertos por los sitios sintéticos y cómo apuntarlos al servidor local
+BENCH_TARGETS = [
+    (ClausScraper, point_claus),
+    (NouaireScraper, point_nouaire),
+    (ExpofinquesScraper, point_expofinques),
+    (PisoscomScraper, point_pisoscom),
+]
+
+
+def run_benchmark(listings=1000, latency=0.0, scraper_names=None, with_db=False, rate_limit=False):
+    """
+    Ejecuta cada scraper contra el servidor sintético y devuelve las métricas
+    """
+    targets = BENCH_TARGETS
+    if scraper_names:
+        wanted = {name.lower() for name in scraper_names}
+        targets = [t for t in targets if t[0].__name__.lower() in wanted]
+
+    server = MockSiteServer(listings=listings, latency=latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"🧪 Sitios sintéticos en {server.base_url} ({listings} anuncios por sitio)")
+
+    results = []
+    try:
+        with instrument_writes([t[0] for t in targets], no_db=not with_db) as counter:
+            for scraper_class, point_at in targets:
+                client = FetchClient(cache=False, deadline_seconds=0, rate_limit=rate_limit)
+                set_client(client)
+                counter.reset()
+
+                scraper = scraper_class()
+                point_at(scraper, server.base_url, listings)
+
+                print(f"\n🚀 {scraper_class.__name__}")
+                start = time.perf_counter()
+                try:
+                    scraper.run()
+                except Exception as e:
+                    print(f"Error en {scraper_class.__name__}: {e}")
+                elapsed = time.perf_counter() - start
+
+                pages = sum(s['requests'] for s in client.stats().values())
+                results.append({
+                    'scraper': scraper_class.__name__,
+                    'seconds': elapsed,
+                    'pages': pages,
+                    'rows': counter.rows,
+                    'pages_per_s': pages / elapsed if elapsed else 0.0,
+                    'rows_per_s': counter.rows / elapsed if elapsed else 0.0,
+                })
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de scrapers contra sitios sintéticos")
+    parser.add_argument('--listings', type=int, default=1000, help="Anuncios por sitio")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Latencia media por respuesta")
+    parser.add_argument('--scraper', action='append', help="Limitar a un scraper (nombre de clase)")
+    parser.add_argument('--with-db', action='store_true', help="Escribir realmente en PostgreSQL")
+    parser.add_argument('--rate-limit', action='store_true', help="Activar el limitador adaptativo por host")
+    args = parser.parse_args()
+
+    results = run_benchmark(listings=args.listings, latency=args.latency_ms / 1000,
+                            scraper_names=args.scraper, with_db=args.with_db, rate_limit=args.rate_limit)
+
+    print(f"\n📊 RESULTADOS ({args.listings} anuncios por sitio, {args.latency_ms:.0f} ms de latencia)")
+    print_results_table(results, [
+        ('scraper', 'Scraper', '{}'),
+        ('seconds', 'Total (s)', '{:.2f}'),
+        ('pages', 'Páginas', '{}'),
+        ('rows', 'Filas', '{}'),
+        ('pages_per_s', 'Páginas/s', '{:.1f}'),
+        ('rows_per_s', 'Filas/s', '{:.1f}'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark de escritura en PostgreSQL
+====================================
+
+Compara las tres vías de escritura de propiedades con registros sintéticos:
+    save_property          -> un upsert (y un commit) por fila
+    save_properties_batch  -> un upsert por lote de --batch-size filas
+    copy                   -> COPY a una tabla temporal + un INSERT ... SELECT
+
+Cada vía se mide dos veces por tamaño: la primera pasada inserta (filas
+nuevas) y la segunda vuelve a escribir las mismas URLs (actualizaciones).
+Escribe en la base de datos de DATABASE_URL con website='bench' y borra
+esas filas (y sus observaciones) al terminar cada medición.
+
+Uso:
+    python -m src.bench.db_write_bench
+    python -m src.bench.db_write_bench --sizes 1000 10000 100000 --max-per-row 10000
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from ..database.connection import engine, create_tables
+from ..database.operations import PropertyRepository
+from ..database.bulk import copy_properties
+from .instrument import print_results_table
+
+BENCH_WEBSITE = 'bench'
+
+
+def synthetic_records(count, method):
+    return [{
+        'reference': f"B{i}",
+        'operation': 'Venta',
+        'price': 150000 + i,
+        # Como los scrapers (convertir_a_entero): habitaciones y baños llegan como float
+        'rooms': float(i % 5),
+        'bathrooms': float(i % 3),
+        'surface': 50.0 + i % 200,
+        'title': f"Piso de prueba {i}",
+        'location': 'Andorra la Vella',
+        'address': 'N/A',
+        'url': f"https://bench.local/{method}/{i}",
+        'website': BENCH_WEBSITE,
+    } for i in range(count)]
+
+
+def write_per_row(records, batch_size):
+    for record in records:
+        PropertyRepository.save_property(record)
+
+
+def write_batches(records, batch_size):
+    for i in range(0, len(records), batch_size):
+        PropertyRepository.save_properties_batch(records[i:i + batch_size])
+
+
+def write_copy(records, batch_size):
+    copy_properties(records)
+
+
+METHODS = [
+    ('save_property', write_per_row),
+    ('save_properties_batch', write_batches),
+    ('copy', write_copy),
+]
+
+
+def clean_bench_rows():
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM listings WHERE website = :website"), {'website': BENCH_WEBSITE})
+
+
+def run_benchmark(sizes=(1000, 10000, 100000), batch_size=200, max_per_row=10000):
+    """
+    Mide cada vía de escritura para cada tamaño y devuelve las métricas
+    """
+    create_tables()
+    clean_bench_rows()
+
+    results = []
+    for size in sizes:
+        for method, write in METHODS:
+            if method == 'save_property' and size > max_per_row:
+                print(f"⏭️ {method} con {size} filas omitido (--max-per-row {max_per_row})")
+                continue
+
+            records = synthetic_records(size, method)
+            timings = {}
+            try:
+                for phase in ('insert', 'update'):
+                    start = time.perf_counter()
+                    write(records, batch_size)
+                    timings[phase] = time.perf_counter() - start
+            finally:
+                clean_bench_rows()
+
+            results.append({
+                'method': method,
+                'rows': size,
+                'insert_s': timings['insert'],
+                'update_s': timings['update'],
+                'insert_rows_per_s': size / timings['insert'] if timings['insert'] else 0.0,
+                'update_rows_per_s': size / timings['update'] if timings['update'] else 0.0,
+            })
+            print(f"✅ {method} con {size} filas: {timings['insert']:.2f}s insert, {timings['update']:.2f}s update")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escritura: save_property vs lotes vs COPY")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="Filas por medición")
+    parser.add_argument('--batch-size', type=int, default=200, help="Filas por lote en save_properties_batch")
+    parser.add_argument('--max-per-row', type=int, default=10000,
+                        help="Tamaño máximo para save_property (una transacción por fila)")
+    args = parser.parse_args()
+
+    results = run_benchmark(sizes=args.sizes, batch_size=args.batch_size, max_per_row=args.max_per_row)
+
+    print(f"\n📊 RESULTADOS (lotes de {args.batch_size} filas)")
+    print_results_table(results, [
+        ('method', 'Método', '{}'),
+        ('rows', 'Filas', '{}'),
+        ('insert_s', 'Insert (s)', '{:.2f}'),
+        ('update_s', 'Update (s)', '{:.2f}'),
+        ('insert_rows_per_s', 'Insert filas/s', '{:.0f}'),
+        ('update_rows_per_s', 'Update filas/s', '{:.0f}'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Comprobación de planes de consulta (EXPLAIN)
+============================================
+
+Ejecuta EXPLAIN (FORMAT JSON) sobre las consultas de cada vía de acceso y
+comprueba que el plan usa el índice esperado (o, en tablas particionadas,
+el índice de alguna de sus particiones). Con tablas pequeñas el
+planificador prefiere leer la tabla entera, así que por defecto se
+desactiva el seq scan dentro de la transacción: se comprueba que el índice
+es utilizable para la consulta, no que sea la opción más barata hoy.
+
+Devuelve código de salida 1 si alguna consulta no usa su índice (sirve
+como prueba tras `alembic upgrade head`).
+
+Uso:
+    python -m src.bench.explain_indexes
+    python -m src.bench.explain_indexes --no-force --verbose
+"""
+
+import argparse
+import json
+import sys
+
+from sqlalchemy import text
+
+from ..database.connection import engine
+from .instrument import print_results_table
+
+# (nombre, consulta, índice esperado en el plan)
+ACCESS_PATHS = [
+    ('propiedad por URL',
+     "SELECT * FROM listings WHERE url_hash = md5('https://example.com/piso')",
+     'listings_pkey'),
+    ('dashboard (price > 0 por timestamp)',
+     "SELECT * FROM properties WHERE price IS NOT NULL AND price > 0 ORDER BY timestamp DESC",
+     'idx_listings_priced_first_seen'),
+    ('vigencia (≤3 días)',
+     "SELECT count(*) FROM listings WHERE price > 0 AND last_seen >= now() - interval '3 days'",
+     'idx_listings_priced_last_seen'),
+    ('por sitio',
+     "SELECT count(*), max(last_seen) FROM listings WHERE website = 'www.nouaire.ad'",
+     'idx_listings_website'),
+    ('por población',
+     "SELECT location, count(*), avg(price) FROM listings "
+     "WHERE location IN ('Pas de la Casa', 'Arinsal') AND price > 0 GROUP BY location",
+     'idx_listings_priced_location'),
+    ('historial por fechas',
+     "SELECT avg(price) FROM observations WHERE scraping_date >= now() - interval '30 days'",
+     'idx_observations_scraping_date_brin'),
+]
+
+
+def plan_indexes(plan):
+    """Nombres de índice que aparecen en un nodo del plan y sus hijos"""
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= plan_indexes(child)
+    return names
+
+
+def index_family(conn, name):
+    """
+    El índice y los de sus particiones: en observations (particionada) el
+    plan nombra el índice de cada partición (observations_y2026m10_scraping_date_idx)
+    """
+    rows = conn.execute(text("""
+        WITH RECURSIVE family(oid) AS (
+            SELECT oid FROM pg_class WHERE relname = :name AND relkind IN ('i', 'I')
+            UNION
+            SELECT pg_inherits.inhrelid FROM pg_inherits JOIN family ON pg_inherits.inhparent = family.oid
+        )
+        SELECT relname FROM pg_class JOIN family USING (oid)
+    """), {'name': name}).scalars()
+    return set(rows) | {name}
+
+
+def plan_nodes(plan):
+    nodes = [plan['Node Type']]
+    for child in plan.get('Plans', []):
+        nodes += plan_nodes(child)
+    return nodes
+
+
+def check_plans(force=True, verbose=False):
+    """
+    Devuelve un resultado por vía de acceso: índice esperado, nodos del plan y si lo usa
+    """
+    results = []
+    # Sin commit: al cerrar la conexión la transacción (y el SET LOCAL) se descarta
+    with engine.connect() as conn:
+        if force:
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, query, expected in ACCESS_PATHS:
+            raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}")).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+            used = plan_indexes(plan)
+            results.append({
+                'path': name,
+                'expected': expected,
+                'nodes': ' > '.join(plan_nodes(plan)),
+                'ok': '✅' if used & index_family(conn, expected) else '❌',
+            })
+            if verbose:
+                print(f"\n🔎 {name}\n{json.dumps(plan, indent=2)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprueba que las consultas usan sus índices (EXPLAIN)")
+    parser.add_argument('--no-force', action='store_true',
+                        help="No desactivar el seq scan (plan real con las estadísticas actuales)")
+    parser.add_argument('--verbose', action='store_true', help="Imprimir el plan completo de cada consulta")
+    args = parser.parse_args()
+
+    results = check_plans(force=not args.no_force, verbose=args.verbose)
+
+    print("\n📊 PLANES POR VÍA DE ACCESO")
+    print_results_table(results, [
+        ('ok', '', '{}'),
+        ('path', 'Consulta', '{}'),
+        ('expected', 'Índice esperado', '{}'),
+        ('nodes', 'Plan', '{}'),
+    ])
+    sys.exit(0 if all(result['ok'] == '✅' for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from ..database.operations import PropertyRepository, DescriptionRepository
+
+
+class WriteCounter:
+    """
+    Filas y tiempo de escritura observados durante un benchmark
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.write_time = 0.0
+
+    def reset(self):
+        self.rows = 0
+        self.write_time = 0.0
+
+
+@contextmanager
+def instrument_writes(scraper_classes, no_db=False):
+    """
+    Envuelve las escrituras de PropertyRepository (upsert_properties) para
+    contar filas y tiempo.
+    Con no_db=True las escrituras, create_tables y la caché de descripciones
+    no tocan la base de datos, de forma que sólo se mide fetch + parseo +
+    normalización.
+    """
+    counter = WriteCounter()
+    upsert_properties = PropertyRepository.upsert_properties
+
+    def counted_upsert_properties(properties_data):
+        start = time.perf_counter()
+        if no_db:
+            result = {'new': len(properties_data), 'updated': 0}
+        else:
+            result = upsert_properties(properties_data)
+        counter.write_time += time.perf_counter() - start
+        counter.rows += len(properties_data)
+        return result
+
+    with ExitStack() as stack:
+        # save_property y save_properties_batch también pasan por upsert_properties
+        stack.enter_context(mock.patch.object(PropertyRepository, 'upsert_properties',
+                                              staticmethod(counted_upsert_properties)))
+        if no_db:
+            stack.enter_context(mock.patch.object(DescriptionRepository, 'get_descriptions_by_website',
+                                                  staticmethod(lambda website: {})))
+            stack.enter_context(mock.patch.object(DescriptionRepository, 'save_description',
+                                                  staticmethod(lambda *args: True)))
+            # create_tables se llama desde el módulo del scraper o desde el de su clase base
+            modules = {sys.modules[cls.__module__] for scraper_class in scraper_classes
+                       for cls in scraper_class.__mro__}
+            for module in modules:
+                if hasattr(module, 'create_tables'):
+                    stack.enter_context(mock.patch.object(module, 'create_tables', lambda: None))
+        yield counter
+
+
+def print_results_table(results, columns):
+    """
+    Imprime una tabla simple de resultados: results es una lista de dicts
+    y columns una lista de (clave, cabecera, formato)
+    """
+    headers = [header for _, header, _ in columns]
+    rows = [[fmt.format(result[key]) for key, _, fmt in columns] for result in results]
+    widths = [max(len(h), *(len(r[i]) for r in rows)) if rows else len(h) for i, h in enumerate(headers)]
+
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(value.ljust(w) for value, w in zip(row, widths)))
@@ -0,0 +1,367 @@
+"""
+Servidor HTTP local con sitios inmobiliarios sintéticos
+=======================================================
+
+Genera páginas de listado y detalle con el marcado de cada sitio real
+(7claus, nouaire, expofinques y pisos.com) con tamaño y latencia configurables,
+para pruebas de carga sin tocar los sitios reales.
+
+Rutas:
+- 7claus:      /7claus/cercador/pisos/            (todas las tarjetas div.cardAnuncio)
+               /7claus/detall/<id>
+- nouaire:     /nouaire/prop/comprar              (contador de propiedades)
+               /nouaire/prop/buscador/limit:100/page:<n>   (filas div.row.pt10.pb10)
+               /nouaire/prop/detalle/<id>
+- expofinques: /expofinques/es/venta              (tabla #infoListado con 20+ celdas)
+               /expofinques/es/inmueble/<id>
+- pisos.com:   /venta/pisos-andorra/hasta-400000/[<n>/]   (enlaces /comprar/)
+               /comprar/<tipo>-<ubicacion>-<id>/
+
+finques_listing() y pisosad_listing() no tienen ruta: sólo los usa
+parser_bench para comprobar sus strainers.
+
+Uso:
+    python -m src.bench.mock_sites --listings 100000 --latency-ms 50 --port 8900
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ubicaciones de los anuncios sintéticos (incluye poblaciones especiales y una fuera de Andorra)
+LOCATIONS = [
+    'Andorra la Vella', 'Escaldes-Engordany', 'Encamp', 'La Massana', 'Canillo',
+    'Ordino', 'Sant Julia de Loria', 'Soldeu', 'El Tarter', 'Arinsal', 'Pas de la Casa',
+    'Perpignan',
+]
+PROPERTY_TYPES = ['Pis', 'Apartament', 'Atic', 'Duplex', 'Estudi', 'Xalet']
+
+NOUAIRE_PAGE_SIZE = 100
+PISOSCOM_PAGE_SIZE = 30
+
+
+def listing(i):
+    """
+    Datos deterministas del anuncio número i
+    """
+    rnd = random.Random(i)
+    location = rnd.choice(LOCATIONS)
+    property_type = rnd.choice(PROPERTY_TYPES)
+    description = (
+        f"{property_type} luminós situat a {location}, a prop de totes les botigues i serveis. "
+        "Ubicación excelente con vistas a la montaña, calefacción central y trastero incluido. " * 3
+    )
+    # Parte de los anuncios de Encamp / La Massana / Canillo están realmente en los pueblos especiales
+    if location == 'Encamp' and rnd.random() < 0.3:
+        description += " Situat al Pas de la Casa, a peu de pistes."
+    elif location == 'La Massana' and rnd.random() < 0.3:
+        description += " A l'estació d'Arinsal."
+    elif location == 'Canillo' and rnd.random() < 0.3:
+        description += " Zona Bordes d'Envalira."
+
+    return {
+        'id': i,
+        'type': property_type,
+        'location': location,
+        'price': rnd.randrange(60, 900) * 1000,
+        'rooms': rnd.randint(0, 5),
+        'bathrooms': rnd.randint(1, 3),
+        'surface': rnd.randint(25, 250),
+        'reference': f"REF-{i:06d}",
+        'description': description,
+    }
+
+
+def price_text(price):
+    return f"{price:,}".replace(',', '.') + " €"
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+
+def page(body, title="Mock"):
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>{body}</body></html>"
+
+
+# ===== 7CLAUS =====
+
+def claus_listing(count):
+    cards = []
+    for i in range(count):
+        p = listing(i)
+        cards.append(
+            # Los destacados llevan una segunda clase en la tarjeta
+            f"<div class='{'cardAnuncio destacado' if i % 3 == 0 else 'cardAnuncio'}'>"
+            f"<span class='titulo'>{p['type']} a {p['location']}</span>"
+            f"<span class='contRef'>{p['reference']}</span>"
+            f"<div class='precio'>{price_text(p['price'])}\n<small>IVA inclòs</small></div>"
+            f"<ul><li><div>Habs</div><div>{p['rooms']}</div></li>"
+            f"<li><div>Banys</div><div>{p['bathrooms']}</div></li>"
+            f"<li><div>m²</div><div>{p['surface']}</div></li></ul>"
+            f"<div class='btnContacto' data-url='/detall/{i}#contacte'>Contacte</div>"
+            f"</div>"
+        )
+    return page("".join(cards), "7claus")
+
+
+def claus_detail(i):
+    p = listing(i)
+    return page(f"<h1>{p['type']} a {p['location']}</h1><div class='descripcion'>{p['description']}</div>")
+
+
+# ===== NOUAIRE =====
+
+def nouaire_count(count):
+    return page(f"<div><i class='fa fa-building'></i> <span>{count} propiedades</span></div>", "nouaire")
+
+
+def nouaire_listing(page_num, count):
+    start = (page_num - 1) * NOUAIRE_PAGE_SIZE
+    rows = []
+    for i in range(start, min(start + NOUAIRE_PAGE_SIZE, count)):
+        p = listing(i)
+        rows.append(
+            f"<div class='row pt10 pb10'>"
+            f"<div class='col-xs-12 visible-xs-inline'><span>Venta</span> "
+            f"<a href='/prop/detalle/{i}'>Venta {p['type']} en {p['location']}</a></div>"
+            f"<div class='col-xs-12 col-sm-2 hidden-xs'><a href='/prop/detalle/{i}'>{p['reference']}</a></div>"
+            f"<div class='col-xs-1'><i class='fa fa-square' title='Venta'></i></div>"
+            f"<div class='col-xs-4 col-sm-2 hidden-xs'>{p['type']}</div>"
+            f"<div class='col-xs-8 col-sm-2 hidden-xs'>{p['location']}</div>"
+            f"<div class='col-xs-6 col-sm-1'>{p['surface']}m²</div>"
+            f"<div class='col-xs-6 col-sm-1 strong text-right'><i class='fa fa-bed visible-xs-inline'></i>{p['rooms']}</div>"
+            f"<div class='col-xs-6 col-sm-1 strong text-right'><i class='fa fa-bath visible-xs-inline'></i>{p['bathrooms']}</div>"
+            f"<div class='col-xs-6 col-sm-1 text-right'>{price_text(p['price'])}</div>"
+            f"</div>"
+        )
+    return page("".join(rows), "nouaire")
+
+
+def nouaire_detail(i):
+    p = listing(i)
+    return page(f"<div class='panel'><div>Descripción</div></div><div class='texto'>{p['description']}</div>")
+
+
+# ===== EXPOFINQUES =====
+
+def expofinques_listing(count):
+    rows = []
+    for i in range(count):
+        p = listing(i)
+        cells = [''] * 20
+        cells[0] = f"<a href='/es/inmueble/{i}'><img src='/img/{i}.jpg'></a>"
+        cells[1] = str(i)
+        cells[2] = p['reference']
+        cells[3] = p['type']
+        cells[4] = p['location']
+        cells[5] = price_text(p['price'])
+        cells[6] = f"{p['surface']} m²"
+        cells[7] = str(p['rooms'])
+        cells[8] = str(p['bathrooms'])
+        cells[15] = p['description'][:120]
+        cells[18] = f"{p['type']} en {p['location']}"
+        rows.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+    return page(f"<table id='infoListado'><thead><tr><th>Ref</th></tr></thead><tbody>{''.join(rows)}</tbody></table>",
+                "expofinques")
+
+
+def expofinques_detail(i):
+    p = listing(i)
+    return page(f"<h1>{p['type']}</h1><div class='descripcion'>{p['description']}</div>")
+
+
+# ===== FINQUESMARCA =====
+
+def finques_listing(count):
+    cards = []
+    for i in range(count):
+        p = listing(i)
+        path = f"/ca/venda/{slug(p['type'])}/{i}"
+        # Enlace en la imagen y en el cuerpo del card (el de div.img se descarta), como en el sitio real
+        cards.append(
+            f"<div class='col-md-4'><div class='card h-100'>"
+            f"<div class='img'><a class='url-inmueble' data-path='{path}'><img src='/img/{i}.jpg'></a></div>"
+            f"<div class='card-body'>"
+            f"<a class='url-inmueble stretched-link' data-path='{path}'>"
+            f"<span class='contTitulo'>{p['type']} a {p['location']}</span></a>"
+            f"<span class='contRef'>Ref. {p['reference']}</span>"
+            f"<span class='precio'>{price_text(p['price'])}</span>"
+            f"</div></div></div>"
+        )
+    return page("".join(cards), "finquesmarca")
+
+
+# ===== PISOS.AD =====
+
+def pisosad_listing(count):
+    links = [
+        "<a class='nav-link active' href='/venda'>Venda</a>",
+        "<a class='nav-link' href='/venda/pis/tots-subtipus'>Pisos</a>",
+        "<a class='btn btn-whatsapp' href='https://wa.me/376000000'>WhatsApp</a>",
+        "<a class='btn btn-phone' href='tel:+376000000'>Trucar</a>",
+    ]
+    for i in range(count):
+        p = listing(i)
+        links.append(
+            f"<div class='card property-card'>"
+            f"<a class='card-link stretched-link' href='/venda/{slug(p['type'])}/{i}'>{p['type']} a {p['location']}</a>"
+            f"<span class='price'>{price_text(p['price'])}</span>"
+            f"</div>"
+        )
+    return page("".join(links), "pisos.ad")
+
+
+# ===== PISOS.COM =====
+
+def pisoscom_url(p):
+    return f"/comprar/{slug(p['type'])}-{slug(p['location'])}-{p['id']}/"
+
+
+def pisoscom_listing(page_num, count):
+    start = (page_num - 1) * PISOSCOM_PAGE_SIZE
+    cards = []
+    for i in range(start, min(start + PISOSCOM_PAGE_SIZE, count)):
+        p = listing(i)
+        url = pisoscom_url(p)
+        # Cada tarjeta repite el enlace (imagen + título), como en el sitio real
+        cards.append(
+            f"<div class='ad-preview'>"
+            f"<a href='{url}'><img src='/img/{i}.jpg'></a>"
+            f"<a class='ad-preview__title' href='{url}'>{p['type']} en {p['location']}</a>"
+            f"<p class='ad-preview__subtitle'>{p['location']}</p>"
+            f"<span class='ad-preview__price'>{price_text(p['price'])}</span>"
+            f"<p class='ad-preview__char'>{p['rooms']} habs.</p>"
+            f"<p class='ad-preview__char'>{p['bathrooms']} baños</p>"
+            f"<p class='ad-preview__char'>{p['surface']} m²</p>"
+            f"</div>"
+        )
+    return page("".join(cards), "pisos.com")
+
+
+def pisoscom_json_ld(p):
+    return json.dumps({
+        '@context': 'https://schema.org',
+        '@type': 'Apartment',
+        'name': f"{p['type']} en {p['location']}",
+        'description': p['description'],
+        'numberOfRooms': p['rooms'],
+        'numberOfBathroomsTotal': p['bathrooms'],
+        'floorSize': {'@type': 'QuantitativeValue', 'value': p['surface'], 'unitCode': 'MTK'},
+        'address': {'@type': 'PostalAddress', 'addressLocality': p['location'], 'addressCountry': 'AD'},
+        'offers': {'@type': 'Offer', 'price': p['price'], 'priceCurrency': 'EUR'},
+    })
+
+
+def pisoscom_detail(i):
+    p = listing(i)
+    # Como en el sitio real, no todas las fichas llevan JSON-LD
+    json_ld = f"<script type='application/ld+json'>{pisoscom_json_ld(p)}</script>" if i % 4 else ""
+    return page(
+        json_ld +
+        f"<h1>{p['type']} en {p['location']}</h1>"
+        f"<div class='priceBox'><span class='price'>{price_text(p['price'])}</span></div>"
+        f"<ul class='features'><li>{p['rooms']} habs.</li><li>{p['bathrooms']} baños</li><li>{p['surface']} m²</li></ul>"
+        f"<div class='description'>{p['description']}</div>"
+    )
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """
+    Enruta las peticiones a los generadores de cada sitio
+    """
+
+    routes = [
+        (re.compile(r'^/7claus/cercador/'), lambda m, n: claus_listing(n)),
+        (re.compile(r'^/7claus/detall/(\d+)'), lambda m, n: claus_detail(int(m.group(1)))),
+        (re.compile(r'^/nouaire/prop/comprar'), lambda m, n: nouaire_count(n)),
+        (re.compile(r'^/nouaire/prop/buscador/limit:100/page:(\d+)'), lambda m, n: nouaire_listing(int(m.group(1)), n)),
+        (re.compile(r'^/nouaire/prop/detalle/(\d+)'), lambda m, n: nouaire_detail(int(m.group(1)))),
+        (re.compile(r'^/expofinques/es/venta'), lambda m, n: expofinques_listing(n)),
+        (re.compile(r'^/expofinques/es/inmueble/(\d+)'), lambda m, n: expofinques_detail(int(m.group(1)))),
+        (re.compile(r'^/venta/pisos-andorra/hasta-400000/(?:(\d+)/)?$'),
+         lambda m, n: pisoscom_listing(int(m.group(1) or 1), n)),
+        (re.compile(r'^/comprar/[^/]*-(\d+)/$'), lambda m, n: pisoscom_detail(int(m.group(1)))),
+    ]
+
+    def do_GET(self):
+        latency = self.server.latency
+        if latency:
+            time.sleep(latency * random.uniform(0.5, 1.5))
+
+        path = self.path.split('?')[0]
+        for pattern, render in self.routes:
+            match = pattern.match(path)
+            if match:
+                self.respond(render(match, self.server.listings).encode('utf-8'))
+                return
+
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def respond(self, body):
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.server.etags and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.etags:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockSiteServer(ThreadingHTTPServer):
+    """
+    Servidor de sitios sintéticos: `listings` anuncios por sitio y
+    `latency` segundos de latencia media por respuesta
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, listings=1000, latency=0.0, etags=False):
+        super().__init__((host, port), MockSiteHandler)
+        self.listings = listings
+        self.latency = latency
+        self.etags = etags
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de sitios inmobiliarios sintéticos")
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--listings', type=int, default=1000, help="Anuncios por sitio")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Latencia media por respuesta")
+    parser.add_argument('--etags', action='store_true', help="Enviar ETag y responder 304 a If-None-Match")
+    args = parser.parse_args()
+
+    server = MockSiteServer(port=args.port, listings=args.listings,
+                            latency=args.latency_ms / 1000, etags=args.etags)
+    print(f"🧪 Sitios sintéticos en {server.base_url} ({args.listings} anuncios por sitio)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark del pool de parseo
+============================
+
+Parsea fichas sintéticas de 7claus (descripcion_generica) desde varios hilos,
+como lo hacen los scrapers con DetailFetcher, con distinto número de procesos
+de parseo, y compara las páginas/s con el parseo en los propios hilos.
+Antes de medir comprueba que el pool devuelve lo mismo que el parseo directo.
+
+Uso:
+    python -m src.bench.parse_pool_bench --pages 2000 --workers 0 2 4 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..fetch.concurrent import DETAIL_WORKERS
+from ..parsing import ParsePool
+from ..parsing.workers import descripcion_generica
+from . import mock_sites
+from .instrument import print_results_table
+
+
+def run_benchmark(pages=2000, worker_counts=(0, 2, 4), threads=DETAIL_WORKERS):
+    contents = [(f"/7claus/detall/{i}", mock_sites.claus_detail(i).encode('utf-8')) for i in range(pages)]
+    expected = [descripcion_generica(url, content) for url, content in contents[:20]]
+
+    results = []
+    for workers in worker_counts:
+        pool = ParsePool(workers)
+        try:
+            # Arranque de los procesos y paridad, fuera de la medida
+            got = [pool.parse(descripcion_generica, url, content) for url, content in contents[:20]]
+            if got != expected:
+                raise AssertionError(f"{workers} procesos: el pool no coincide con el parseo directo")
+            pool.worker_stats.clear()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda item: pool.parse(descripcion_generica, *item), contents))
+            elapsed = time.perf_counter() - start
+
+            stats = pool.stats()
+            results.append({
+                'workers': workers or 'sin pool',
+                'pages': pages,
+                'seconds': elapsed,
+                'pages_per_s': pages / elapsed,
+                'busiest': max(s['pages'] for s in stats.values()),
+                'idlest': min(s['pages'] for s in stats.values()),
+            })
+            pool.print_stats()
+        finally:
+            pool.shutdown()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pool de parseo")
+    parser.add_argument('--pages', type=int, default=2000, help="Fichas a parsear")
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4], help="Procesos de parseo a probar")
+    parser.add_argument('--threads', type=int, default=DETAIL_WORKERS, help="Hilos que entregan páginas al pool")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.pages, args.workers, args.threads)
+    print(f"\n📊 POOL DE PARSEO ({args.pages} fichas, {args.threads} hilos)")
+    print_results_table(results, [
+        ('workers', 'Procesos', '{}'),
+        ('seconds', 'Tiempo (s)', '{:.2f}'),
+        ('pages_per_s', 'Páginas/s', '{:.0f}'),
+        ('busiest', 'Máx/worker', '{}'),
+        ('idlest', 'Mín/worker', '{}'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark de parseo HTML por backend
+====================================
+
+Parsea páginas sintéticas de cada sitio (src/bench/mock_sites) con cada
+tree builder disponible, con y sin SoupStrainer, y mide el tiempo por página.
+Antes de medir comprueba la paridad: los elementos que selecciona cada
+scraper deben tener el mismo texto que con html.parser sobre la página entera
+(el marcado incluye tarjetas con varias clases, como en los sitios reales).
+Para la ficha de pisos.com mide también la lectura de los datos
+estructurados (JSON-LD) sin construir el árbol, comprobando los valores.
+
+Uso:
+    python -m src.bench.parser_bench --listings 500 --repeat 20
+"""
+
+import argparse
+import re
+import time
+
+from ..parsing import parse_html, available_backends, extract_structured_data
+from . import mock_sites
+from .instrument import print_results_table
+
+
+def _texts(elements):
+    return [re.sub(r'\s+', ' ', element.get_text(' ', strip=True)) for element in elements]
+
+
+def select_claus(soup):
+    return _texts(soup.find_all('div', class_='cardAnuncio'))
+
+
+def select_nouaire(soup):
+    return _texts(soup.find_all('div', class_='row pt10 pb10'))
+
+
+def select_finques(soup):
+    links = [a for a in soup.find_all('a', class_='url-inmueble') if not a.find_parent('div', class_='img')]
+    return _texts(a.find_parent('div', class_='card') for a in links)
+
+
+def select_pisosad(soup):
+    return [a['href'] for a in soup.find_all('a', href=True)
+            if '/venda/' in a['href'] and a['href'].split('/')[-1].isdigit()]
+
+
+def select_expofinques(soup):
+    table = soup.find('table', id='infoListado')
+    return _texts(table.find('tbody').find_all('tr')) if table else []
+
+
+def select_pisoscom(soup):
+    return _texts(soup.find_all('a', href=re.compile(r'/comprar/')))
+
+
+def select_description(soup):
+    return _texts(soup.find_all('div', class_='descripcion'))
+
+
+def site_pages(listings):
+    """(sitio, html, strainer, selector) con el marcado de cada sitio"""
+    return [
+        ('7claus listado', mock_sites.claus_listing(listings), 'claus_cards', select_claus),
+        ('nouaire listado', mock_sites.nouaire_listing(1, listings), 'nouaire_rows', select_nouaire),
+        ('expofinques listado', mock_sites.expofinques_listing(listings), 'expofinques_table', select_expofinques),
+        ('finquesmarca listado', mock_sites.finques_listing(listings), 'finques_cards', select_finques),
+        ('pisos.ad listado', mock_sites.pisosad_listing(listings), 'links', select_pisosad),
+        ('pisos.com listado', mock_sites.pisoscom_listing(1, listings), None, select_pisoscom),
+        ('7claus detalle', mock_sites.claus_detail(1), None, select_description),
+    ]
+
+
+def run_benchmark(listings=500, repeat=20):
+    results = []
+
+    for site, html, strainer, select in site_pages(listings):
+        content = html.encode('utf-8')
+        reference = select(parse_html(content, backend='html.parser'))
+
+        variants = [(backend, None) for backend in available_backends()]
+        if strainer:
+            variants += [(backend, strainer) for backend in available_backends()]
+
+        for backend, only in variants:
+            selected = select(parse_html(content, only=only, backend=backend))
+            if selected != reference:
+                raise AssertionError(f"{site}: {backend} (strainer={only}) no coincide con html.parser")
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse_html(content, only=only, backend=backend)
+            elapsed = (time.perf_counter() - start) / repeat
+
+            results.append({
+                'site': site,
+                'backend': backend,
+                'strainer': only or '-',
+                'kb': len(content) / 1024,
+                'ms_per_page': elapsed * 1000,
+                'elements': len(selected),
+            })
+
+    results.extend(run_structured_benchmark(repeat))
+    return results
+
+
+def run_structured_benchmark(repeat=20):
+    """Ficha de pisos.com: datos estructurados frente a árbol DOM + regex sobre el texto"""
+    i = 1
+    expected = mock_sites.listing(i)
+    content = mock_sites.pisoscom_detail(i).encode('utf-8')
+
+    data = extract_structured_data(content)
+    got = (data.get('price'), data.get('rooms'), data.get('bathrooms'), data.get('surface'))
+    if got != (expected['price'], expected['rooms'], expected['bathrooms'], expected['surface']):
+        raise AssertionError(f"pisos.com detalle: datos estructurados {got} no coinciden con el anuncio")
+
+    def dom_fields(backend):
+        text = parse_html(content, backend=backend).get_text()
+        return [re.search(pattern, text, re.IGNORECASE)
+                for pattern in (r'(\d+)\s*habs', r'(\d+)\s*baño', r'(\d+)\s*m[²2]')]
+
+    variants = [('estructurados', lambda: extract_structured_data(content))]
+    variants += [(backend, lambda backend=backend: dom_fields(backend)) for backend in available_backends()]
+
+    results = []
+    for backend, func in variants:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = (time.perf_counter() - start) / repeat
+        results.append({
+            'site': 'pisos.com detalle',
+            'backend': backend,
+            'strainer': '-',
+            'kb': len(content) / 1024,
+            'ms_per_page': elapsed * 1000,
+            'elements': len(data['sources']) if backend == 'estructurados' else 3,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parseo HTML por backend")
+    parser.add_argument('--listings', type=int, default=500, help="Anuncios por página de listado")
+    parser.add_argument('--repeat', type=int, default=20, help="Repeticiones por medida")
+    args = parser.parse_args()
+
+    results = run_benchmark(listings=args.listings, repeat=args.repeat)
+    print(f"\n📊 PARSEO HTML ({args.listings} anuncios por listado, paridad verificada)")
+    print_results_table(results, [
+        ('site', 'Página', '{}'),
+        ('backend', 'Backend', '{}'),
+        ('strainer', 'Strainer', '{}'),
+        ('kb', 'KB', '{:.0f}'),
+        ('elements', 'Elementos', '{}'),
+        ('ms_per_page', 'ms/página', '{:.2f}'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark offline de los scrapers con respuestas grabadas
+=========================================================
+
+1. Grabar una ejecución real (red + archivo .jsonl.gz):
+    python -m src.bench.replay_bench record --archive data/run.jsonl.gz
+
+2. Reproducir el archivo sin red y medir parseo / normalización / escritura:
+    python -m src.bench.replay_bench replay --archive data/run.jsonl.gz --repeat 3
+    python -m src.bench.replay_bench replay --archive data/run.jsonl.gz --no-db
+"""
+
+import argparse
+import time
+
+from ..fetch import FetchClient, set_client
+from ..scrapers.runner import SCRAPERS
+from .instrument import instrument_writes, print_results_table
+
+
+def select_scrapers(names):
+    """
+    Filtra SCRAPERS por nombre de clase (sin distinguir mayúsculas)
+    """
+    if not names:
+        return SCRAPERS
+    wanted = {name.lower() for name in names}
+    return [cls for cls in SCRAPERS if cls.__name__.lower() in wanted]
+
+
+def record(archive, scraper_classes):
+    """
+    Ejecuta los scrapers contra los sitios reales grabando todas las respuestas
+    """
+    client = FetchClient(mode='record', archive=archive, cache=False)
+    set_client(client)
+
+    for scraper_class in scraper_classes:
+        print(f"⏺️ Grabando {scraper_class.__name__}...")
+        try:
+            scraper_class().run()
+        except Exception as e:
+            print(f"Error en {scraper_class.__name__}: {e}")
+
+    client.print_stats()
+    client.close()
+
+
+def replay(archive, scraper_classes, repeat=1, no_db=False):
+    """
+    Ejecuta los scrapers contra el archivo grabado y devuelve las métricas por scraper
+    """
+    results = []
+
+    with instrument_writes(scraper_classes, no_db=no_db) as counter:
+        for scraper_class in scraper_classes:
+            for iteration in range(1, repeat + 1):
+                client = FetchClient(mode='replay', archive=archive, cache=False, deadline_seconds=0)
+                set_client(client)
+                counter.reset()
+
+                start = time.perf_counter()
+                try:
+                    scraper_class().run()
+                except Exception as e:
+                    print(f"Error en {scraper_class.__name__}: {e}")
+                elapsed = time.perf_counter() - start
+
+                requests_made = sum(s['requests'] for s in client.stats().values())
+                fetch_time = sum(s['avg_latency'] * s['requests'] for s in client.stats().values())
+                results.append({
+                    'scraper': scraper_class.__name__,
+                    'iteration': iteration,
+                    'seconds': elapsed,
+                    'pages': requests_made,
+                    'rows': counter.rows,
+                    'pages_per_s': requests_made / elapsed if elapsed else 0.0,
+                    'rows_per_s': counter.rows / elapsed if elapsed else 0.0,
+                    'fetch_s': fetch_time,
+                    'write_s': counter.write_time,
+                    'parse_s': max(0.0, elapsed - fetch_time - counter.write_time),
+                })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline de scrapers (record / replay)")
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('--archive', default='fetch_archive.jsonl.gz', help="Archivo .jsonl.gz de respuestas")
+    parser.add_argument('--scraper', action='append', help="Limitar a un scraper (nombre de clase)")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones por scraper en replay")
+    parser.add_argument('--no-db', action='store_true', help="No escribir en PostgreSQL durante el replay")
+    args = parser.parse_args()
+
+    scraper_classes = select_scrapers(args.scraper)
+
+    if args.mode == 'record':
+        record(args.archive, scraper_classes)
+        return
+
+    results = replay(args.archive, scraper_classes, repeat=args.repeat, no_db=args.no_db)
+    print("\n📊 RESULTADOS REPLAY")
+    print_results_table(results, [
+        ('scraper', 'Scraper', '{}'),
+        ('iteration', 'Iter', '{}'),
+        ('seconds', 'Total (s)', '{:.2f}'),
+        ('pages', 'Páginas', '{}'),
+        ('rows', 'Filas', '{}'),
+        ('pages_per_s', 'Páginas/s', '{:.1f}'),
+        ('rows_per_s', 'Filas/s', '{:.1f}'),
+        ('parse_s', 'Parseo (s)', '{:.2f}'),
+        ('write_s', 'Escritura (s)', '{:.2f}'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
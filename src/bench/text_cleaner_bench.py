@@ -0,0 +1,180 @@
+"""
+Micro-benchmark de src/utils/text_cleaner
+=========================================
+
+Compara las funciones actuales (patrones compilados, memo y lotes) con la
+implementación anterior, que recompilaba los patrones en cada llamada, y
+comprueba que ambas devuelven lo mismo.
+
+Uso:
+    python -m src.bench.text_cleaner_bench --rows 100000
+"""
+
+import argparse
+import random
+import re
+import time
+import unicodedata
+
+from ..utils import text_cleaner
+from .instrument import print_results_table
+
+
+# --- Implementación anterior (referencia) ---------------------------------
+
+def legacy_limpiar_texto(texto):
+    if not texto or texto == 'N/A':
+        return 'N/A'
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = re.sub(r'[^\w\s.,€/-]', '', texto)
+    texto = re.sub(r'\s+', ' ', texto)
+    return texto.strip()
+
+
+def legacy_extraer_precio(texto):
+    if not texto:
+        return 0
+    precio_limpio = re.sub(r'[^\d.,]', '', str(texto))
+    if '.' in precio_limpio and ',' in precio_limpio:
+        precio_limpio = precio_limpio.replace('.', '').replace(',', '.')
+    elif '.' in precio_limpio:
+        partes = precio_limpio.split('.')
+        if not (len(partes) == 2 and len(partes[1]) <= 2):
+            precio_limpio = precio_limpio.replace('.', '')
+    elif ',' in precio_limpio:
+        precio_limpio = precio_limpio.replace(',', '.')
+    try:
+        return float(precio_limpio)
+    except ValueError:
+        return 0
+
+
+def legacy_convertir_a_entero(valor):
+    try:
+        decimal_match = re.search(r'(\d+(?:[.,]\d+)?)', str(valor))
+        if decimal_match:
+            return float(decimal_match.group(1).replace(',', '.'))
+        numeros = re.findall(r'\d+', str(valor))
+        return int(numeros[0]) if numeros else 0
+    except (ValueError, IndexError):
+        return 0
+
+
+def legacy_detectar_pas_de_la_casa(texto):
+    if not texto:
+        return False
+    texto_normalizado = texto.lower()
+    for patron in [r'pas\s+de\s+la\s+casa', r'pas\s+casa', r'paso\s+de\s+la\s+casa',
+                   r'paso\s+casa', r'pas\s+de\s+casa']:
+        if re.search(patron, texto_normalizado):
+            return True
+    return False
+
+
+def legacy_detectar_bordes(texto):
+    if not texto:
+        return False
+    texto_normalizado = texto.lower()
+    for patron in [r"bordes\s+d[\'']?envalira", r'bordes\s+de\s+envalira',
+                   r'bordes\s+envalira', r'\bbordes\b']:
+        if re.search(patron, texto_normalizado):
+            return True
+    return False
+
+
+# --- Datos sintéticos ------------------------------------------------------
+
+LOCATIONS = ['Andorra la Vella', 'Escaldes-Engordany', 'Encamp', 'Canillo', 'La Massana',
+             'Ordino', 'Sant Julià de Lòria', 'Pas de la Casa', 'Arinsal', "Bordes d'Envalira"]
+TYPES = ['Pis', 'Piso', 'Apartament', 'Àtic', 'Dúplex', 'Xalet', 'Casa', 'Estudio']
+
+
+def make_rows(count, seed=42):
+    """Filas parecidas a las de los scrapers: pocos valores distintos que se repiten mucho"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        price = rng.randrange(80, 450) * 1000
+        rows.append({
+            'location': f"  {rng.choice(LOCATIONS)} ",
+            'type': rng.choice(TYPES),
+            'price': f"{price:,}".replace(',', '.') + " €",
+            'surface': f"{rng.randrange(30, 200)},{rng.randrange(0, 99)} m²",
+            'description': f"Piso en {rng.choice(LOCATIONS)}, a 5 minutos de las pistas. Ref {rng.randrange(10**6)}",
+        })
+    return rows
+
+
+def timed(func, values):
+    start = time.perf_counter()
+    result = func(values)
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(rows):
+    data = make_rows(rows)
+    columns = {
+        'location': [r['location'] for r in data] + [r['type'] for r in data],
+        'price': [r['price'] for r in data],
+        'surface': [r['surface'] for r in data],
+        'description': [r['description'] for r in data],
+    }
+
+    cases = [
+        ('limpiar_texto', columns['location'], legacy_limpiar_texto, text_cleaner.limpiar_texto,
+         text_cleaner.limpiar_textos),
+        ('extraer_precio', columns['price'], legacy_extraer_precio, text_cleaner.extraer_precio,
+         text_cleaner.extraer_precios),
+        ('convertir_a_entero', columns['surface'], legacy_convertir_a_entero, text_cleaner.convertir_a_entero,
+         text_cleaner.convertir_a_enteros),
+        ('detectar_pas_de_la_casa', columns['description'], legacy_detectar_pas_de_la_casa,
+         text_cleaner.detectar_pas_de_la_casa, None),
+        ('detectar_bordes', columns['description'], legacy_detectar_bordes, text_cleaner.detectar_bordes, None),
+    ]
+
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+
+    results = []
+    for name, values, legacy, current, batch in cases:
+        legacy_time, expected = timed(lambda vs: [legacy(v) for v in vs], values)
+        current_time, got = timed(lambda vs: [current(v) for v in vs], values)
+        assert got == expected, f"{name}: resultados distintos a la implementación anterior"
+
+        result = {'function': name, 'legacy_s': legacy_time, 'current_s': current_time,
+                  'batch_s': float('nan'), 'series_s': float('nan')}
+        if batch:
+            result['batch_s'], got = timed(batch, values)
+            assert got == expected, f"{name}: el lote no coincide"
+            if pd is not None:
+                series = pd.Series(values)
+                result['series_s'], got = timed(batch, series)
+                assert got.tolist() == expected, f"{name}: la Series no coincide"
+        result['speedup'] = legacy_time / min(t for t in (result['current_s'], result['batch_s'],
+                                                           result['series_s']) if t == t)
+        results.append(result)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de text_cleaner")
+    parser.add_argument('--rows', type=int, default=100000, help="Filas sintéticas")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows)
+    print(f"\n📊 TEXT_CLEANER ({args.rows} filas)")
+    print_results_table(results, [
+        ('function', 'Función', '{}'),
+        ('legacy_s', 'Anterior (s)', '{:.3f}'),
+        ('current_s', 'Actual (s)', '{:.3f}'),
+        ('batch_s', 'Lista (s)', '{:.3f}'),
+        ('series_s', 'Series (s)', '{:.3f}'),
+        ('speedup', 'Mejora', '{:.1f}x'),
+    ])
+
+
+if __name__ == "__main__":
+    main()
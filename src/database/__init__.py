@@ -1,5 +1,7 @@
 # src/database/__init__.py
 from .connection import get_connection, create_tables, close_connection
-from .operations import PropertyRepository
+from .operations import PropertyRepository, DescriptionRepository
+from .bulk import copy_properties
 
-__all__ = ['get_connection', 'create_tables', 'close_connection', 'PropertyRepository']
\ No newline at end of file
+__all__ = ['get_connection', 'create_tables', 'close_connection', 'PropertyRepository', 'DescriptionRepository',
+           'copy_properties']
\ No newline at end of file
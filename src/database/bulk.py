@@ -0,0 +1,128 @@
+"""
+Carga masiva de propiedades con COPY.
+
+Para lotes grandes (backfills, fuentes nuevas) los registros se envían en
+streaming a una tabla temporal con COPY FROM STDIN (CSV) y después se
+integran con una sola sentencia (INSERT ... SELECT ... ON CONFLICT DO UPDATE
+en listings más una observación por propiedad en observations), con la misma
+semántica que PropertyRepository.upsert_properties (si la URL se repite en
+el lote gana la última).
+
+Uso:
+    from src.database.bulk import copy_properties
+    counts = copy_properties(records)   # {'new': ..., 'updated': ...}
+"""
+
+import csv
+import io
+
+from .connection import engine
+from .operations import UPSERT_COLUMNS, UPSERT_DEFAULTS
+
+# Registros que se serializan de una vez antes de pasarlos a COPY
+COPY_CHUNK = 1000
+
+_COLUMNS = ', '.join(UPSERT_COLUMNS)
+
+# Los scrapers entregan rooms/bathrooms como float (convertir_a_entero('3') -> 3.0)
+# y COPY no acepta '3.0' en una columna INTEGER: se cargan como DOUBLE PRECISION
+# y se convierten al integrarlos, igual que el servidor en upsert_properties
+_INTEGER_COLUMNS = ('rooms', 'bathrooms')
+_SELECT_COLUMNS = ', '.join(f'{column}::integer' if column in _INTEGER_COLUMNS else column
+                            for column in UPSERT_COLUMNS)
+
+_CREATE_LOAD_TABLE = """
+    CREATE TEMP TABLE properties_load (
+        seq BIGSERIAL,
+        reference TEXT, operation TEXT, price DOUBLE PRECISION, rooms DOUBLE PRECISION,
+        bathrooms DOUBLE PRECISION, surface DOUBLE PRECISION, title TEXT, location TEXT,
+        address TEXT, url TEXT, website TEXT
+    ) ON COMMIT DROP
+"""
+
+_COPY = f"COPY properties_load ({_COLUMNS}) FROM STDIN WITH (FORMAT csv)"
+
+_MERGE = f"""
+    WITH upserted AS (
+        INSERT INTO listings (url_hash, {_COLUMNS})
+        SELECT DISTINCT ON (url) md5(url), {_SELECT_COLUMNS}
+        FROM properties_load
+        WHERE url <> ''
+        ORDER BY url, seq DESC
+        ON CONFLICT (url_hash) DO UPDATE SET
+            {', '.join(f'{column} = EXCLUDED.{column}' for column in UPSERT_COLUMNS if column != 'url')},
+            last_seen = now()
+        RETURNING url_hash, price, (xmax = 0) AS inserted
+    ), observed AS (
+        INSERT INTO observations (url_hash, price)
+        SELECT url_hash, price FROM upserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+"""
+
+
+class _CsvStream(io.TextIOBase):
+    """
+    Fichero de sólo lectura que genera el CSV de los registros a medida que
+    COPY lo lee, sin construir todo el lote en memoria
+    """
+
+    def __init__(self, properties_data):
+        self._records = iter(properties_data)
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        out = io.StringIO()
+        # Texto siempre entre comillas: así '' llega como cadena vacía y no como NULL
+        writer = csv.writer(out, quoting=csv.QUOTE_NONNUMERIC)
+        for _ in range(COPY_CHUNK):
+            property_data = next(self._records, None)
+            if property_data is None:
+                break
+            writer.writerow([UPSERT_DEFAULTS[column] if property_data.get(column) is None else property_data[column]
+                             for column in UPSERT_COLUMNS])
+        return out.getvalue()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = self._fill()
+            if not chunk:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def copy_properties(properties_data) -> dict:
+    """
+    Carga los registros (cualquier iterable de dicts) con COPY y los integra en
+    listings y observations. Retorna {'new': insertadas, 'updated': actualizadas}
+    """
+    counts = {'new': 0, 'updated': 0}
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(_CREATE_LOAD_TABLE)
+            cursor.copy_expert(_COPY, _CsvStream(properties_data))
+            cursor.execute(_MERGE)
+            new, updated = cursor.fetchone()
+        connection.commit()
+        counts = {'new': new, 'updated': updated}
+
+        if counts['new'] > 0:
+            print(f"✅ COPY: {counts['new']} propiedades NUEVAS")
+        if counts['updated'] > 0:
+            print(f"🔄 COPY: {counts['updated']} propiedades EXISTENTES (vigentes)")
+
+    except Exception as e:
+        connection.rollback()
+        print(f"❌ Error en la carga masiva de propiedades: {e}")
+    finally:
+        connection.close()
+
+    return counts
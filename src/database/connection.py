@@ -42,6 +42,15 @@ def create_tables():
     """
     try:
         Base.metadata.create_all(bind=engine)
+
+        # observations está particionada por mes: preparar las de los próximos meses
+        from .partitions import ensure_partitions, is_partitioned
+        from .views import ensure_properties_view
+        with engine.begin() as conn:
+            if is_partitioned(conn):
+                ensure_partitions(conn)
+            # properties (dashboard, scripts) es una vista: create_all no la crea
+            ensure_properties_view(conn)
         print("Tablas creadas exitosamente.")
     except Exception as e:
         print(f"Error al crear las tablas: {e}")
@@ -1,18 +1,21 @@
+from sqlalchemy import text
 from .connection import get_connection, close_connection
-from ..models.property import Property
+from ..models.listing import Listing
 
 def delete_all_properties():
     """
-    Borra todos los registros de la tabla properties.
+    Borra todas las propiedades de listings (y su historial en observations).
     """
     session = get_connection()
     if not session:
         print("No se pudo conectar a la base de datos.")
         return
     try:
-        deleted = session.query(Property).delete()
+        # TRUNCATE en lugar de DELETE: vacía listings y todas las particiones de observations
+        deleted = session.query(Listing).count()
+        session.execute(text("TRUNCATE listings, observations"))
         session.commit()
-        print(f"{deleted} registros eliminados de properties.")
+        print(f"{deleted} registros eliminados de listings.")
     except Exception as e:
         session.rollback()
         print(f"Error al eliminar registros: {e}")
@@ -0,0 +1,35 @@
+"""
+Entorno de Alembic: usa el mismo engine (DATABASE_URL) y los mismos modelos
+que los scrapers
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from src.database.connection import Base, engine, DATABASE_URL
+import src.models  # noqa: F401  (registra los modelos en Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
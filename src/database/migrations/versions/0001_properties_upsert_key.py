@@ -0,0 +1,44 @@
+"""Clave única (url, scraping_day) para el upsert de properties
+
+Añade scraping_day (día del historial), lo rellena desde scraping_date,
+elimina los duplicados del mismo día (se queda la fila más reciente) y crea
+el índice único que usa INSERT ... ON CONFLICT.
+
+En una base de datos nueva create_tables() ya crea la tabla con este esquema.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sólo la tabla antigua: en una base de datos creada por create_tables() properties es una vista
+    if 'properties' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.execute("ALTER TABLE properties ADD COLUMN IF NOT EXISTS scraping_day DATE")
+    op.execute("UPDATE properties SET scraping_day = COALESCE(scraping_date, timestamp, now())::date "
+               "WHERE scraping_day IS NULL")
+    op.execute("""
+        DELETE FROM properties p
+        USING properties newer
+        WHERE newer.url = p.url
+          AND newer.scraping_day = p.scraping_day
+          AND newer.id > p.id
+    """)
+    op.execute("ALTER TABLE properties ALTER COLUMN scraping_day SET DEFAULT CURRENT_DATE")
+    op.execute("ALTER TABLE properties ALTER COLUMN scraping_day SET NOT NULL")
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_properties_url_day ON properties (url, scraping_day)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS uq_properties_url_day")
+    op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS scraping_day")
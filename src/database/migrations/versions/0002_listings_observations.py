@@ -0,0 +1,106 @@
+"""Separa el estado actual (listings) del historial (observations)
+
+- listings: una fila por URL (clave url_hash = md5(url)) con los datos más
+  recientes, timestamp (primera vez que se guardó) y scraping_date (última
+  vez que se vio)
+- observations: historial append-only (url_hash, scraping_date, price)
+
+Rellena ambas tablas desde properties (el historial de una fila por
+propiedad y día), renombra esa tabla a properties_legacy y crea una vista
+properties sobre listings para el dashboard y los scripts que la consultan.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.database.views import PROPERTIES_VIEW
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+LISTING_COLUMNS = ('reference, operation, price, rooms, bathrooms, surface, title, '
+                   'location, address, url, website')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Una base de datos creada por create_tables() ya tiene listings con el
+    # esquema actual (timestamp/scraping_date se llaman first_seen/last_seen, ver 0005)
+    current_schema = (inspector.has_table('listings')
+                      and 'first_seen' in {column['name'] for column in inspector.get_columns('listings')})
+    first_column, last_column = ('first_seen', 'last_seen') if current_schema else ('timestamp', 'scraping_date')
+
+    if not inspector.has_table('listings'):
+        op.create_table(
+            'listings',
+            sa.Column('url_hash', sa.CHAR(32), primary_key=True),
+            sa.Column('reference', sa.String(255)),
+            sa.Column('operation', sa.String(255)),
+            sa.Column('price', sa.Float),
+            sa.Column('rooms', sa.Integer),
+            sa.Column('bathrooms', sa.Integer),
+            sa.Column('surface', sa.Float),
+            sa.Column('title', sa.Text),
+            sa.Column('location', sa.String(255)),
+            sa.Column('address', sa.Text),
+            sa.Column('url', sa.Text, nullable=False),
+            sa.Column('website', sa.String(255)),
+            sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('scraping_date', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index('idx_listings_scraping_date', 'listings', ['scraping_date'])
+
+    if not inspector.has_table('observations'):
+        op.create_table(
+            'observations',
+            sa.Column('id', sa.BigInteger, primary_key=True),
+            sa.Column('url_hash', sa.CHAR(32), sa.ForeignKey('listings.url_hash', ondelete='CASCADE'),
+                      nullable=False),
+            sa.Column('scraping_date', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column('price', sa.Float),
+        )
+        op.create_index('idx_observations_url_hash_date', 'observations', ['url_hash', 'scraping_date'])
+
+    if 'properties' in inspector.get_table_names():
+        # Estado actual: la fila más reciente de cada URL; timestamp = primera vez que se vio
+        op.execute(f"""
+            INSERT INTO listings (url_hash, {LISTING_COLUMNS}, {first_column}, {last_column})
+            SELECT DISTINCT ON (url) md5(url), {LISTING_COLUMNS},
+                   COALESCE(min(COALESCE(timestamp, scraping_date)) OVER (PARTITION BY url), now()),
+                   COALESCE(scraping_date, timestamp, now())
+            FROM properties
+            WHERE url IS NOT NULL AND url <> ''
+            ORDER BY url, scraping_date DESC NULLS LAST, id DESC
+            ON CONFLICT (url_hash) DO NOTHING
+        """)
+        # Historial: una observación por fila antigua
+        op.execute("""
+            INSERT INTO observations (url_hash, scraping_date, price)
+            SELECT md5(url), COALESCE(scraping_date, timestamp, now()), price
+            FROM properties
+            WHERE url IS NOT NULL AND url <> ''
+        """)
+        op.rename_table('properties', 'properties_legacy')
+
+    if current_schema:
+        op.execute(PROPERTIES_VIEW)
+    else:
+        op.execute(f"""
+            CREATE VIEW properties AS
+            SELECT url_hash, {LISTING_COLUMNS}, timestamp, scraping_date
+            FROM listings
+        """)
+
+
+def downgrade():
+    op.execute("DROP VIEW IF EXISTS properties")
+    if sa.inspect(op.get_bind()).has_table('properties_legacy'):
+        op.rename_table('properties_legacy', 'properties')
+    op.drop_table('observations')
+    op.drop_table('listings')
@@ -0,0 +1,68 @@
+"""Índices por vía de acceso de listings y observations
+
+- url_hash (CHAR(32), clave primaria de listings desde 0002) es el índice
+  único para las búsquedas por URL
+- BRIN sobre observations.scraping_date: tabla append-only, las fechas
+  siguen el orden físico y el índice ocupa unas pocas páginas
+- Parciales (price > 0) y con INCLUDE para las consultas del dashboard y
+  de las estadísticas: orden por timestamp, vigencia por scraping_date,
+  filtros por website y por location
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# IF NOT EXISTS: la migración se puede repetir sin error
+INDEXES = {
+    'idx_listings_priced_timestamp':
+        "ON listings (timestamp DESC) WHERE price > 0",
+    'idx_listings_priced_scraping_date':
+        "ON listings (scraping_date) INCLUDE (price) WHERE price > 0",
+    'idx_listings_website':
+        "ON listings (website) INCLUDE (scraping_date, price)",
+    'idx_listings_priced_location':
+        "ON listings (location) INCLUDE (price) WHERE price > 0",
+    'idx_observations_scraping_date_brin':
+        "ON observations USING brin (scraping_date)",
+}
+
+
+# Los mismos índices con las columnas y nombres de 0005 (first_seen/last_seen),
+# para una base de datos creada por create_tables(): ya los tiene, no se duplican
+FIRST_LAST_SEEN_INDEXES = {
+    'idx_listings_priced_first_seen':
+        "ON listings (first_seen DESC) WHERE price > 0",
+    'idx_listings_priced_last_seen':
+        "ON listings (last_seen) INCLUDE (price) WHERE price > 0",
+    'idx_listings_website':
+        "ON listings (website) INCLUDE (last_seen, price)",
+    'idx_listings_priced_location':
+        INDEXES['idx_listings_priced_location'],
+    'idx_observations_scraping_date_brin':
+        INDEXES['idx_observations_scraping_date_brin'],
+}
+
+
+def access_path_indexes():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('listings')}
+    return FIRST_LAST_SEEN_INDEXES if 'first_seen' in columns else INDEXES
+
+
+def upgrade():
+    for name, definition in access_path_indexes().items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+    op.execute("ANALYZE listings")
+    op.execute("ANALYZE observations")
+
+
+def downgrade():
+    for name in access_path_indexes():
+        op.execute(f"DROP INDEX IF EXISTS {name}")
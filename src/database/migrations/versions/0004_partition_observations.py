@@ -0,0 +1,83 @@
+"""Particiona observations por mes de scraping_date
+
+Recrea observations como tabla particionada (RANGE por scraping_date, una
+partición por mes), crea las particiones desde el mes de la observación más
+antigua hasta SCRAPER_PARTITIONS_AHEAD meses por delante y copia las filas.
+La clave primaria pasa a ser (id, scraping_date): PostgreSQL exige que
+incluya la columna de partición. Se conserva la secuencia de id.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.database.partitions import ensure_partitions, is_partitioned
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+OLD_INDEXES = ('observations_pkey', 'idx_observations_url_hash_date', 'idx_observations_scraping_date_brin')
+
+
+def upgrade():
+    conn = op.get_bind()
+    if not sa.inspect(conn).has_table('observations') or is_partitioned(conn):
+        return
+
+    op.rename_table('observations', 'observations_unpartitioned')
+    for index in OLD_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE observations (
+            id BIGINT NOT NULL DEFAULT nextval('observations_id_seq'),
+            url_hash CHAR(32) NOT NULL REFERENCES listings (url_hash) ON DELETE CASCADE,
+            scraping_date TIMESTAMPTZ NOT NULL DEFAULT now(),
+            price DOUBLE PRECISION,
+            PRIMARY KEY (id, scraping_date)
+        ) PARTITION BY RANGE (scraping_date)
+    """)
+    op.execute("CREATE INDEX idx_observations_url_hash_date ON observations (url_hash, scraping_date)")
+    op.execute("CREATE INDEX idx_observations_scraping_date_brin ON observations USING brin (scraping_date)")
+
+    oldest = conn.execute(sa.text("SELECT min(scraping_date)::date FROM observations_unpartitioned")).scalar()
+    ensure_partitions(conn, start=oldest)
+
+    op.execute("""
+        INSERT INTO observations (id, url_hash, scraping_date, price)
+        SELECT id, url_hash, scraping_date, price FROM observations_unpartitioned
+    """)
+    # La secuencia pertenece a la tabla antigua: moverla antes de eliminarla
+    op.execute("ALTER SEQUENCE observations_id_seq OWNED BY observations.id")
+    op.drop_table('observations_unpartitioned')
+    op.execute("ANALYZE observations")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if not is_partitioned(conn):
+        return
+
+    op.rename_table('observations', 'observations_partitioned')
+    for index in OLD_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_partitioned")
+    op.execute("""
+        CREATE TABLE observations (
+            id BIGINT PRIMARY KEY DEFAULT nextval('observations_id_seq'),
+            url_hash CHAR(32) NOT NULL REFERENCES listings (url_hash) ON DELETE CASCADE,
+            scraping_date TIMESTAMPTZ NOT NULL DEFAULT now(),
+            price DOUBLE PRECISION
+        )
+    """)
+    op.execute("CREATE INDEX idx_observations_url_hash_date ON observations (url_hash, scraping_date)")
+    op.execute("CREATE INDEX idx_observations_scraping_date_brin ON observations USING brin (scraping_date)")
+    op.execute("""
+        INSERT INTO observations (id, url_hash, scraping_date, price)
+        SELECT id, url_hash, scraping_date, price FROM observations_partitioned
+    """)
+    op.execute("ALTER SEQUENCE observations_id_seq OWNED BY observations.id")
+    op.execute("DROP TABLE observations_partitioned CASCADE")
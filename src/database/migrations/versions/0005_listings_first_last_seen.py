@@ -0,0 +1,66 @@
+"""first_seen / last_seen en listings
+
+Renombra timestamp -> first_seen (primera vez que se vio la propiedad) y
+scraping_date -> last_seen (última vez, vigencia), los hace NOT NULL y
+renombra los índices que los usan. La vista properties sigue exponiendo
+timestamp y scraping_date para el dashboard y añade first_seen y last_seen.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+LISTING_COLUMNS = ('reference, operation, price, rooms, bathrooms, surface, title, '
+                   'location, address, url, website')
+
+INDEX_RENAMES = {
+    'idx_listings_scraping_date': 'idx_listings_last_seen',
+    'idx_listings_priced_timestamp': 'idx_listings_priced_first_seen',
+    'idx_listings_priced_scraping_date': 'idx_listings_priced_last_seen',
+}
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('listings')}
+    if 'timestamp' in columns:
+        op.alter_column('listings', 'timestamp', new_column_name='first_seen')
+    if 'scraping_date' in columns:
+        op.alter_column('listings', 'scraping_date', new_column_name='last_seen')
+    for old, new in INDEX_RENAMES.items():
+        op.execute(f"ALTER INDEX IF EXISTS {old} RENAME TO {new}")
+
+    op.execute("""
+        UPDATE listings
+        SET first_seen = COALESCE(first_seen, last_seen, now()),
+            last_seen = COALESCE(last_seen, first_seen, now())
+        WHERE first_seen IS NULL OR last_seen IS NULL
+    """)
+    op.alter_column('listings', 'first_seen', nullable=False)
+    op.alter_column('listings', 'last_seen', nullable=False)
+
+    op.execute(f"""
+        CREATE OR REPLACE VIEW properties AS
+        SELECT url_hash, {LISTING_COLUMNS},
+               first_seen AS timestamp, last_seen AS scraping_date, first_seen, last_seen
+        FROM listings
+    """)
+
+
+def downgrade():
+    op.execute("DROP VIEW IF EXISTS properties")
+    op.alter_column('listings', 'first_seen', new_column_name='timestamp', nullable=True)
+    op.alter_column('listings', 'last_seen', new_column_name='scraping_date', nullable=True)
+    for old, new in INDEX_RENAMES.items():
+        op.execute(f"ALTER INDEX IF EXISTS {new} RENAME TO {old}")
+    op.execute(f"""
+        CREATE VIEW properties AS
+        SELECT url_hash, {LISTING_COLUMNS}, timestamp, scraping_date
+        FROM listings
+    """)
@@ -1,162 +1,133 @@
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 from .connection import get_connection, close_connection
-from ..models.property import Property
+from ..models.listing import Listing, url_hash
+from ..models.observation import Observation
+from ..models.property_description import PropertyDescription
+
+# Columnas que escriben los scrapers (listings añade url_hash)
+UPSERT_COLUMNS = ('reference', 'operation', 'price', 'rooms', 'bathrooms', 'surface',
+                  'title', 'location', 'address', 'url', 'website')
+UPSERT_DEFAULTS = {
+    'reference': 'N/A',
+    'operation': 'N/A',
+    'price': 0,
+    'rooms': 0,
+    'bathrooms': 0,
+    'surface': 0,
+    'title': 'N/A',
+    'location': 'N/A',
+    'address': 'N/A',
+    'url': '',
+    'website': '',
+}
 
 class PropertyRepository:
+    """
+    Estado actual en listings (una fila por URL, clave url_hash) e historial
+    append-only de precios y fechas en observations
+    """
     
     @staticmethod
-    def save_property(property_data: dict) -> bool:
+    def upsert_properties(properties_data: list) -> dict:
         """
-        Guarda una propiedad en la base de datos con historial de precios
+        Escritura por lotes en una sola sentencia:
+        - INSERT ... ON CONFLICT (url_hash) DO UPDATE en listings: inserta las
+          nuevas (first_seen) y actualiza datos y last_seen (vigencia) de las existentes
+        - INSERT en observations de una observación (fecha y precio) por propiedad
+        Retorna {'new': insertadas, 'updated': actualizadas}, contadas por la
+        propia sentencia (RETURNING xmax = 0), sin cargar objetos del ORM
         """
+        counts = {'new': 0, 'updated': 0}
+        rows = PropertyRepository._upsert_rows(properties_data)
+        if not rows:
+            return counts
+
         session = get_connection()
         if not session:
-            return False
-            
+            return counts
+
         try:
-            # Verificar si existe una entrada reciente (mismo día) para evitar duplicados excesivos
-            from datetime import datetime, timedelta
-            today = datetime.now().date()
-            
-            existing_today = session.query(Property).filter(
-                Property.url == property_data.get('url'),
-                Property.scraping_date >= today,
-                Property.scraping_date < today + timedelta(days=1)
-            ).first()
-            
-            if existing_today:
-                print(f"Propiedad ya existe hoy: {property_data.get('url')}")
-                return True
-            
-            # Crear nueva propiedad (siempre guarda para historial)
-            property_obj = Property(
-                reference=property_data.get('reference', 'N/A'),
-                operation=property_data.get('operation', 'N/A'),
-                price=property_data.get('price', 0),
-                rooms=property_data.get('rooms', 0),
-                bathrooms=property_data.get('bathrooms', 0),
-                surface=property_data.get('surface', 0),
-                title=property_data.get('title', 'N/A'),
-                location=property_data.get('location', 'N/A'),
-                address=property_data.get('address', 'N/A'),
-                url=property_data.get('url', ''),
-                website=property_data.get('website', '')
-            )
-            
-            session.add(property_obj)
+            upsert = insert(Listing).values(rows)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=[Listing.url_hash],
+                set_={
+                    **{column: upsert.excluded[column] for column in UPSERT_COLUMNS if column != 'url'},
+                    'last_seen': func.now()
+                }
+            ).returning(Listing.url_hash, Listing.price, literal_column('xmax = 0').label('inserted'))
+            upserted = upsert.cte('upserted')
+
+            observed = insert(Observation).from_select(
+                ['url_hash', 'price'], select(upserted.c.url_hash, upserted.c.price)
+            ).cte('observed')
+
+            stmt = select(upserted.c.inserted).add_cte(observed)
+            for row in session.execute(stmt):
+                counts['new' if row.inserted else 'updated'] += 1
             session.commit()
-            print(f"Propiedad guardada: {property_data.get('reference')}")
-            return True
-            
-        except IntegrityError as e:
-            session.rollback()
-            print(f"Error de integridad: {e}")
-            return False
+
+            if counts['new'] > 0:
+                print(f"✅ Guardadas {counts['new']} propiedades NUEVAS")
+            if counts['updated'] > 0:
+                print(f"🔄 Actualizadas {counts['updated']} propiedades EXISTENTES (vigentes)")
+
         except Exception as e:
             session.rollback()
-            print(f"Error al guardar propiedad: {e}")
-            return False
+            print(f"❌ Error al procesar lote de propiedades: {e}")
+            counts = {'new': 0, 'updated': 0}
         finally:
             close_connection(session)
 
+        return counts
+
+    @staticmethod
+    def _upsert_rows(properties_data: list) -> list:
+        """
+        Filas para el upsert: columnas de UPSERT_COLUMNS con sus valores por
+        defecto, url_hash y una sola fila por URL (ON CONFLICT no admite la misma
+        clave dos veces en una sentencia; gana la última). Sin URL no hay clave: se descartan
+        """
+        rows = {}
+        for property_data in properties_data:
+            if not property_data.get('url'):
+                continue
+            row = {column: property_data.get(column) for column in UPSERT_COLUMNS}
+            for column, default in UPSERT_DEFAULTS.items():
+                if row[column] is None:
+                    row[column] = default
+            row['url_hash'] = url_hash(row['url'])
+            rows[row['url_hash']] = row
+        return list(rows.values())
+
+    @staticmethod
+    def save_property(property_data: dict) -> bool:
+        """
+        Guarda una propiedad (upsert de una fila)
+        """
+        counts = PropertyRepository.upsert_properties([property_data])
+        return counts['new'] + counts['updated'] > 0
+
     @staticmethod
     def save_properties_batch(properties_data: list) -> int:
         """
-        Guarda múltiples propiedades en una sola conexión (OPTIMIZADO)
-        - Si la propiedad existe: actualiza scraping_date (marca como vigente)
-        - Si es nueva: inserta con fecha actual
-        Retorna el número de propiedades procesadas exitosamente
+        Guarda múltiples propiedades con un único upsert
+        Retorna el número de propiedades procesadas (nuevas + actualizadas)
         """
-        if not properties_data:
-            return 0
-            
-        session = get_connection()
-        if not session:
-            return 0
-            
-        processed_count = 0
-        new_count = 0
-        updated_count = 0
-        
-        try:
-            from datetime import datetime
-            current_datetime = datetime.now()
-            
-            # Obtener todas las URLs existentes en una sola consulta
-            existing_properties = {}
-            existing_urls = [prop.get('url', '') for prop in properties_data if prop.get('url')]
-            
-            if existing_urls:
-                existing_query = session.query(Property).filter(Property.url.in_(existing_urls)).all()
-                existing_properties = {prop.url: prop for prop in existing_query}
-            
-            # Procesar propiedades en lote
-            new_properties = []
-            for property_data in properties_data:
-                url = property_data.get('url', '')
-                
-                if url in existing_properties:
-                    # Propiedad existe - actualizar fecha de scraping (marca como vigente)
-                    existing_prop = existing_properties[url]
-                    existing_prop.scraping_date = current_datetime
-                    updated_count += 1
-                    print(f"🔄 Actualizada fecha vigencia: {url}")
-                else:
-                    # Propiedad nueva - crear e insertar
-                    property_obj = Property(
-                        reference=property_data.get('reference', 'N/A'),
-                        operation=property_data.get('operation', 'N/A'),
-                        price=property_data.get('price', 0),
-                        rooms=property_data.get('rooms', 0),
-                        bathrooms=property_data.get('bathrooms', 0),
-                        surface=property_data.get('surface', 0),
-                        title=property_data.get('title', 'N/A'),
-                        location=property_data.get('location', 'N/A'),
-                        address=property_data.get('address', 'N/A'),
-                        url=url,
-                        website=property_data.get('website', ''),
-                        scraping_date=current_datetime
-                    )
-                    new_properties.append(property_obj)
-                    new_count += 1
-            
-            # Guardar todas las propiedades nuevas y actualizar las existentes
-            if new_properties:
-                session.add_all(new_properties)
-            
-            session.commit()
-            processed_count = new_count + updated_count
-            
-            if new_count > 0:
-                print(f"✅ Guardadas {new_count} propiedades NUEVAS")
-            if updated_count > 0:
-                print(f"🔄 Actualizadas {updated_count} propiedades EXISTENTES (vigentes)")
-            if processed_count > 0:
-                print(f"📊 Total procesadas: {processed_count}")
-            else:
-                print("ℹ️ No hay propiedades para procesar")
-                
-        except Exception as e:
-            session.rollback()
-            print(f"❌ Error al procesar lote de propiedades: {e}")
-            processed_count = 0
-        finally:
-            close_connection(session)
-            
-        return processed_count
+        counts = PropertyRepository.upsert_properties(properties_data)
+        return counts['new'] + counts['updated']
     
     @staticmethod
     def get_all_properties():
         """
-        Obtiene todas las propiedades
+        Obtiene todas las propiedades (estado actual)
         """
         session = get_connection()
         if not session:
             return []
             
         try:
-            properties = session.query(Property).all()
+            properties = session.query(Listing).all()
             return properties
         except Exception as e:
             print(f"Error al obtener propiedades: {e}")
@@ -178,9 +149,9 @@ class PropertyRepository:
             from datetime import datetime, timedelta
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            properties = session.query(Property).filter(
-                Property.scraping_date < cutoff_date
-            ).order_by(Property.scraping_date.desc()).all()
+            properties = session.query(Listing).filter(
+                Listing.last_seen < cutoff_date
+            ).order_by(Listing.last_seen.desc()).all()
             
             return properties
         except Exception as e:
@@ -190,9 +161,11 @@ class PropertyRepository:
             close_connection(session)
     
     @staticmethod
-    def get_vigency_stats():
+    def get_vigency_stats(priced_only: bool = False, vigent_days: int = 3):
         """
-        Obtiene estadísticas de vigencia de propiedades
+        Obtiene estadísticas de vigencia de propiedades en una sola pasada
+        (un COUNT(*) FILTER por cada franja). Con priced_only sólo cuenta las
+        propiedades con precio (como el dashboard)
         """
         session = get_connection()
         if not session:
@@ -201,32 +174,28 @@ class PropertyRepository:
         try:
             from datetime import datetime, timedelta
             
-            today = datetime.now()
+            now = datetime.now()
+            today = datetime.combine(now.date(), datetime.min.time())
             yesterday = today - timedelta(days=1)
-            week_ago = today - timedelta(days=7)
-            
-            stats = {}
-            
-            # Propiedades vistas hoy
-            stats['seen_today'] = session.query(Property).filter(
-                Property.scraping_date >= today.date()
-            ).count()
-            
-            # Propiedades vistas ayer
-            stats['seen_yesterday'] = session.query(Property).filter(
-                Property.scraping_date >= yesterday.date(),
-                Property.scraping_date < today.date()
-            ).count()
-            
-            # Propiedades no vistas en 7 días
-            stats['not_seen_7_days'] = session.query(Property).filter(
-                Property.scraping_date < week_ago
-            ).count()
-            
-            # Total propiedades
-            stats['total'] = session.query(Property).count()
+            vigent_since = now - timedelta(days=vigent_days)
+            week_ago = now - timedelta(days=7)
+            
+            query = session.query(
+                func.count().label('total'),
+                # Propiedades vistas hoy / ayer (y no hoy)
+                func.count().filter(Listing.last_seen >= today).label('seen_today'),
+                func.count().filter(Listing.last_seen >= yesterday, Listing.last_seen < today).label('seen_yesterday'),
+                # Vigentes: vistas en los últimos vigent_days días
+                func.count().filter(Listing.last_seen >= vigent_since).label('vigent'),
+                # Propiedades no vistas en 7 días
+                func.count().filter(Listing.last_seen < week_ago).label('not_seen_7_days'),
+                # Propiedades que aparecieron hoy por primera vez
+                func.count().filter(Listing.first_seen >= today).label('new_today'),
+            )
+            if priced_only:
+                query = query.filter(Listing.price > 0)
             
-            return stats
+            return dict(query.one()._mapping)
             
         except Exception as e:
             print(f"Error al obtener estadísticas de vigencia: {e}")
@@ -234,6 +203,30 @@ class PropertyRepository:
         finally:
             close_connection(session)
 
+    @staticmethod
+    def get_location_counts(locations, priced_only: bool = True):
+        """
+        Obtiene el número de propiedades de cada una de las poblaciones indicadas
+        """
+        session = get_connection()
+        if not session:
+            return []
+
+        try:
+            query = session.query(
+                Listing.location,
+                func.count().label('count')
+            ).filter(Listing.location.in_(list(locations)))
+            if priced_only:
+                query = query.filter(Listing.price > 0)
+
+            return query.group_by(Listing.location).order_by(func.count().desc()).all()
+        except Exception as e:
+            print(f"Error al obtener propiedades por población: {e}")
+            return []
+        finally:
+            close_connection(session)
+
     @staticmethod
     def get_property_by_url(url: str):
         """
@@ -244,7 +237,7 @@ class PropertyRepository:
             return None
             
         try:
-            property_obj = session.query(Property).filter_by(url=url).first()
+            property_obj = session.get(Listing, url_hash(url))
             return property_obj
         except Exception as e:
             print(f"Error al obtener propiedad: {e}")
@@ -255,30 +248,28 @@ class PropertyRepository:
     @staticmethod
     def get_latest_properties():
         """
-        Obtiene las propiedades del último scraping (más recientes)
+        Obtiene las propiedades del último scraping: listings ya guarda el
+        estado más reciente de cada URL
+        """
+        return PropertyRepository.get_all_properties()
+
+    @staticmethod
+    def get_price_history(url: str):
+        """
+        Obtiene las observaciones (fecha y precio) de una propiedad, de la más antigua a la más reciente
         """
         session = get_connection()
         if not session:
             return []
-            
+
         try:
-            # Subquery para obtener la fecha más reciente por URL
-            from sqlalchemy import func
-            latest_dates = session.query(
-                Property.url,
-                func.max(Property.scraping_date).label('max_date')
-            ).group_by(Property.url).subquery()
-            
-            # Propiedades con la fecha más reciente
-            properties = session.query(Property).join(
-                latest_dates,
-                (Property.url == latest_dates.c.url) & 
-                (Property.scraping_date == latest_dates.c.max_date)
-            ).all()
-            
-            return properties
+            observations = session.query(Observation).filter(
+                Observation.url_hash == url_hash(url)
+            ).order_by(Observation.scraping_date).all()
+
+            return observations
         except Exception as e:
-            print(f"Error al obtener propiedades más recientes: {e}")
+            print(f"Error al obtener historial de {url}: {e}")
             return []
         finally:
             close_connection(session)
@@ -293,27 +284,28 @@ class PropertyRepository:
             return []
             
         try:
-            from sqlalchemy import func, distinct
             from datetime import datetime, timedelta
             
             # Obtener fechas de scraping disponibles (últimos 30 días)
             thirty_days_ago = datetime.now() - timedelta(days=30)
             
-            # Precios medios por ubicación y fecha
+            # Precios medios por ubicación y fecha (precio observado ese día)
             price_comparison = session.query(
-                Property.location,
-                func.date(Property.scraping_date).label('date'),
-                func.avg(Property.price).label('avg_price'),
-                func.count(Property.id).label('property_count')
+                Listing.location,
+                func.date(Observation.scraping_date).label('date'),
+                func.avg(Observation.price).label('avg_price'),
+                func.count(func.distinct(Observation.url_hash)).label('property_count')
+            ).join(
+                Listing, Listing.url_hash == Observation.url_hash
             ).filter(
-                Property.scraping_date >= thirty_days_ago,
-                Property.price > 0
+                Observation.scraping_date >= thirty_days_ago,
+                Observation.price > 0
             ).group_by(
-                Property.location,
-                func.date(Property.scraping_date)
+                Listing.location,
+                func.date(Observation.scraping_date)
             ).order_by(
-                Property.location,
-                func.date(Property.scraping_date).desc()
+                Listing.location,
+                func.date(Observation.scraping_date).desc()
             ).all()
             
             return price_comparison
@@ -321,4 +313,66 @@ class PropertyRepository:
             print(f"Error al obtener comparativa de precios: {e}")
             return []
         finally:
-            close_connection(session)
\ No newline at end of file
+            close_connection(session)
+
+
+class DescriptionRepository:
+
+    @staticmethod
+    def get_descriptions_by_website(website: str) -> dict:
+        """
+        Carga las descripciones guardadas de un sitio, indexadas por URL
+        """
+        session = get_connection()
+        if not session:
+            return {}
+
+        try:
+            rows = session.query(
+                PropertyDescription.url,
+                PropertyDescription.card_hash,
+                PropertyDescription.content_hash,
+                PropertyDescription.verdict
+            ).filter(PropertyDescription.website == website).all()
+
+            return {
+                row.url: {
+                    'card_hash': row.card_hash,
+                    'content_hash': row.content_hash,
+                    'verdict': row.verdict
+                }
+                for row in rows
+            }
+        except Exception as e:
+            print(f"Error al obtener descripciones de {website}: {e}")
+            return {}
+        finally:
+            close_connection(session)
+
+    @staticmethod
+    def save_description(url: str, website: str, description: str, content_hash: str,
+                         card_hash: str, verdict: str) -> bool:
+        """
+        Guarda (o reemplaza) la descripción de una URL junto con el veredicto de población especial
+        """
+        session = get_connection()
+        if not session:
+            return False
+
+        try:
+            session.merge(PropertyDescription(
+                url=url,
+                website=website,
+                description=description,
+                content_hash=content_hash,
+                card_hash=card_hash,
+                verdict=verdict
+            ))
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            print(f"Error al guardar descripción de {url}: {e}")
+            return False
+        finally:
+            close_connection(session)
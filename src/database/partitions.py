@@ -0,0 +1,151 @@
+"""
+Particiones mensuales de observations.
+
+observations está particionada por rango de scraping_date con una
+partición por mes (observations_y2026m10 = octubre de 2026).
+create_tables() crea las particiones del mes actual y de los
+SCRAPER_PARTITIONS_AHEAD meses siguientes, así que cada ejecución de los
+scrapers deja preparadas las próximas. La retención elimina (o desconecta
+para archivarlas) las particiones más antiguas que
+OBSERVATIONS_RETENTION_MONTHS: es un DROP/DETACH por mes, sin borrar filas
+una a una.
+
+Configuración (.env):
+    SCRAPER_PARTITIONS_AHEAD=3
+    OBSERVATIONS_RETENTION_MONTHS=24
+
+Uso:
+    python -m src.database.partitions list
+    python -m src.database.partitions ensure --ahead 6
+    python -m src.database.partitions retention --keep-months 24 --detach --dry-run
+"""
+
+import argparse
+import os
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from .connection import engine
+
+PARTITIONS_AHEAD = int(os.getenv("SCRAPER_PARTITIONS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("OBSERVATIONS_RETENTION_MONTHS", "24"))
+
+PARENT = 'observations'
+_NAME_PATTERN = re.compile(rf'^{PARENT}_y(\d{{4}})m(\d{{2}})$')
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    relkind = conn.execute(text("SELECT relkind FROM pg_class WHERE relname = :name AND relkind IN ('r', 'p')"),
+                           {'name': PARENT}).scalar()
+    return relkind == 'p'
+
+
+def ensure_partitions(conn, ahead: int = PARTITIONS_AHEAD, start: date = None) -> list:
+    """
+    Crea (si no existen) las particiones desde el mes de start (por defecto el
+    actual) hasta ahead meses después. Retorna los nombres creados
+    """
+    first = month_start(start or date.today())
+    last = add_months(month_start(date.today()), ahead)
+    existing = {partition['name'] for partition in list_partitions(conn)}
+
+    created = []
+    month = first
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def list_partitions(conn) -> list:
+    """
+    Particiones de observations con su mes, ordenadas de la más antigua a la más reciente
+    """
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {'parent': PARENT}).scalars()
+
+    partitions = []
+    for name in rows:
+        match = _NAME_PATTERN.match(name)
+        if match:
+            partitions.append({'name': name, 'month': date(int(match.group(1)), int(match.group(2)), 1)})
+    return sorted(partitions, key=lambda partition: partition['month'])
+
+
+def apply_retention(conn, keep_months: int = RETENTION_MONTHS, detach: bool = False, dry_run: bool = False) -> list:
+    """
+    Elimina (DROP) o desconecta (DETACH, la tabla queda para archivarla) las
+    particiones cuyo mes es anterior a los últimos keep_months meses.
+    Retorna los nombres afectados
+    """
+    cutoff = add_months(month_start(date.today()), -keep_months)
+    expired = [partition['name'] for partition in list_partitions(conn) if partition['month'] < cutoff]
+
+    for name in expired:
+        if dry_run:
+            continue
+        if detach:
+            conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        else:
+            conn.execute(text(f"DROP TABLE {name}"))
+    return expired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Particiones mensuales de observations")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="Lista las particiones")
+
+    ensure = commands.add_parser('ensure', help="Crea las particiones de los próximos meses")
+    ensure.add_argument('--ahead', type=int, default=PARTITIONS_AHEAD, help="Meses a preparar por delante")
+
+    retention = commands.add_parser('retention', help="Elimina las particiones caducadas")
+    retention.add_argument('--keep-months', type=int, default=RETENTION_MONTHS, help="Meses de historial a conservar")
+    retention.add_argument('--detach', action='store_true', help="Desconectar en lugar de eliminar (para archivar)")
+    retention.add_argument('--dry-run', action='store_true', help="Sólo mostrar qué particiones caducan")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command == 'list':
+            for partition in list_partitions(conn):
+                print(f"   • {partition['name']} ({partition['month']:%Y-%m})")
+
+        elif args.command == 'ensure':
+            created = ensure_partitions(conn, ahead=args.ahead)
+            print(f"🗓️ Particiones creadas: {', '.join(created) if created else 'ninguna (ya existían)'}")
+
+        elif args.command == 'retention':
+            expired = apply_retention(conn, keep_months=args.keep_months, detach=args.detach, dry_run=args.dry_run)
+            action = 'caducadas (dry run)' if args.dry_run else ('desconectadas' if args.detach else 'eliminadas')
+            print(f"🧹 Particiones {action}: {', '.join(expired) if expired else 'ninguna'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Estadísticas de vigencia.
+
+Todas las franjas (vistas hoy, ayer, vigentes, inactivas, nuevas) salen de
+un único COUNT(*) FILTER sobre listings (PropertyRepository.get_vigency_stats)
+y las poblaciones especiales de un GROUP BY sobre el índice de location.
+
+Uso:
+    python -m src.database.stats
+    python -m src.database.stats --all --vigent-days 5
+"""
+
+import argparse
+
+from .operations import PropertyRepository
+from ..utils.gazetteer import DASHBOARD_VILLAGES
+
+
+def print_vigency_stats(priced_only=True, vigent_days=3):
+    stats = PropertyRepository.get_vigency_stats(priced_only=priced_only, vigent_days=vigent_days)
+    if not stats:
+        return False
+
+    total = stats['total']
+    vigency_percentage = (stats['vigent'] / total * 100) if total > 0 else 0
+
+    print(f"📈 Total propiedades: {total}")
+    print(f"🟢 Propiedades vigentes (≤{vigent_days} días): {stats['vigent']} ({vigency_percentage:.1f}%)")
+    print(f"🔴 Propiedades inactivas (≥7 días): {stats['not_seen_7_days']}")
+    print(f"👀 Vistas hoy: {stats['seen_today']} (ayer y no hoy: {stats['seen_yesterday']})")
+    print(f"🆕 Nuevas hoy: {stats['new_today']}")
+
+    print("")
+    print("🏔️  Ubicaciones especiales detectadas:")
+    for location, count in PropertyRepository.get_location_counts(sorted(DASHBOARD_VILLAGES), priced_only=priced_only):
+        print(f"   • {location}: {count} propiedades")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estadísticas de vigencia de las propiedades")
+    parser.add_argument('--all', action='store_true', help="Contar también las propiedades sin precio")
+    parser.add_argument('--vigent-days', type=int, default=3, help="Días desde la última vez vista para ser vigente")
+    args = parser.parse_args()
+
+    if not print_vigency_stats(priced_only=not args.all, vigent_days=args.vigent_days):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Vista properties sobre listings.
+
+El dashboard (streamlit_app.py) y los scripts de mantenimiento consultan
+properties: desde 0002 es una vista sobre listings que sigue exponiendo
+timestamp y scraping_date (first_seen y last_seen desde 0005).
+create_tables() la crea junto a las tablas para que una base de datos
+nueva no dependa de las migraciones.
+"""
+
+from sqlalchemy import inspect, text
+
+LISTING_COLUMNS = ('reference, operation, price, rooms, bathrooms, surface, title, '
+                   'location, address, url, website')
+
+PROPERTIES_VIEW = f"""
+    CREATE OR REPLACE VIEW properties AS
+    SELECT url_hash, {LISTING_COLUMNS},
+           first_seen AS timestamp, last_seen AS scraping_date, first_seen, last_seen
+    FROM listings
+"""
+
+
+def ensure_properties_view(conn) -> bool:
+    """
+    Crea la vista properties si no existe. No hace nada si properties
+    todavía es la tabla antigua (la migración 0002 la convierte) o si
+    listings aún no tiene first_seen/last_seen (0005). Retorna si la creó
+    """
+    inspector = inspect(conn)
+    # Cada scraper llama a create_tables(): no reemplazar la vista en cada ejecución
+    if 'properties' in inspector.get_table_names() or 'properties' in inspector.get_view_names():
+        return False
+    columns = {column['name'] for column in inspector.get_columns('listings')}
+    if not {'first_seen', 'last_seen'} <= columns:
+        return False
+    conn.execute(text(PROPERTIES_VIEW))
+    return True
@@ -0,0 +1,161 @@
+"""
+Escritor de base de datos en segundo plano.
+
+Los scrapers encolan los registros en una cola acotada y un hilo escritor la
+vacía en lotes (write(lote) -> guardados), de forma que las descargas y las
+escrituras en PostgreSQL se solapan. Si la base de datos va más lenta que el
+scraping la cola se llena y add() se bloquea (backpressure) en lugar de
+acumular memoria sin límite.
+
+Métricas: profundidad de la cola (máxima y media al encolar), tiempo que el
+scraper ha pasado bloqueado y latencia de cada escritura (media, p95, máxima).
+
+Configuración (.env):
+    SCRAPER_WRITER_QUEUE=1000   # registros en cola (0 = escribir en el hilo del scraper)
+"""
+
+import os
+import queue
+import threading
+import time
+
+WRITER_QUEUE = int(os.getenv("SCRAPER_WRITER_QUEUE", "1000"))
+
+# Marcas de control en la cola
+_FLUSH = object()
+_CLOSE = object()
+
+
+class BackgroundWriter:
+    """
+    Misma interfaz que RecordSink (add, flush, close, with), pero las
+    escrituras las hace un hilo propio: escribe al juntar batch_size registros
+    o al pasar flush_interval segundos con registros pendientes.
+    """
+
+    def __init__(self, write, batch_size=200, flush_interval=30, max_queue=WRITER_QUEUE, name=None):
+        self.write = write
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.name = name
+        self.queue = queue.Queue(maxsize=max(max_queue, 1))
+        self.received = 0
+        self.saved = 0
+        self.flushes = 0
+        self.errors = 0
+        # Métricas
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+        self.write_latencies = []
+        self._thread = threading.Thread(target=self._drain, name=f"writer-{name or 'db'}", daemon=True)
+        self._thread.start()
+
+    # --- Lado del scraper -----------------------------------------------------
+
+    def add(self, record):
+        """Encola un registro; se bloquea mientras la cola esté llena"""
+        self._put(record)
+        self.received += 1
+
+    def _put(self, item):
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            self.queue.put(item)
+            self.blocked_puts += 1
+            self.blocked_seconds += time.perf_counter() - start
+
+    def flush(self):
+        """Pide al hilo escritor que escriba lo pendiente sin esperar al lote completo"""
+        self._put(_FLUSH)
+
+    def close(self):
+        """Escribe lo pendiente y espera al hilo escritor"""
+        if self._thread.is_alive():
+            self._put(_CLOSE)
+            self._thread.join()
+        return self.saved
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # También en una excepción o un SIGTERM: lo encolado se escribe antes de salir
+        self.close()
+        return False
+
+    # --- Hilo escritor --------------------------------------------------------
+
+    def _drain(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if batch else self.flush_interval
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                self._write(batch)
+                return
+            if item is not None and item is not _FLUSH:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if item is _FLUSH or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            saved = self.write(batch) or 0
+        except Exception as e:
+            self.errors += 1
+            saved = 0
+            print(f"❌ [{self.name or 'writer'}] Error al escribir un lote de {len(batch)} registros: {e}")
+        self.write_latencies.append(time.perf_counter() - start)
+        self.saved += saved
+        self.flushes += 1
+        print(f"💾 [{self.name or 'writer'}] Lote de {len(batch)} registros escrito ({saved} guardados)")
+
+    # --- Métricas -------------------------------------------------------------
+
+    def stats(self):
+        latencies = sorted(self.write_latencies)
+        return {
+            'received': self.received,
+            'saved': self.saved,
+            'batches': self.flushes,
+            'errors': self.errors,
+            'max_queue_depth': self.max_depth,
+            'avg_queue_depth': self._depth_total / self._depth_samples if self._depth_samples else 0.0,
+            'blocked_puts': self.blocked_puts,
+            'blocked_seconds': self.blocked_seconds,
+            'avg_write_seconds': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p95_write_seconds': latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            'max_write_seconds': latencies[-1] if latencies else 0.0,
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"🗄️ [{self.name or 'writer'}] Escritor en segundo plano:")
+        print(f"   - {stats['received']} registros en {stats['batches']} lotes, "
+              f"{stats['saved']} guardados, {stats['errors']} lotes con error")
+        print(f"   - Cola: profundidad máxima {stats['max_queue_depth']}/{self.queue.maxsize}, "
+              f"media {stats['avg_queue_depth']:.1f}")
+        print(f"   - Backpressure: {stats['blocked_puts']} esperas, {stats['blocked_seconds']:.2f}s bloqueado")
+        print(f"   - Latencia de escritura: media {stats['avg_write_seconds'] * 1000:.0f}ms, "
+              f"p95 {stats['p95_write_seconds'] * 1000:.0f}ms, máx {stats['max_write_seconds'] * 1000:.0f}ms")
@@ -0,0 +1,12 @@
+# src/fetch/__init__.py
+from .client import FetchClient, DeadlineExceeded, get_client, set_client, reset_client
+from .concurrent import DetailFetcher
+from .cache import HttpCache
+from .ratelimit import AdaptiveTokenBucket, HostRateLimiter
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .replay import FetchRecorder, ReplayAdapter
+
+__all__ = ['FetchClient', 'DeadlineExceeded', 'get_client', 'set_client', 'reset_client',
+           'DetailFetcher', 'HttpCache', 'AdaptiveTokenBucket', 'HostRateLimiter',
+           'RetryPolicy', 'CircuitBreaker', 'CircuitOpenError',
+           'FetchRecorder', 'ReplayAdapter']
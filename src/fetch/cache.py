@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Configuración de la caché HTTP en disco
+CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") not in ("0", "false", "no")
+CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite")
+CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "500"))
+
+# Cabeceras que se guardan junto al cuerpo para reconstruir la respuesta
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class CacheEntry:
+    """
+    Respuesta almacenada con sus validadores
+    """
+
+    def __init__(self, url, etag, last_modified, headers, body):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.body = body
+
+    def conditional_headers(self):
+        """
+        Cabeceras para la petición condicional (If-None-Match / If-Modified-Since)
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, not_modified):
+        """
+        Convierte la entrada en un requests.Response 200 a partir del 304 recibido
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        return response
+
+
+class HttpCache:
+    """
+    Caché HTTP persistente (SQLite) con GET condicional:
+    - Guarda cuerpo comprimido + ETag / Last-Modified por URL
+    - Los 304 se convierten en aciertos de caché
+    - Límite de tamaño con expulsión LRU
+    - Ratio de aciertos por website (host)
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=int(CACHE_MAX_MB * 1024 * 1024)):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                last_access REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_last_access ON http_cache(last_access)")
+        self._conn.commit()
+
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        self._counters = {}
+
+    def lookup(self, url):
+        """
+        Devuelve la entrada guardada para la URL o None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+
+        etag, last_modified, headers, body = row
+        return CacheEntry(url, etag, last_modified, json.loads(headers), zlib.decompress(body))
+
+    def touch(self, url):
+        """
+        Marca la entrada como usada recientemente (LRU)
+        """
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def store(self, url, response):
+        """
+        Guarda una respuesta 200 si trae validadores (ETag o Last-Modified)
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content)
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, headers, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(headers), body, len(body), time.time())
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Elimina las entradas menos usadas hasta respetar el tamaño máximo
+        """
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, size FROM http_cache ORDER BY last_access ASC LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for url, size in rows:
+                self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def record(self, url, hit):
+        """
+        Cuenta una consulta de caché para el website de la URL
+        """
+        site = urlparse(url).netloc
+        with self._lock:
+            counters = self._counters.setdefault(site, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    def hit_ratios(self):
+        """
+        Ratio de aciertos por website
+        """
+        with self._lock:
+            return {
+                site: {
+                    'hits': c['hits'],
+                    'misses': c['misses'],
+                    'ratio': c['hits'] / (c['hits'] + c['misses']) if c['hits'] + c['misses'] else 0.0,
+                }
+                for site, c in self._counters.items()
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,319 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from .cache import HttpCache, CACHE_ENABLED
+from .ratelimit import HostRateLimiter, parse_retry_after
+from .retry import RetryPolicy, CircuitBreakerRegistry, CircuitOpenError
+from .replay import FetchRecorder, ReplayAdapter
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Timeouts por defecto (conexión, lectura) en segundos
+CONNECT_TIMEOUT = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("SCRAPER_READ_TIMEOUT", "20"))
+
+# Presupuesto global de la ejecución (por debajo del `timeout 3600` de run_all_scrapers.sh)
+DEADLINE_SECONDS = float(os.getenv("SCRAPER_DEADLINE", "3300"))
+
+# Modo del cliente: live (red), record (red + grabación) o replay (sólo archivo grabado)
+FETCH_MODE = os.getenv("FETCH_MODE", "live")
+FETCH_ARCHIVE = os.getenv("FETCH_ARCHIVE", "fetch_archive.jsonl.gz")
+
+# Tamaño del pool keep-alive: número de hosts y conexiones por host
+POOL_HOSTS = int(os.getenv("SCRAPER_POOL_HOSTS", "10"))
+POOL_MAXSIZE = int(os.getenv("SCRAPER_POOL_MAXSIZE", "10"))
+
+
+class DeadlineExceeded(requests.RequestException):
+    """
+    Se lanza cuando se agota el presupuesto global de la ejecución.
+    Hereda de RequestException para que los scrapers la traten como un error de red más.
+    """
+
+
+class HostStats:
+    """
+    Contadores de tráfico de un host
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'avg_latency': self.total_latency / self.requests if self.requests else 0.0,
+            'max_latency': self.max_latency,
+        }
+
+
+class FetchClient:
+    """
+    Cliente HTTP compartido por todos los scrapers:
+    - Pool de conexiones keep-alive por host (una sola sesión)
+    - Timeouts por defecto de conexión y lectura
+    - Deadline global para toda la ejecución
+    - Contadores de bytes y latencia por host
+    - Caché HTTP persistente con GET condicional (opcional)
+    - Limitador adaptativo (token bucket AIMD) por host
+    - Reintentos con backoff + circuit breaker por website
+    - Modos record / replay para benchmarks sin red
+    """
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 deadline_seconds=DEADLINE_SECONDS, pool_hosts=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE,
+                 cache=None, mode=FETCH_MODE, archive=FETCH_ARCHIVE, rate_limit=True):
+        self.timeout = (connect_timeout, read_timeout)
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self.mode = mode
+
+        self.session = requests.Session()
+        if mode == 'replay':
+            adapter = ReplayAdapter(archive)
+            print(f"▶️ Modo replay: {len(adapter.entries)} respuestas desde {archive}")
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.recorder = FetchRecorder(archive) if mode == 'record' else None
+
+        # cache=False desactiva la caché aunque esté habilitada por entorno.
+        # En replay no tiene sentido: el archivo ya sirve cuerpos completos
+        if cache is None and CACHE_ENABLED and mode != 'replay':
+            cache = HttpCache()
+        self.cache = cache or None
+        # Sin limitador en replay (no hay host al que proteger) o si se pide explícitamente
+        self.rate_limiter = HostRateLimiter() if rate_limit and mode != 'replay' else None
+        self.retry_policy = RetryPolicy()
+        self.breakers = CircuitBreakerRegistry()
+
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """
+        Segundos que quedan antes del deadline global (None si no hay deadline)
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def _effective_timeout(self, timeout):
+        """
+        Aplica el timeout por defecto y lo recorta al tiempo restante del deadline
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline global de scraping agotado")
+
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    def _record(self, host, latency, size, error=False):
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.bytes += size
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if error:
+                stats.errors += 1
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """
+        GET a través del pool compartido. Devuelve un requests.Response
+        """
+        host = urlparse(url).netloc
+        breaker = self.breakers.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuito abierto para {host}, se omite {url}")
+
+        # Sólo se cachean GET simples (sin parámetros extra)
+        entry = None
+        cacheable = self.cache is not None and not kwargs
+        if cacheable:
+            entry = self.cache.lookup(url)
+            if entry:
+                headers = {**(headers or {}), **entry.conditional_headers()}
+
+        attempt = 0
+        settled = False
+        try:
+            while True:
+                attempt += 1
+                last_attempt = attempt >= self.retry_policy.max_attempts
+                try:
+                    response = self._send(host, url, headers, timeout, **kwargs)
+                except DeadlineExceeded:
+                    raise
+                except requests.RequestException:
+                    if last_attempt:
+                        settled = True
+                        breaker.record_failure()
+                        raise
+                    self._wait_retry(attempt)
+                    continue
+
+                if self.retry_policy.should_retry_status(response.status_code):
+                    if last_attempt:
+                        settled = True
+                        breaker.record_failure()
+                        return response
+                    self._wait_retry(attempt, parse_retry_after(response.headers.get('Retry-After')))
+                    continue
+
+                settled = True
+                breaker.record_success()
+                break
+        finally:
+            # Deadline u otra excepción: sin éxito ni fallo registrado, no dejar el circuito semiabierto
+            if not settled:
+                breaker.release()
+
+        if cacheable:
+            if entry and response.status_code == 304:
+                self.cache.record(url, hit=True)
+                self.cache.touch(url)
+                response = entry.to_response(response)
+            else:
+                self.cache.record(url, hit=False)
+                if response.status_code == 200:
+                    self.cache.store(url, response)
+
+        if self.recorder is not None:
+            self.recorder.record(url, response)
+
+        return response
+
+    def _wait_retry(self, attempt, retry_after=0.0):
+        """
+        Espera con backoff + jitter antes de reintentar, sin pasarse del deadline
+        """
+        delay = max(self.retry_policy.delay(attempt), retry_after)
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            raise DeadlineExceeded("Deadline global de scraping agotado durante un reintento")
+        time.sleep(delay)
+
+    def _send(self, host, url, headers, timeout, **kwargs):
+        """
+        Un único intento: limitador, petición y contadores
+        """
+        effective_timeout = self._effective_timeout(timeout)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(host)
+
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, headers=headers, timeout=effective_timeout, **kwargs)
+        except requests.RequestException:
+            latency = time.monotonic() - start
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(host, None, latency)
+            self._record(host, latency, 0, error=True)
+            raise
+
+        latency = time.monotonic() - start
+        if self.rate_limiter is not None:
+            self.rate_limiter.feedback(host, response.status_code, latency,
+                                       parse_retry_after(response.headers.get('Retry-After')))
+        self._record(host, latency, len(response.content), error=response.status_code >= 400)
+        return response
+
+    def stats(self):
+        """
+        Devuelve los contadores por host como diccionarios
+        """
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    def print_stats(self):
+        """
+        Muestra un resumen de tráfico por host
+        """
+        stats = self.stats()
+        if not stats:
+            return
+
+        rates = self.rate_limiter.rates() if self.rate_limiter is not None else {}
+
+        print("📡 Tráfico HTTP por host:")
+        for host, data in sorted(stats.items()):
+            rate = rates.get(host, {'rate': 0.0, 'slowdowns': 0})
+            print(f"   • {host}: {data['requests']} peticiones, {data['errors']} errores, "
+                  f"{data['bytes'] / 1024:,.0f} KB, latencia media {data['avg_latency']:.2f}s "
+                  f"(máx {data['max_latency']:.2f}s), ritmo final {rate['rate']:.1f} req/s "
+                  f"({rate['slowdowns']} frenadas)")
+
+        for site, data in sorted(self.breakers.states().items()):
+            if data['state'] != 'cerrado' or data['rejected']:
+                print(f"   🔌 {site}: circuito {data['state']}, {data['rejected']} peticiones omitidas")
+
+        if self.cache is not None:
+            print("🗃️ Caché HTTP por website:")
+            for site, data in sorted(self.cache.hit_ratios().items()):
+                print(f"   • {site}: {data['hits']} aciertos / {data['hits'] + data['misses']} "
+                      f"({data['ratio'] * 100:.1f}%)")
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> FetchClient:
+    """
+    Obtiene el cliente HTTP compartido (se crea en el primer uso)
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FetchClient()
+        return _client
+
+
+def set_client(client):
+    """
+    Sustituye el cliente compartido (p. ej. uno en modo replay para benchmarks)
+    """
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+
+
+def reset_client():
+    """
+    Cierra y descarta el cliente compartido (p. ej. en un proceso hijo)
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
@@ -0,0 +1,53 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+# Hilos para páginas de detalle y peticiones simultáneas máximas por host
+DETAIL_WORKERS = int(os.getenv("SCRAPER_DETAIL_WORKERS", "8"))
+PER_HOST_LIMIT = int(os.getenv("SCRAPER_PER_HOST", "4"))
+
+
+class DetailFetcher:
+    """
+    Etapa concurrente para páginas de detalle:
+    recibe las URLs encontradas en un listado y devuelve los registros
+    parseados a medida que terminan, con un límite de concurrencia por host.
+    """
+
+    def __init__(self, max_workers=DETAIL_WORKERS, per_host=PER_HOST_LIMIT):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    def _call(self, func, url):
+        with self._host_semaphore(url):
+            return func(url)
+
+    def fetch(self, urls, func):
+        """
+        Ejecuta func(url) para cada URL y va devolviendo (url, registro)
+        en orden de finalización. Los resultados vacíos (None) se omiten.
+        """
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            futures = {executor.submit(self._call, func, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    print(f"Error procesando {url}: {e}")
+                    continue
+                if record:
+                    yield url, record
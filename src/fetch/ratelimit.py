@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Ritmo inicial (peticiones/s) derivado de SCRAPER_DELAY y límites del AIMD
+INITIAL_RATE = 1.0 / max(float(os.getenv("SCRAPER_DELAY", "1")), 0.01)
+MIN_RATE = float(os.getenv("SCRAPER_MIN_RATE", "0.2"))
+MAX_RATE = float(os.getenv("SCRAPER_MAX_RATE", "8"))
+BURST = float(os.getenv("SCRAPER_BURST", "4"))
+
+# Aumento aditivo por respuesta sana y factor de reducción ante throttling
+ADDITIVE_INCREASE = 0.1
+MULTIPLICATIVE_DECREASE = 0.5
+
+# Una respuesta es "lenta" si supera este múltiplo de la latencia media
+LATENCY_FACTOR = 2.5
+LATENCY_WARMUP = 5
+
+
+def parse_retry_after(value):
+    """
+    Convierte la cabecera Retry-After (segundos o fecha HTTP) en segundos
+    """
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket de un host con ritmo adaptativo (AIMD):
+    - Respuestas sanas: el ritmo sube de forma aditiva
+    - 429 / 5xx / errores de red / latencia creciente: el ritmo baja a la mitad
+    """
+
+    def __init__(self, rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE, burst=BURST):
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        self.avg_latency = None
+        self.samples = 0
+        self.slowdowns = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Bloquea hasta que haya un token disponible para este host
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1 and now >= self.blocked_until:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(min(max(wait, 0.01), 1.0))
+
+    def feedback(self, status, latency, retry_after=None):
+        """
+        Ajusta el ritmo según el resultado de la última petición
+        (status None = error de red)
+        """
+        with self._lock:
+            throttled = status is None or status == 429 or status >= 500
+            slow = (self.avg_latency is not None and self.samples >= LATENCY_WARMUP
+                    and latency > LATENCY_FACTOR * self.avg_latency)
+
+            if throttled or slow:
+                self.rate = max(self.min_rate, self.rate * MULTIPLICATIVE_DECREASE)
+                self.tokens = min(self.tokens, 0)
+                self.slowdowns += 1
+            else:
+                self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE)
+
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+            # Media móvil exponencial de la latencia (sólo respuestas completas)
+            if status is not None:
+                self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+                self.samples += 1
+
+
+class HostRateLimiter:
+    """
+    Un AdaptiveTokenBucket por host
+    """
+
+    def __init__(self, **bucket_options):
+        self.bucket_options = bucket_options
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = AdaptiveTokenBucket(**self.bucket_options)
+            return self._buckets[host]
+
+    def acquire(self, host):
+        self.bucket(host).acquire()
+
+    def feedback(self, host, status, latency, retry_after=None):
+        self.bucket(host).feedback(status, latency, retry_after)
+
+    def rates(self):
+        """
+        Ritmo actual (peticiones/s) y número de frenadas por host
+        """
+        with self._lock:
+            return {host: {'rate': b.rate, 'slowdowns': b.slowdowns} for host, b in self._buckets.items()}
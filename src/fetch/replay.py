@@ -0,0 +1,108 @@
+import atexit
+import base64
+import gzip
+import json
+import threading
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Cabeceras que se guardan en el archivo (el resto no afecta al parseo)
+ARCHIVED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Location')
+
+
+class FetchRecorder:
+    """
+    Guarda cada par petición/respuesta de una ejecución en un archivo
+    JSON Lines comprimido con gzip (.jsonl.gz)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        # Cerrar el gzip aunque el scraper se ejecute suelto (python -m ...)
+        atexit.register(self.close)
+
+    def record(self, url, response):
+        # Se guarda la URL preparada de la primera petición (antes de redirecciones),
+        # que es la que recibirá el ReplayAdapter
+        if response.history:
+            url = response.history[0].request.url
+        elif response.request is not None:
+            url = response.request.url
+
+        entry = {
+            'url': url,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in ARCHIVED_HEADERS if name in response.headers},
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        line = json.dumps(entry)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+        print(f"💾 Grabadas {self.count} respuestas en {self.path}")
+
+
+def load_archive(path):
+    """
+    Carga un archivo grabado: {url: entrada} (si una URL se repite, gana la última)
+    """
+    entries = {}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry['url']] = entry
+    return entries
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adaptador de transporte de requests que sirve las respuestas
+    desde un archivo grabado, sin tocar la red.
+    Las URLs que no están en el archivo devuelven un 404.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.entries = load_archive(path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        entry = self.entries.get(request.url)
+        with self._lock:
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        response = Response()
+        response.url = request.url
+        response.request = request
+        if entry:
+            response.status_code = entry['status']
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            response._content = base64.b64decode(entry['body'])
+        else:
+            response.status_code = 404
+            response.headers = CaseInsensitiveDict({'X-Replay-Miss': '1'})
+            response._content = b''
+        response.reason = 'OK' if response.status_code == 200 else 'Replay'
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        pass
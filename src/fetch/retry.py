@@ -0,0 +1,128 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Política de reintentos
+RETRY_ATTEMPTS = int(os.getenv("SCRAPER_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("SCRAPER_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("SCRAPER_RETRY_MAX_DELAY", "10"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Circuit breaker por website
+BREAKER_THRESHOLD = int(os.getenv("SCRAPER_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("SCRAPER_BREAKER_RESET", "300"))
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Se lanza sin tocar la red cuando el circuito del website está abierto
+    """
+
+
+class RetryPolicy:
+    """
+    Reintentos con backoff exponencial y jitter completo
+    """
+
+    def __init__(self, max_attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, retry_statuses=RETRY_STATUSES):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+
+    def should_retry_status(self, status):
+        return status in self.retry_statuses
+
+    def delay(self, attempt):
+        """
+        Espera antes del reintento número `attempt` (empezando en 1)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de un website:
+    - Cerrado: las peticiones pasan
+    - Abierto: tras N fallos consecutivos, se rechazan al instante durante reset_timeout
+    - Semiabierto: pasado ese tiempo se deja pasar una petición de prueba
+    """
+
+    CLOSED = 'cerrado'
+    OPEN = 'abierto'
+    HALF_OPEN = 'semiabierto'
+
+    def __init__(self, failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Indica si la petición puede salir
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"🔌 Circuito abierto tras {self.failures} fallos consecutivos")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """
+        La petición terminó sin registrar éxito ni fallo (deadline, error
+        inesperado): si era la de prueba, se libera el hueco para que la
+        siguiente petición vuelva a probar en lugar de quedar semiabierto
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+
+class CircuitBreakerRegistry:
+    """
+    Un CircuitBreaker por website (host)
+    """
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, site):
+        with self._lock:
+            if site not in self._breakers:
+                self._breakers[site] = CircuitBreaker(**self.breaker_options)
+            return self._breakers[site]
+
+    def states(self):
+        with self._lock:
+            return {site: {'state': b.state, 'rejected': b.rejected} for site, b in self._breakers.items()}
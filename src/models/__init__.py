@@ -1,4 +1,6 @@
 # src/models/__init__.py
-from .property import Property
+from .listing import Listing, url_hash
+from .observation import Observation
+from .property_description import PropertyDescription
 
-__all__ = ['Property']
\ No newline at end of file
+__all__ = ['Listing', 'Observation', 'PropertyDescription', 'url_hash']
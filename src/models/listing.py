@@ -0,0 +1,51 @@
+import hashlib
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, CHAR, Index, text
+from sqlalchemy.sql import func
+from ..database.connection import Base
+
+
+def url_hash(url: str) -> str:
+    """Clave de listings: md5 de la URL (igual que md5(url) en PostgreSQL)"""
+    return hashlib.md5(url.encode('utf-8')).hexdigest()
+
+
+class Listing(Base):
+    __tablename__ = "listings"
+
+    # Estado actual: una fila por URL, actualizada en cada scraping
+    url_hash = Column(CHAR(32), primary_key=True)
+    reference = Column(String(255))
+    operation = Column(String(255))
+    price = Column(Float)
+    rooms = Column(Integer)
+    bathrooms = Column(Integer)
+    surface = Column(Float)
+    title = Column(Text)
+    location = Column(String(255))
+    address = Column(Text)
+    url = Column(Text, nullable=False)
+    website = Column(String(255))
+    # Se mantienen en cada upsert: first_seen sólo al insertar, last_seen en cada scraping (vigencia).
+    # La vista properties los expone también como timestamp y scraping_date
+    first_seen = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_seen = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Índices por vía de acceso (migración 0003); los de price > 0 son parciales
+    # porque el dashboard y las estadísticas sólo miran propiedades con precio
+    __table_args__ = (
+        Index('idx_listings_last_seen', 'last_seen'),
+        # Dashboard: WHERE price > 0 ORDER BY timestamp (first_seen) DESC
+        Index('idx_listings_priced_first_seen', text('first_seen DESC'), postgresql_where=text('price > 0')),
+        # Vigencia: WHERE price > 0 AND last_seen >= ... (sólo índice)
+        Index('idx_listings_priced_last_seen', 'last_seen',
+              postgresql_where=text('price > 0'), postgresql_include=['price']),
+        # Por sitio: WHERE website = ...
+        Index('idx_listings_website', 'website', postgresql_include=['last_seen', 'price']),
+        # Por población: WHERE location ... AND price > 0 (precio medio sin leer la tabla)
+        Index('idx_listings_priced_location', 'location',
+              postgresql_where=text('price > 0'), postgresql_include=['price']),
+    )
+
+    def __repr__(self):
+        return f"<Listing(reference='{self.reference}', title='{self.title}', last_seen='{self.last_seen}')>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, BigInteger, Float, DateTime, CHAR, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..database.connection import Base
+
+
+class Observation(Base):
+    __tablename__ = "observations"
+
+    # Historial append-only: una fila cada vez que un scraping ve la propiedad.
+    # Particionada por mes de scraping_date (ver src/database/partitions.py):
+    # la clave primaria tiene que incluir la columna de partición
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    url_hash = Column(CHAR(32), ForeignKey('listings.url_hash', ondelete='CASCADE'), nullable=False)
+    scraping_date = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    price = Column(Float)
+
+    __table_args__ = (
+        Index('idx_observations_url_hash_date', 'url_hash', 'scraping_date'),
+        # Append-only: scraping_date sigue el orden físico, BRIN basta para los rangos de fechas
+        Index('idx_observations_scraping_date_brin', 'scraping_date', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (scraping_date)'},
+    )
+
+    def __repr__(self):
+        return f"<Observation(url_hash='{self.url_hash}', price={self.price}, scraping_date='{self.scraping_date}')>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from ..database.connection import Base
+
+class PropertyDescription(Base):
+    __tablename__ = "property_descriptions"
+
+    # Una fila por URL: la descripción se descarga una vez y se reutiliza entre ejecuciones
+    url = Column(Text, primary_key=True)
+    website = Column(String(255))
+    description = Column(Text)
+    content_hash = Column(String(64))  # sha256 de la descripción
+    card_hash = Column(String(64))  # sha256 de los datos del listado cuando se descargó
+    verdict = Column(String(255))  # Población especial detectada ('' si ninguna)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (Index('idx_property_descriptions_website', 'website'),)
+
+    def __repr__(self):
+        return f"<PropertyDescription(url='{self.url}', verdict='{self.verdict}')>"
@@ -0,0 +1,7 @@
+# src/parsing/__init__.py
+from .parser import parse_html, available_backends, STRAINERS, DEFAULT_BACKEND
+from .structured import extract_structured_data
+from .pool import ParsePool, get_parse_pool, reset_parse_pool
+
+__all__ = ['parse_html', 'available_backends', 'STRAINERS', 'DEFAULT_BACKEND', 'extract_structured_data',
+           'ParsePool', 'get_parse_pool', 'reset_parse_pool']
@@ -0,0 +1,73 @@
+"""
+Parseo HTML común a todos los scrapers.
+
+parse_html() elige el tree builder (lxml si está instalado, html.parser si no)
+y permite parsear sólo el subárbol que el scraper necesita mediante los
+SoupStrainer de STRAINERS.
+
+Configuración (.env):
+    HTML_PARSER=lxml   # lxml | html.parser
+"""
+
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    import lxml  # noqa: F401
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
+
+DEFAULT_BACKEND = os.getenv("HTML_PARSER", "lxml" if _HAS_LXML else "html.parser")
+
+
+def _has_class(name):
+    """
+    Filtro de clase por token: al filtrar durante el parseo el strainer recibe
+    el atributo class completo ("cardAnuncio destacado"), no cada clase
+    """
+    def match(value):
+        if not value:
+            return False
+        tokens = value.split() if isinstance(value, str) else value
+        return name in tokens
+    return match
+
+
+# Subárboles que usa cada scraper en sus páginas de listado
+STRAINERS = {
+    # 7claus: tarjetas del listado
+    'claus_cards': SoupStrainer('div', class_=_has_class('cardAnuncio')),
+    # nouaire: filas del buscador
+    'nouaire_rows': SoupStrainer('div', class_='row pt10 pb10'),
+    # expofinques: la tabla de resultados (las filas se leen de su tbody)
+    'expofinques_table': SoupStrainer('table', id='infoListado'),
+    # finquesmarca: el contenedor div.card de cada a.url-inmueble (los datos están en el card)
+    'finques_cards': SoupStrainer('div', class_=_has_class('card')),
+    # pisos.ad: sólo los enlaces del listado
+    'links': SoupStrainer('a', href=True),
+}
+
+
+def available_backends():
+    """Tree builders utilizables en este entorno"""
+    return ['lxml', 'html.parser'] if _HAS_LXML else ['html.parser']
+
+
+def parse_html(content, only=None, backend=None):
+    """
+    Parsea content (bytes o str) y devuelve un BeautifulSoup.
+
+    only: clave de STRAINERS (o un SoupStrainer) para construir sólo ese subárbol.
+    backend: fuerza un tree builder; por defecto HTML_PARSER.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'lxml' and not _HAS_LXML:
+        backend = 'html.parser'
+
+    strainer = STRAINERS[only] if isinstance(only, str) else only
+    return BeautifulSoup(content, backend, parse_only=strainer)
@@ -0,0 +1,117 @@
+"""
+Pool de procesos para el parseo HTML.
+
+Los hilos de descarga (DetailFetcher) entregan los bytes de cada página a
+ParsePool.parse(), que ejecuta la función de parseo en un proceso del pool
+y devuelve su resultado (un dict plano). Así el parseo con BeautifulSoup no
+compite por el GIL con las descargas y escala con los núcleos.
+
+Las funciones de parseo tienen que ser de nivel de módulo (se envían por
+pickle a los procesos), con la firma func(url, content) -> dict | None;
+están en src/parsing/workers.py.
+
+Configuración (.env):
+    SCRAPER_PARSE_WORKERS=0   # procesos de parseo (0 = parsear en el propio hilo)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", "0"))
+
+INLINE_WORKER = 'en hilo'
+
+
+def _timed_parse(func, url, content):
+    """Se ejecuta en el proceso del pool: parsea y mide el tiempo"""
+    start = time.perf_counter()
+    result = func(url, content)
+    return os.getpid(), time.perf_counter() - start, result
+
+
+class ParsePool:
+    """
+    Ejecuta funciones de parseo en un ProcessPoolExecutor (o en el hilo que
+    llama si workers == 0) y acumula, por proceso, páginas, bytes y tiempo.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        # worker -> {'pages', 'bytes', 'seconds'}
+        self.worker_stats = {}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: los hilos de descarga ya están en marcha cuando se crea el pool
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def parse(self, func, url, content):
+        """Parsea content con func(url, content) y devuelve su resultado"""
+        if self.workers > 0:
+            worker, elapsed, result = self._get_executor().submit(_timed_parse, func, url, content).result()
+        else:
+            _, elapsed, result = _timed_parse(func, url, content)
+            worker = INLINE_WORKER
+
+        with self._lock:
+            stats = self.worker_stats.setdefault(worker, {'pages': 0, 'bytes': 0, 'seconds': 0.0})
+            stats['pages'] += 1
+            stats['bytes'] += len(content or b'')
+            stats['seconds'] += elapsed
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {worker: dict(stats) for worker, stats in self.worker_stats.items()}
+
+    def print_stats(self):
+        stats = self.stats()
+        if not stats:
+            return
+        mode = f"{self.workers} procesos" if self.workers > 0 else "sin pool"
+        print(f"🧩 Parseo ({mode}): {sum(s['pages'] for s in stats.values())} páginas")
+        for worker, s in sorted(stats.items(), key=lambda item: str(item[0])):
+            pages_per_s = s['pages'] / s['seconds'] if s['seconds'] else 0
+            mb_per_s = s['bytes'] / 1024 / 1024 / s['seconds'] if s['seconds'] else 0
+            print(f"   - worker {worker}: {s['pages']} páginas, {s['seconds']:.2f}s, "
+                  f"{pages_per_s:.1f} páginas/s, {mb_per_s:.1f} MB/s")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    """
+    Obtiene el pool de parseo compartido (los procesos se crean en el primer parse)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+
+def reset_parse_pool():
+    """
+    Cierra y descarta el pool compartido
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
@@ -0,0 +1,177 @@
+"""
+Extracción de datos estructurados de páginas de detalle.
+
+Lee, directamente del HTML y sin construir el árbol DOM:
+- JSON-LD (<script type="application/ld+json">, schema.org)
+- microdata (itemprop="...")
+- estado JSON embebido (<script type="application/json">, window.__INITIAL_STATE__ = {...}, utag_data = {...})
+
+y devuelve un dict con los campos encontrados (price, rooms, bathrooms,
+surface, title, description, location, image_url). Los scrapers sólo
+recurren a sus heurísticas DOM cuando este dict no trae lo que necesitan.
+"""
+
+import html
+import json
+import re
+
+from ..utils.text_cleaner import extraer_precio, convertir_a_entero
+
+FIELDS = ('price', 'rooms', 'bathrooms', 'surface', 'title', 'description', 'location', 'image_url')
+
+# Claves (en minúsculas) que se reconocen para cada campo, en orden de preferencia
+KEY_ALIASES = {
+    'price': ('price', 'precio', 'ad_price', 'lowprice'),
+    'rooms': ('numberofrooms', 'numberofbedrooms', 'rooms', 'bedrooms', 'habitaciones', 'ad_rooms'),
+    'bathrooms': ('numberofbathroomstotal', 'numberofbathrooms', 'numberoffullbathrooms', 'bathrooms',
+                  'banos', 'baños', 'ad_bathrooms'),
+    'surface': ('floorsize', 'surface', 'superficie', 'constructedarea', 'size', 'area', 'm2', 'ad_surface'),
+    'title': ('name', 'headline', 'title'),
+    'description': ('description', 'descripcion'),
+    'location': ('addresslocality', 'locality', 'municipality', 'city', 'town', 'zone', 'addressregion'),
+    'image_url': ('image', 'thumbnailurl', 'photo'),
+}
+_ALIAS_TO_FIELD = {alias: field for field, aliases in KEY_ALIASES.items() for alias in aliases}
+
+# Nodos JSON-LD que no describen el inmueble
+_IGNORED_TYPES = {'breadcrumblist', 'listitem', 'organization', 'website', 'webpage', 'searchaction',
+                  'imageobject', 'person', 'realestateagent'}
+
+_JSON_LD = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.I | re.S)
+_JSON_SCRIPT = re.compile(r'<script[^>]*type=["\']application/json["\'][^>]*>(.*?)</script>', re.I | re.S)
+_JSON_ASSIGNMENT = re.compile(
+    r'(?:window\.|var\s+|let\s+|const\s+)?(__INITIAL_STATE__|__PRELOADED_STATE__|__NUXT__|utag_data|adData)\s*=\s*(?=\{)')
+_MICRODATA_CONTENT = re.compile(r'<[^>]*\bitemprop=["\'](\w+)["\'][^>]*\bcontent=["\']([^"\']*)["\']', re.I)
+_MICRODATA_CONTENT_FIRST = re.compile(r'<[^>]*\bcontent=["\']([^"\']*)["\'][^>]*\bitemprop=["\'](\w+)["\']', re.I)
+_MICRODATA_TEXT = re.compile(r'<(\w+)[^>]*\bitemprop=["\'](\w+)["\'](?![^>]*\bcontent=)[^>]*>([^<]+)<', re.I)
+
+_DIGIT = re.compile(r'\d')
+
+_decoder = json.JSONDecoder()
+
+
+def _to_number(field, value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = value
+    elif isinstance(value, str) and _DIGIT.search(value):
+        number = extraer_precio(value) if field == 'price' else convertir_a_entero(value)
+    else:
+        return None
+    # 0 habitaciones (estudio) es un valor válido; un precio 0 no
+    if number < 0 or (field == 'price' and not number):
+        return None
+    return float(number) if field in ('price', 'surface') else int(number)
+
+
+def _to_text(value):
+    if isinstance(value, str):
+        text = html.unescape(value).strip()
+        return text or None
+    if isinstance(value, list) and value:
+        return _to_text(value[0])
+    if isinstance(value, dict):
+        return _to_text(value.get('url') or value.get('name') or value.get('@value'))
+    return None
+
+
+def _field_value(field, value):
+    """Convierte el valor bruto de una clave al tipo del campo"""
+    if field == 'surface' and isinstance(value, dict):
+        value = value.get('value')
+    if field == 'price' and isinstance(value, dict):
+        value = value.get('price') or value.get('value')
+    if field in ('price', 'rooms', 'bathrooms', 'surface'):
+        return _to_number(field, value)
+    return _to_text(value)
+
+
+def _walk(node, found):
+    """Recorre el JSON y rellena found con el primer valor de cada campo"""
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, found)
+        return
+    if not isinstance(node, dict):
+        return
+
+    node_type = node.get('@type')
+    node_types = {str(t).lower() for t in (node_type if isinstance(node_type, list) else [node_type]) if t}
+    if node_types & _IGNORED_TYPES:
+        return
+
+    for key, value in node.items():
+        field = _ALIAS_TO_FIELD.get(str(key).lower())
+        if field and field not in found:
+            converted = _field_value(field, value)
+            if converted is not None:
+                found[field] = converted
+
+    for key, value in node.items():
+        if isinstance(value, (dict, list)):
+            _walk(value, found)
+
+
+def _json_ld(page):
+    found = {}
+    for block in _JSON_LD.findall(page):
+        try:
+            _walk(json.loads(block.strip()), found)
+        except ValueError:
+            continue
+    return found
+
+
+def _microdata(page):
+    found = {}
+    pairs = _MICRODATA_CONTENT.findall(page)
+    pairs += [(prop, content) for content, prop in _MICRODATA_CONTENT_FIRST.findall(page)]
+    pairs += [(prop, text) for _, prop, text in _MICRODATA_TEXT.findall(page)]
+    for prop, value in pairs:
+        field = _ALIAS_TO_FIELD.get(prop.lower())
+        if field and field not in found:
+            converted = _field_value(field, value)
+            if converted is not None:
+                found[field] = converted
+    return found
+
+
+def _inline_json(page):
+    found = {}
+    for block in _JSON_SCRIPT.findall(page):
+        try:
+            _walk(json.loads(block.strip()), found)
+        except ValueError:
+            continue
+    for match in _JSON_ASSIGNMENT.finditer(page):
+        try:
+            state, _ = _decoder.raw_decode(page, match.end())
+        except ValueError:
+            continue
+        _walk(state, found)
+    return found
+
+
+def extract_structured_data(page):
+    """
+    Devuelve los campos encontrados en los datos estructurados de la página
+    (JSON-LD, luego microdata, luego estado JSON embebido) y, en 'sources',
+    de qué fuentes salieron. page puede ser str o bytes.
+    """
+    if isinstance(page, bytes):
+        page = page.decode('utf-8', errors='ignore')
+
+    data = {}
+    sources = []
+    for name, extractor in (('json-ld', _json_ld), ('microdata', _microdata), ('inline-json', _inline_json)):
+        found = extractor(page)
+        new_fields = {field: value for field, value in found.items() if field not in data}
+        if new_fields:
+            data.update(new_fields)
+            sources.append(name)
+        if all(field in data for field in FIELDS):
+            break
+
+    data['sources'] = sources
+    return data
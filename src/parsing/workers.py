@@ -0,0 +1,189 @@
+"""
+Funciones de parseo que se ejecutan en los procesos de ParsePool.
+
+Son de nivel de módulo y sin estado (se envían por pickle): reciben la URL
+y los bytes de la página y devuelven un dict plano. Los filtros y las
+peticiones de red siguen en el proceso del scraper.
+"""
+
+import html
+import re
+
+from .parser import parse_html
+from ..utils.text_cleaner import extraer_precio
+
+
+def _descripcion_por_defecto(soup, descripcion, palabras=('ubicación', 'situado')):
+    """Párrafos largos y, si no, el primer div largo que hable de la ubicación"""
+    if not descripcion:
+        for p in soup.find_all('p'):
+            texto = p.get_text(strip=True)
+            if len(texto) > 100:
+                descripcion += " " + texto
+
+    if not descripcion:
+        for div in soup.find_all('div'):
+            texto = div.get_text(strip=True)
+            if len(texto) > 200 and any(palabra in texto.lower() for palabra in palabras):
+                descripcion = texto
+                break
+
+    return descripcion
+
+
+def descripcion_generica(url, content):
+    """Descripción de una ficha con div.descripcion (7claus, expofinques, finquesmarca)"""
+    soup = parse_html(content)
+
+    descripcion = ""
+    desc_div = soup.find('div', class_='descripcion')
+    if desc_div:
+        descripcion = desc_div.get_text(strip=True)
+
+    return {'url': url, 'description': _descripcion_por_defecto(soup, descripcion).strip()}
+
+
+def descripcion_nouaire(url, content):
+    """Descripción de una ficha de nouaire: el bloque que sigue al título 'Descripción'"""
+    soup = parse_html(content)
+
+    descripcion = ""
+    desc_div = soup.find('div', string=re.compile(r'Descripción', re.IGNORECASE))
+    if desc_div:
+        parent = desc_div.parent
+        if parent:
+            desc_content = parent.find_next_sibling()
+            if desc_content:
+                descripcion = desc_content.get_text(strip=True)
+
+    descripcion = _descripcion_por_defecto(soup, descripcion, palabras=('ubicación',))
+    return {'url': url, 'description': descripcion.strip()}
+
+
+def descripcion_pisosad(url, content):
+    """Descripción de una ficha de pisos.ad, priorizando el texto que menciona Pas de la Casa"""
+    descripcion = ""
+    html_content = content.decode('utf-8', errors='ignore')
+
+    # Si la página contiene "Pas de la Casa", priorizar esa descripción
+    if 'Pas de la Casa' in html_content:
+        # Estrategia 1: Buscar desde "Busques" hasta "perfecta"
+        match = re.search(r'Busques una inversió.*?perfecta', html_content, re.DOTALL | re.IGNORECASE)
+        if match and 'Pas de la Casa' in match.group(0):
+            descripcion = match.group(0)
+
+        # Estrategia 2: Si no funciona, buscar líneas que contengan "Pas de la Casa"
+        if not descripcion:
+            for line in html_content.split('\n'):
+                if 'Pas de la Casa' in line and len(line) > 200:
+                    descripcion = line
+                    break
+
+    # BÚSQUEDA ESTÁNDAR: Si no hay "Pas de la Casa", usar métodos convencionales
+    if not descripcion:
+        soup = parse_html(content)
+        desc_div = soup.find('div', class_='descripcion')
+        if desc_div:
+            descripcion = desc_div.get_text(strip=True)
+        descripcion = _descripcion_por_defecto(soup, descripcion)
+
+    if descripcion:
+        descripcion = descripcion.replace('~~', '. ').replace('\\n', ' ').replace('\\t', ' ')
+        descripcion = html.unescape(descripcion).strip()
+
+    return {'url': url, 'description': descripcion.strip()}
+
+
+# En pisos.ad aparece como: TÍTULO   \rPRECIO €\r \r[precio/m2] €/m2
+PISOSAD_PRICE_PATTERNS = [
+    r'(?:VENDA|venda).*?\r(\d+(?:\.\d{3})*)\s*€\r',  # Patrón específico de pisos.ad
+    r'\r(\d+(?:\.\d{3})*)\s*€\r\s*\r[\d,]+\s*€/m2', # Precio seguido de precio/m2
+    r'(?:PIS|XALET|CASA|TERRENY).*?\r(\d+(?:\.\d{3})*)\s*€\r', # Tipos de propiedad + precio
+    r'^.*?(\d{3}(?:\.\d{3})+)\s*€.*?€/m2',          # Precio grande seguido de precio/m2
+]
+PISOSAD_ROOMS_PATTERNS = [r'(\d+)\s*habitacion', r'(\d+)\s*hab\b', r'(\d+)\s*dormitori']
+PISOSAD_BATHS_PATTERNS = [r'(\d+)\s*bany', r'(\d+)\s*lavabo', r'(\d+)\s*wc']
+PISOSAD_SURFACE_PATTERNS = [r'(\d+[,.]?\d*)\s*m[²2]', r'(\d+[,.]?\d*)\s*metre', r'(\d+[,.]?\d*)\s*sq']
+
+
+def pisosad_property(relative_url, content):
+    """Campos de una ficha de pisos.ad (título, precio, ubicación, habitaciones, baños, superficie)"""
+    # html.parser conserva los \r en los que se apoyan los patrones de precio
+    soup = parse_html(content, backend="html.parser")
+
+    # Extraer título - buscar en diferentes lugares
+    title = "Sin título"
+    for selector in ["h1", "h2", ".property-title", ".listing-title"]:
+        title_elem = soup.select_one(selector)
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+            break
+
+    # Si no encuentra título, usar el de la URL
+    if title == "Sin título" or len(title) < 10:
+        url_parts = relative_url.strip("/").split("/")
+        if len(url_parts) >= 2:
+            title = url_parts[-1].replace("-", " ").title()
+
+    # Extraer precio - buscar el precio principal en el HTML
+    price = 0
+    page_text = soup.get_text()
+
+    for pattern in PISOSAD_PRICE_PATTERNS:
+        match = re.search(pattern, page_text, re.IGNORECASE | re.MULTILINE)
+        if match:
+            price_str = match.group(1).replace('.', '')  # Remove thousands separators
+            try:
+                price = int(price_str)
+                if price > 50000:  # Precio mínimo razonable
+                    break
+            except ValueError:
+                continue
+
+    # Si no encuentra con patrones específicos, usar extracción general de la primera parte
+    if price == 0:
+        # Buscar en los primeros 3000 caracteres donde suele estar el precio principal
+        extracted_price = extraer_precio(page_text[:3000])
+        if extracted_price and 50000 <= extracted_price <= 50000000:  # Rango razonable
+            price = int(extracted_price)
+
+    # Ubicación: de la URL (.../location/id o .../location) y, si no, el título
+    location = ""
+    for pattern in [r'/([^/]+)/(\d+)$', r'/([^/]+)/?$']:
+        location_match = re.search(pattern, relative_url)
+        if location_match:
+            location = location_match.group(1).replace("-", " ").title()
+            break
+    if not location:
+        location = title
+
+    # Extraer detalles (habitaciones, baños, superficie)
+    rooms = bathrooms = surface = 0
+
+    for pattern in PISOSAD_ROOMS_PATTERNS:
+        rooms_match = re.search(pattern, page_text, re.IGNORECASE)
+        if rooms_match:
+            rooms = int(rooms_match.group(1))
+            break
+
+    for pattern in PISOSAD_BATHS_PATTERNS:
+        banys_match = re.search(pattern, page_text, re.IGNORECASE)
+        if banys_match:
+            bathrooms = int(banys_match.group(1))
+            break
+
+    # Superficie con decimales (46,92 o 46.92)
+    for pattern in PISOSAD_SURFACE_PATTERNS:
+        surface_match = re.search(pattern, page_text, re.IGNORECASE)
+        if surface_match:
+            surface = float(surface_match.group(1).replace(',', '.'))
+            break
+
+    return {
+        "title": title,
+        "price": price,
+        "location": location,
+        "rooms": rooms,
+        "bathrooms": bathrooms,
+        "surface": surface,
+    }
@@ -0,0 +1,179 @@
+"""
+Pipeline común de los scrapers.
+
+Cada scraper implementa dos etapas propias:
+    fetch()        -> genera las páginas de listado (o cualquier unidad de trabajo)
+    parse(page)    -> genera los datos en bruto (dicts) de cada propiedad de la página
+y hereda las comunes:
+    normalize(raw) -> un registro con el esquema RECORD_FIELDS (o None para descartarlo)
+    persist(records) -> guarda los registros y devuelve cuántos se han guardado
+
+run() encadena las etapas, descarta URLs repetidas y mide el tiempo y los
+elementos de cada etapa, de modo que la concurrencia, la caché, los lotes y
+la instrumentación se añaden aquí una sola vez. Los registros no se acumulan:
+pasan a un BackgroundWriter (cola acotada + hilo escritor, ver
+src/database/writer.py) que los escribe por lotes mientras el scraper sigue
+descargando, y que escribe lo pendiente al recibir SIGTERM.
+"""
+
+import time
+from contextlib import contextmanager
+
+from ..database.operations import PropertyRepository
+from ..database.connection import create_tables
+from ..database.writer import BackgroundWriter, WRITER_QUEUE
+from ..fetch import get_client
+from ..parsing import get_parse_pool
+from .sink import RecordSink, flush_on_sigterm, FLUSH_RECORDS, FLUSH_SECONDS
+
+# Esquema de registro que entregan todos los scrapers a persist()
+RECORD_FIELDS = ('reference', 'operation', 'price', 'rooms', 'bathrooms', 'surface',
+                 'title', 'location', 'address', 'url', 'website')
+
+RECORD_DEFAULTS = {
+    'reference': 'N/A',
+    'operation': 'N/A',
+    'price': 0,
+    'rooms': 0,
+    'bathrooms': 0,
+    'surface': 0,
+    'title': 'N/A',
+    'location': 'N/A',
+    'address': 'N/A',
+    'url': '',
+    'website': '',
+}
+
+STAGES = ('fetch', 'parse', 'normalize', 'persist')
+
+
+def normalize_record(raw, website):
+    """
+    Convierte un dict en bruto al esquema RECORD_FIELDS: descarta las claves
+    que no forman parte del esquema y rellena las que faltan o son None
+    """
+    record = {}
+    for field in RECORD_FIELDS:
+        value = raw.get(field)
+        record[field] = RECORD_DEFAULTS[field] if value is None else value
+    if not record['website']:
+        record['website'] = website
+    return record
+
+
+class BaseScraper:
+    # Nombre corto para los mensajes y las estadísticas
+    tag = None
+
+    def __init__(self):
+        self.client = get_client()
+        self.parse_pool = get_parse_pool()
+        self.stage_stats = {stage: {'items': 0, 'seconds': 0.0} for stage in STAGES}
+        self._seen_urls = set()
+
+    # --- Etapas propias de cada sitio -------------------------------------
+
+    def fetch(self):
+        """Genera las páginas (o unidades de trabajo) que procesa parse()"""
+        raise NotImplementedError
+
+    def parse(self, page):
+        """Genera un dict en bruto por propiedad de la página"""
+        raise NotImplementedError
+
+    # --- Etapas comunes ----------------------------------------------------
+
+    def normalize(self, raw):
+        """Registro con el esquema RECORD_FIELDS, o None para descartarlo"""
+        return normalize_record(raw, self.website)
+
+    def persist(self, records):
+        """Guarda los registros (upsert, una fila por propiedad y día) y devuelve cuántos se han guardado"""
+        if not records:
+            return 0
+        counts = PropertyRepository.upsert_properties(records)
+        return counts['new'] + counts['updated']
+
+    # --- Pipeline ----------------------------------------------------------
+
+    @contextmanager
+    def _stage(self, stage, items=1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stage_stats[stage]
+            stats['seconds'] += time.perf_counter() - start
+            stats['items'] += items
+
+    def records(self):
+        """Encadena fetch -> parse -> normalize y genera los registros válidos"""
+        pages = iter(self.fetch())
+        while True:
+            with self._stage('fetch'):
+                page = next(pages, None)
+            if page is None:
+                self.stage_stats['fetch']['items'] -= 1
+                return
+
+            try:
+                with self._stage('parse'):
+                    raws = list(self.parse(page))
+            except Exception as e:
+                print(f"Error al procesar una página de {self.website}: {e}")
+                continue
+
+            for raw in raws:
+                with self._stage('normalize'):
+                    record = self.normalize(raw)
+                if record is None:
+                    continue
+                if record['url'] and record['url'] in self._seen_urls:
+                    continue
+                self._seen_urls.add(record['url'])
+                yield record
+
+    def run(self):
+        """
+        Ejecuta el scraper completo y devuelve el número de propiedades guardadas
+        (los lotes con error de escritura quedan en self.write_errors)
+        """
+        create_tables()
+        print(f"🏠 Iniciando scraper de {self.website}...")
+
+        self.writer = self._open_writer()
+        with flush_on_sigterm(), self.writer as sink:
+            for record in self.records():
+                sink.add(record)
+
+        # Lotes que no se pudieron escribir (el escritor en segundo plano los cuenta
+        # en lugar de propagar la excepción): el runner los marca como fallo
+        self.write_errors = getattr(sink, 'errors', 0)
+
+        self.print_stats()
+        print(f"🏁 Scraping de {self.website} completado: {sink.received} propiedades, {sink.saved} guardadas")
+        if self.write_errors:
+            print(f"❌ {self.write_errors} lotes de {self.website} no se pudieron escribir")
+        return sink.saved
+
+    def _open_writer(self):
+        """Escritor en segundo plano, o en el hilo del scraper con SCRAPER_WRITER_QUEUE=0"""
+        name = self.tag or self.website
+        if WRITER_QUEUE > 0:
+            return BackgroundWriter(self._timed_persist, batch_size=FLUSH_RECORDS,
+                                    flush_interval=FLUSH_SECONDS, max_queue=WRITER_QUEUE, name=name)
+        return RecordSink(self._timed_persist, name=name)
+
+    def _timed_persist(self, records):
+        with self._stage('persist', items=len(records)):
+            return self.persist(records)
+
+    def print_stats(self):
+        for component in ('filters', 'special_locations', 'parse_pool', 'writer'):
+            if hasattr(self, component):
+                getattr(self, component).print_stats()
+
+        print(f"⏱️ [{self.tag or self.website}] Etapas:")
+        for stage in STAGES:
+            stats = self.stage_stats[stage]
+            print(f"   - {stage}: {stats['items']} elementos en {stats['seconds']:.2f}s")
@@ -1,72 +1,43 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 import unicodedata
-from ..database.operations import PropertyRepository
-from ..database.connection import create_tables
-from ..utils.text_cleaner import limpiar_texto, extraer_precio, detectar_pas_de_la_casa, detectar_arinsal, detectar_bordes
+from ..parsing import parse_html
+from ..parsing.workers import descripcion_generica
+from ..utils.text_cleaner import limpiar_texto, extraer_precio
+from ..utils import gazetteer
+from ..utils.special_locations import SpecialLocationResolver
+from ..utils.filter_pipeline import FilterPipeline, NETWORK, price_at_most, in_andorra
+from .base import BaseScraper
+
+class ClausScraper(BaseScraper):
+    tag = 'CLAUS'
 
-class ClausScraper:
     def __init__(self):
+        super().__init__()
         self.base_url = "http://www.7claus.com"
         self.listing_url = "http://www.7claus.com/cercador/pisos_duplex_apartaments_atics/andorra_andorra/"
         self.website = "www.7claus.com"
         
-        # Ubicaciones válidas de Andorra
-        self.andorra_keywords = [
-            'andorra', 'escaldes', 'engordany', 'sant julia', 'encamp', 'canillo', 
-            'massana', 'ordino', 'pas de la casa', 'arinsal', 'bordes', 'envalira',
-            'tarter', 'soldeu', 'incles', 'pal', 'serrat', 'les bons', 'santa coloma',
-            'erts', 'llorts', 'sispony', 'ransol', 'aixovall', 'nagol'
-        ]
+        # Pas de la Casa / Arinsal / Bordes d'Envalira con caché de descripciones
+        self.special_locations = SpecialLocationResolver(self.website, self.get_property_description, tag='CLAUS')
+        
+        # Filtros: primero los de fila, al final los que necesitan red
+        card_keys = ('title', 'reference', 'price', 'location', 'rooms', 'bathrooms', 'surface')
+        self.filters = FilterPipeline('CLAUS', needs_fetch=lambda row: self.special_locations.row_would_fetch(row, card_keys))
+        self.filters.add('precio <= 450.000€', price_at_most(450000, 'CLAUS'))
+        self.filters.add('ubicación en Andorra', in_andorra(self.is_andorra_location, 'CLAUS'))
+        self.filters.add('poblaciones especiales', lambda row: self.special_locations.resolve_row(row, card_keys), cost=NETWORK)
+        self.filters.add('datos mínimos', lambda row: row['title'] != 'N/A' and row['price'] != 0)
     
     def is_andorra_location(self, location):
         """
         Verifica si una ubicación pertenece a Andorra
         """
-        if not location or location == 'N/A':
-            return False
-            
-        location_lower = location.lower()
-        
-        # Verificar si contiene alguna palabra clave de Andorra
-        return any(keyword in location_lower for keyword in self.andorra_keywords)
-        
-    def run(self):
-        """
-        Ejecuta el scraper principal
-        """
-        # Crear tablas si no existen
-        create_tables()
-        
-        # Obtener las propiedades
-        propiedades = self.obtener_propiedades()
-        
-        # Procesar cada propiedad
-        property_repo = PropertyRepository()
-        propiedades_procesadas = 0
-        
-        for propiedad in propiedades:
-            try:
-                # Extraer datos de la propiedad
-                property_data = self.extract_property_data(propiedad)
-                
-                if property_data:
-                    # Guardar la propiedad
-                    if property_repo.save_property(property_data):
-                        propiedades_procesadas += 1
-                        print(f"✅ Propiedad guardada: {property_data.get('titulo', 'Sin título')[:50]}...")
-                    else:
-                        print(f"❌ Error al guardar: {property_data.get('titulo', 'Sin título')[:50]}...")
-                        
-            except Exception as e:
-                print(f"Error procesando propiedad: {e}")
-        
-        print(f"🏁 Scraping completado. {propiedades_procesadas} propiedades procesadas")
+        return gazetteer.is_andorra(location)
 
-    def obtener_propiedades(self):
-        """Obtiene la lista de propiedades de la página de listado"""
+    def fetch(self):
+        """La página de listado con todas las tarjetas"""
         try:
             print(f"Obteniendo propiedades de: {self.listing_url}")
             
@@ -74,56 +45,34 @@ class ClausScraper:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(self.listing_url, headers=headers)
+            response = self.client.get(self.listing_url, headers=headers)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            cards = soup.find_all('div', class_='cardAnuncio')
-            
-            print(f"Encontradas {len(cards)} propiedades")
-            return cards
+            yield response.content
             
         except requests.RequestException as e:
             print(f"Error al obtener propiedades: {e}")
-            return []
+
+    def parse(self, page):
+        """Una propiedad por tarjeta div.cardAnuncio"""
+        soup = parse_html(page, only='claus_cards')
+        cards = soup.find_all('div', class_='cardAnuncio')
+        print(f"Encontradas {len(cards)} propiedades")
+        
+        for card in cards:
+            property_data = self.extract_property_data(card)
+            if property_data:
+                yield property_data
 
     def get_property_description(self, url_inmueble):
         """
         Obtiene la descripción completa de una propiedad específica
+        (el parseo se hace en el pool de procesos)
         """
         try:
-            response = requests.get(url_inmueble, timeout=10)
+            response = self.client.get(url_inmueble, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Buscar la descripción en diferentes posibles ubicaciones
-            descripcion = ""
-            
-            # Buscar en div de descripción
-            desc_div = soup.find('div', class_='descripcion')
-            if desc_div:
-                descripcion = desc_div.get_text(strip=True)
-            
-            # Si no se encontró, buscar por otros selectores comunes
-            if not descripcion:
-                # Buscar en párrafos largos
-                paragrafos = soup.find_all('p')
-                for p in paragrafos:
-                    texto = p.get_text(strip=True)
-                    if len(texto) > 100:
-                        descripcion += " " + texto
-            
-            # También buscar en divs que contengan mucho texto
-            if not descripcion:
-                divs = soup.find_all('div')
-                for div in divs:
-                    texto = div.get_text(strip=True)
-                    if len(texto) > 200 and ('ubicación' in texto.lower() or 'situado' in texto.lower()):
-                        descripcion = texto
-                        break
-            
-            return descripcion.strip()
+            return self.parse_pool.parse(descripcion_generica, url_inmueble, response.content)['description']
             
         except Exception as e:
             print(f"Error al obtener descripción de {url_inmueble}: {e}")
@@ -163,11 +112,6 @@ class ClausScraper:
                 precio_text = precio_elem.get_text().strip().split('\n')[0].strip()
                 data['price'] = extraer_precio(precio_text)
             
-            # FILTRO 1: Saltar propiedades con precio mayor a 450,000€
-            if data['price'] > 450000:
-                print(f"⚠️ [CLAUS] Propiedad filtrada por precio alto: {data['price']:,.0f}€ > 450,000€")
-                return None
-            
             # Extraer ubicación del título ANTES del filtro de Andorra
             if data['title'] != 'N/A':
                 # El título suele tener formato "Pis a Carrer Sant Jordi"
@@ -176,10 +120,7 @@ class ClausScraper:
                     if len(parts) > 1:
                         data['location'] = limpiar_texto(parts[1])
                 
-            # FILTRO 2: Verificar que la propiedad esté en Andorra ANTES de detectar poblaciones especiales
-            if not self.is_andorra_location(data['location']):
-                print(f"🌍 [CLAUS] Propiedad filtrada por estar fuera de Andorra: {data['location']}")
-                return None            # Extraer características (habitaciones, baños, superficie)
+            # Extraer características (habitaciones, baños, superficie)
             props = card.find_all('li')
             for prop in props:
                 divs = prop.find_all('div')
@@ -211,50 +152,9 @@ class ClausScraper:
                 detail_path = btn_contacto['data-url'].split('#')[0]
                 data['url'] = f"{self.base_url}{detail_path}"
             
-            # FILTRO 3: Detectar poblaciones especiales DESPUÉS de confirmar que está en Andorra
-            
-            # Verificar Pas de la Casa (Encamp o ubicaciones genéricas)
-            if data['location'] and ('encamp' in data['location'].lower() or 'andorra' in data['location'].lower() or data['location'] == 'N/A'):
-                print(f"🔍 [CLAUS] Verificando descripción para posible Pas de la Casa: {data['url']}")
-                descripcion = self.get_property_description(data['url'])
-                
-                if descripcion and detectar_pas_de_la_casa(descripcion):
-                    print(f"✅ [CLAUS] ¡Detectado Pas de la Casa en descripción! Cambiando ubicación de '{data['location']}' a 'Pas de la Casa'")
-                    data['location'] = "Pas de la Casa"
-                else:
-                    print(f"❌ [CLAUS] No se detectó Pas de la Casa en la descripción")
-            
-            # Verificar Arinsal (La Massana o Arinsal directo)
-            elif data['location'] and ('massana' in data['location'].lower() or 'arinsal' in data['location'].lower()):
-                print(f"🔍 [CLAUS] Verificando descripción para posible Arinsal: {data['url']}")
-                descripcion = self.get_property_description(data['url'])
-                
-                if descripcion and detectar_arinsal(descripcion):
-                    print(f"✅ [CLAUS] ¡Detectado Arinsal en descripción! Cambiando ubicación de '{data['location']}' a 'Arinsal'")
-                    data['location'] = "Arinsal"
-                else:
-                    print(f"❌ [CLAUS] No se detectó Arinsal en la descripción")
-            
-            # Verificar Bordes d'Envalira (Canillo, Soldeu, etc.)
-            elif data['location'] and ('canillo' in data['location'].lower() or 'soldeu' in data['location'].lower() or 
-                                     'incles' in data['location'].lower() or 'tarter' in data['location'].lower() or
-                                     'bordes' in data['location'].lower()):
-                print(f"🔍 [CLAUS] Verificando descripción para posible Bordes d'Envalira: {data['url']}")
-                descripcion = self.get_property_description(data['url'])
-                
-                if descripcion and detectar_bordes(descripcion):
-                    print(f"✅ [CLAUS] ¡Detectado Bordes d'Envalira en descripción! Cambiando ubicación de '{data['location']}' a 'Bordes d\\'Envalira'")
-                    data['location'] = "Bordes d'Envalira"
-                else:
-                    print(f"❌ [CLAUS] No se detectó Bordes d'Envalira en la descripción")
-            else:
-                print(f"ℹ️ [CLAUS] Ubicación '{data['location']}' no necesita verificación")
-            
-            # Verificar que tenemos datos mínimos
-            if data['title'] == 'N/A' or data['price'] == 0:
-                return None
-                
-            return data
+            # Filtros ordenados por coste: precio, Andorra y datos mínimos antes
+            # de descargar la descripción para las poblaciones especiales
+            return self.filters.run(data)
             
         except Exception as e:
             print(f"Error al extraer datos de propiedad: {e}")
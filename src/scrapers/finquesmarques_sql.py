@@ -1,62 +1,73 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 import unicodedata
-from ..database.operations import PropertyRepository
-from ..database.connection import create_tables
-from ..utils.text_cleaner import limpiar_texto, extraer_precio, detectar_pas_de_la_casa, detectar_arinsal, detectar_bordes, convertir_a_entero
+from ..parsing import parse_html
+from ..parsing.workers import descripcion_generica
+from ..utils.text_cleaner import limpiar_texto, extraer_precio, convertir_a_entero
+from ..utils.special_locations import SpecialLocationResolver
+from ..utils.filter_pipeline import FilterPipeline, NETWORK, price_at_most
+from .base import BaseScraper
+
+class FinquesmarquesScraper(BaseScraper):
+    tag = 'FINQUESMARQUES'
 
-class FinquesmarquesScraper:
     def __init__(self):
+        super().__init__()
         self.base_url = "https://www.finquesmarca.com"
         self.website = "www.finquesmarca.com"
         
-    def run(self):
-        """
-        Ejecuta el scraper principal
-        """
-        # Crear tablas si no existen
-        create_tables()
+        # Pas de la Casa / Arinsal / Bordes d'Envalira con caché de descripciones
+        self.special_locations = SpecialLocationResolver(self.website, self.get_property_description, tag='FINQUESMARQUES')
         
+        # Filtros: primero los de fila, al final los que necesitan red
+        card_keys = ('reference', 'operation', 'title', 'location', 'price', 'rooms', 'bathrooms', 'surface')
+        self.filters = FilterPipeline('FINQUESMARQUES', needs_fetch=lambda row: self.special_locations.row_would_fetch(row, card_keys))
+        self.filters.add('precio <= 450.000€', price_at_most(450000, 'FINQUESMARQUES'))
+        self.filters.add('poblaciones especiales', lambda row: self.special_locations.resolve_row(row, card_keys), cost=NETWORK)
+        
+    def fetch(self):
+        """El buscador con las 120 últimas publicaciones"""
         url = f"{self.base_url}/cercador/?Referencia=&CampoOrden=publicacion&DireccionOrden=desc&AnunciosPorParrilla=120"
         
         try:
-            response = requests.get(url)
+            response = self.client.get(url)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Encontrar todas las propiedades, omitiendo las que están dentro de un div con clase 'img'
-            propiedades = soup.find_all('a', class_='url-inmueble')
-            propiedades_filtradas = [p for p in propiedades if not p.find_parent('div', class_='img')]
-            
-            urls_unicas = set()
-            
-            for propiedad in propiedades_filtradas:
-                try:
-                    property_data = self.extract_property_data(propiedad, urls_unicas)
-                    if property_data:
-                        PropertyRepository.save_property(property_data)
-                        
-                except Exception as e:
-                    print(f"Error al procesar una propiedad: {e}")
-                    continue
-                    
-            print(f"Scraping completado. Procesadas {len(urls_unicas)} propiedades únicas.")
+            yield response.content
             
         except Exception as e:
             print(f"Error en el scraper: {e}")
     
+    def parse(self, page):
+        """Una propiedad por enlace a.url-inmueble de cada div.card"""
+        soup = parse_html(page, only='finques_cards')
+        
+        # Encontrar todas las propiedades, omitiendo las que están dentro de un div con clase 'img'
+        propiedades = soup.find_all('a', class_='url-inmueble')
+        propiedades_filtradas = [p for p in propiedades if not p.find_parent('div', class_='img')]
+        
+        urls_unicas = set()
+        
+        for propiedad in propiedades_filtradas:
+            try:
+                property_data = self.extract_property_data(propiedad, urls_unicas)
+                if property_data:
+                    yield property_data
+                    
+            except Exception as e:
+                print(f"Error al procesar una propiedad: {e}")
+                continue
+        
+        print(f"Procesadas {len(urls_unicas)} propiedades únicas.")
+    
     def scrape_page(self, url):
         """
         Scraper para una página específica (usado para testing)
         """
         try:
-            response = requests.get(url)
+            response = self.client.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content, only='finques_cards')
             propiedades = soup.find_all('div', class_='card')
             
             # Filtrar artículos que no contienen propiedades
@@ -87,40 +98,13 @@ class FinquesmarquesScraper:
     def get_property_description(self, url_inmueble):
         """
         Obtiene la descripción completa de una propiedad específica
+        (el parseo se hace en el pool de procesos)
         """
         try:
-            response = requests.get(url_inmueble, timeout=10)
+            response = self.client.get(url_inmueble, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Buscar la descripción en diferentes posibles ubicaciones
-            descripcion = ""
-            
-            # Buscar en div de descripción
-            desc_div = soup.find('div', class_='descripcion')
-            if desc_div:
-                descripcion = desc_div.get_text(strip=True)
-            
-            # Si no se encontró, buscar por otros selectores comunes
-            if not descripcion:
-                # Buscar en párrafos largos
-                paragrafos = soup.find_all('p')
-                for p in paragrafos:
-                    texto = p.get_text(strip=True)
-                    if len(texto) > 100:
-                        descripcion += " " + texto
-            
-            # También buscar en divs que contengan mucho texto
-            if not descripcion:
-                divs = soup.find_all('div')
-                for div in divs:
-                    texto = div.get_text(strip=True)
-                    if len(texto) > 200 and ('ubicación' in texto.lower() or 'situado' in texto.lower()):
-                        descripcion = texto
-                        break
-            
-            return descripcion.strip()
+            return self.parse_pool.parse(descripcion_generica, url_inmueble, response.content)['description']
             
         except Exception as e:
             print(f"Error al obtener descripción de {url_inmueble}: {e}")
@@ -180,45 +164,6 @@ class FinquesmarquesScraper:
         if direccion_div:
             poblacion = limpiar_texto(direccion_div.get_text(strip=True))
         
-        # NUEVA LÓGICA: Verificar descripción para ubicaciones específicas
-        
-        # Verificar Pas de la Casa (Encamp o ubicaciones genéricas)
-        if poblacion and ('encamp' in poblacion.lower() or 'andorra' in poblacion.lower() or poblacion == 'N/A'):
-            print(f"🔍 [FINQUESMARQUES] Verificando descripción para posible Pas de la Casa: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_pas_de_la_casa(descripcion):
-                print(f"✅ [FINQUESMARQUES] ¡Detectado Pas de la Casa en descripción! Cambiando ubicación de '{poblacion}' a 'Pas de la Casa'")
-                poblacion = "Pas de la Casa"
-            else:
-                print(f"❌ [FINQUESMARQUES] No se detectó Pas de la Casa en la descripción")
-        
-        # Verificar Arinsal (La Massana o Arinsal directo)
-        elif poblacion and ('massana' in poblacion.lower() or 'arinsal' in poblacion.lower()):
-            print(f"🔍 [FINQUESMARQUES] Verificando descripción para posible Arinsal: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_arinsal(descripcion):
-                print(f"✅ [FINQUESMARQUES] ¡Detectado Arinsal en descripción! Cambiando ubicación de '{poblacion}' a 'Arinsal'")
-                poblacion = "Arinsal"
-            else:
-                print(f"❌ [FINQUESMARQUES] No se detectó Arinsal en la descripción")
-        
-        # Verificar Bordes d'Envalira (Canillo, Soldeu, etc.)
-        elif poblacion and ('canillo' in poblacion.lower() or 'soldeu' in poblacion.lower() or 
-                           'incles' in poblacion.lower() or 'tarter' in poblacion.lower() or
-                           'bordes' in poblacion.lower()):
-            print(f"🔍 [FINQUESMARQUES] Verificando descripción para posible Bordes d'Envalira: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_bordes(descripcion):
-                print(f"✅ [FINQUESMARQUES] ¡Detectado Bordes d'Envalira en descripción! Cambiando ubicación de '{poblacion}' a 'Bordes d\\'Envalira'")
-                poblacion = "Bordes d'Envalira"
-            else:
-                print(f"❌ [FINQUESMARQUES] No se detectó Bordes d'Envalira en la descripción")
-        else:
-            print(f"ℹ️ [FINQUESMARQUES] Población '{poblacion}' no necesita verificación")
-        
         # Extraer precio del contenedor
         precio_div = contenedor.find('div', class_='precio')
         if precio_div:
@@ -227,11 +172,6 @@ class FinquesmarquesScraper:
                 precio_text = precio_span.get_text(strip=True)
                 precio = extraer_precio(precio_text)
         
-        # FILTRO: Saltar propiedades con precio mayor a 450,000€
-        if precio > 450000:
-            print(f"⚠️ [FINQUESMARQUES] Propiedad filtrada por precio alto: {precio:,.0f}€ > 450,000€")
-            return None
-        
         # Extraer características del contenedor - BUSCAR EN UL.LIST-INLINE
         caract_ul = contenedor.find('ul', class_='list-inline')
         if caract_ul:
@@ -256,7 +196,9 @@ class FinquesmarquesScraper:
                     superficie_str = superficie_match.group(1).replace(',', '.')
                     superficie = float(superficie_str)
         
-        return {
+        # Filtros ordenados por coste: precio antes de descargar la
+        # descripción para las poblaciones especiales
+        return self.filters.run({
             'reference': referencia,
             'operation': operacion,
             'price': precio,
@@ -268,7 +210,7 @@ class FinquesmarquesScraper:
             'address': 'N/A',
             'url': url_inmueble,
             'website': self.website
-        }
+        })
 
 
 if __name__ == "__main__":
@@ -1,130 +1,92 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
-from ..database.operations import PropertyRepository
-from ..database.connection import create_tables
+from ..parsing import parse_html
+from ..parsing.workers import descripcion_nouaire
 from ..utils.text_cleaner import limpiar_texto, extraer_precio, detectar_pas_de_la_casa, detectar_arinsal, detectar_bordes
+from ..utils import gazetteer
+from ..utils.special_locations import SpecialLocationResolver, location_trigger
+from ..utils.filter_pipeline import FilterPipeline, NETWORK, price_at_most, in_andorra
+from .base import BaseScraper
+
+class NouaireScraper(BaseScraper):
+    tag = 'NOUAIRE'
+    # Datos del listado que, si cambian, obligan a revisar la descripción
+    CARD_KEYS = ('reference', 'operation', 'title', 'location', 'surface', 'price', 'rooms', 'bathrooms')
 
-class NouaireScraper:
     def __init__(self):
+        super().__init__()
         self.base_url = "https://www.nouaire.com"
         self.website = "www.nouaire.com"
+        self.urls_unicas = set()
+        
+        # Pas de la Casa / Arinsal / Bordes d'Envalira con caché de descripciones
+        self.special_locations = SpecialLocationResolver(self.website, self.get_property_description, rules=[
+            ("Pas de la Casa", detectar_pas_de_la_casa, location_trigger('encamp', blank=True)),
+            ("Arinsal", detectar_arinsal, location_trigger('massana')),
+            ("Bordes d'Envalira", detectar_bordes, location_trigger('canillo', 'soldeu')),
+        ])
         
-        # Ubicaciones válidas de Andorra
-        self.andorra_keywords = [
-            'andorra', 'escaldes', 'engordany', 'sant julia', 'encamp', 'canillo', 
-            'massana', 'ordino', 'pas de la casa', 'arinsal', 'bordes', 'envalira',
-            'tarter', 'soldeu', 'incles', 'pal', 'serrat', 'les bons', 'santa coloma',
-            'erts', 'llorts', 'sispony', 'ransol', 'aixovall', 'nagol'
-        ]
+        # Filtros: primero los de fila, al final los que necesitan red
+        self.filters = FilterPipeline('NOUAIRE', needs_fetch=lambda row: self.special_locations.row_would_fetch(row, self.CARD_KEYS))
+        self.filters.add('precio <= 450.000€', price_at_most(450000, 'NOUAIRE'))
+        self.filters.add('ubicación en Andorra', in_andorra(self.is_andorra_location, 'NOUAIRE'))
+        self.filters.add('poblaciones especiales', self.detect_special_locations_stage, cost=NETWORK)
     
     def is_andorra_location(self, location):
         """
         Verifica si una ubicación pertenece a Andorra
         """
-        if not location or location == 'N/A':
-            return False
-            
-        location_lower = location.lower()
-        
-        # Verificar si contiene alguna palabra clave de Andorra
-        return any(keyword in location_lower for keyword in self.andorra_keywords)
+        return gazetteer.is_andorra(location)
     
-    def detect_special_locations(self, poblacion, url_inmueble):
+    def detect_special_locations(self, poblacion, url_inmueble, card_fields=None):
         """
-        Detecta poblaciones especiales de Andorra basándose en la descripción
+        Detecta poblaciones especiales de Andorra basándose en la descripción.
+        La descripción sólo se descarga si no hay veredicto guardado para la URL
+        o si los datos del listado (card_fields) han cambiado.
         """
         if not poblacion:
             return poblacion
-            
-        # Si la población inicial es Encamp, verificar si realmente es Pas de la Casa
-        if 'encamp' in poblacion.lower() or poblacion == 'N/A':
-            print(f"🔍 Verificando descripción para posible Pas de la Casa: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_pas_de_la_casa(descripcion):
-                print(f"✅ ¡Detectado Pas de la Casa en descripción! Cambiando ubicación de '{poblacion}' a 'Pas de la Casa'")
-                return "Pas de la Casa"
-            else:
-                print(f"❌ No se detectó Pas de la Casa en la descripción")
-        
-        # Verificar si es Arinsal (independiente de la población inicial)
-        elif 'massana' in poblacion.lower():
-            print(f"🔍 Verificando descripción para posible Arinsal: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_arinsal(descripcion):
-                print(f"✅ ¡Detectado Arinsal en descripción! Cambiando ubicación de '{poblacion}' a 'Arinsal'")
-                return "Arinsal"
-            else:
-                print(f"❌ No se detectó Arinsal en la descripción")
         
-        # Verificar si es Bordes d'Envalira
-        elif 'canillo' in poblacion.lower() or 'soldeu' in poblacion.lower():
-            print(f"🔍 Verificando descripción para posible Bordes d'Envalira: {url_inmueble}")
-            descripcion = self.get_property_description(url_inmueble)
-            
-            if descripcion and detectar_bordes(descripcion):
-                print(f"✅ ¡Detectado Bordes d'Envalira en descripción! Cambiando ubicación de '{poblacion}' a 'Bordes d\\'Envalira'")
-                return "Bordes d'Envalira"
-            else:
-                print(f"❌ No se detectó Bordes d'Envalira en la descripción")
-        else:
-            print(f"ℹ️ Población '{poblacion}' no necesita verificación")
-            
-        return poblacion
+        return self.special_locations.resolve(poblacion, url_inmueble, card_fields or {'location': poblacion})
+    
+    def detect_special_locations_stage(self, row):
+        """Etapa de red del pipeline de filtros"""
+        row['location'] = self.detect_special_locations(
+            row['location'], row['url'], {key: row.get(key) for key in self.CARD_KEYS})
+        return True
         
-    def run(self):
-        """
-        Ejecuta el scraper principal
-        """
-        # Crear tablas si no existen
-        create_tables()
+    def fetch(self):
+        """Las páginas del buscador (100 propiedades por página)"""
+        # Obtener número de propiedades y páginas
+        last_page_number = self.get_last_page_number()
         
-        try:
-            # Obtener número de propiedades y páginas
-            last_page_number = self.get_last_page_number()
-            
-            urls_unicas = set()
-            all_properties = []  # Lista para acumular todas las propiedades
-            
-            # Iterar sobre todas las páginas
-            for page_num in range(1, last_page_number + 1):
-                url = f"{self.base_url}/prop/buscador/limit:100/page:{page_num}"
-                print(f"Procesando página {page_num}: {url}")
-                
-                try:
-                    response = requests.get(url)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    propiedades = soup.find_all('div', class_='row pt10 pb10')
+        for page_num in range(1, last_page_number + 1):
+            url = f"{self.base_url}/prop/buscador/limit:100/page:{page_num}"
+            print(f"Procesando página {page_num}: {url}")
+            
+            try:
+                response = self.client.get(url)
+                response.raise_for_status()
+                yield response.content
                     
-                    # Extraer datos de propiedades (sin guardar aún)
-                    for propiedad in propiedades:
-                        try:
-                            property_data = self.extract_property_data(propiedad, urls_unicas)
-                            if property_data:
-                                all_properties.append(property_data)
-                                
-                        except Exception as e:
-                            print(f"Error al procesar una propiedad: {e}")
-                            continue
-                            
-                except Exception as e:
-                    print(f"Error al procesar página {page_num}: {e}")
-                    continue
-            
-            # Guardar todas las propiedades en lote al final
-            if all_properties:
-                saved_count = PropertyRepository.save_properties_batch(all_properties)
-                print(f"Scraping completado. Procesadas {len(urls_unicas)} propiedades únicas, {saved_count} guardadas.")
-            else:
-                print("Scraping completado. No se encontraron propiedades válidas.")
+            except Exception as e:
+                print(f"Error al procesar página {page_num}: {e}")
+                continue
+    
+    def parse(self, page):
+        """Una propiedad por fila div.row.pt10.pb10"""
+        soup = parse_html(page, only='nouaire_rows')
+        propiedades = soup.find_all('div', class_='row pt10 pb10')
+        
+        for propiedad in propiedades:
+            try:
+                property_data = self.extract_property_data(propiedad, self.urls_unicas)
+                if property_data:
+                    yield property_data
                     
-        except Exception as e:
-            print(f"Error en el scraper: {e}")
+            except Exception as e:
+                print(f"Error al procesar una propiedad: {e}")
+                continue
     
     def get_last_page_number(self):
         """
@@ -132,10 +94,10 @@ class NouaireScraper:
         """
         try:
             url_base = f"{self.base_url}/prop/comprar"
-            response = requests.get(url_base)
+            response = self.client.get(url_base)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content)
             
             # Buscar el icono de building para obtener el número de propiedades
             icono_building = soup.find('i', class_='fa fa-building')
@@ -159,45 +121,13 @@ class NouaireScraper:
     def get_property_description(self, url_inmueble):
         """
         Obtiene la descripción completa de una propiedad específica
+        (el parseo se hace en el pool de procesos)
         """
         try:
-            response = requests.get(url_inmueble, timeout=10)
+            response = self.client.get(url_inmueble, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Buscar la descripción en diferentes posibles ubicaciones
-            descripcion = ""
-            
-            # Buscar en div de descripción (común en nouaire)
-            desc_div = soup.find('div', string=re.compile(r'Descripción', re.IGNORECASE))
-            if desc_div:
-                # Buscar el contenido siguiente
-                parent = desc_div.parent
-                if parent:
-                    desc_content = parent.find_next_sibling()
-                    if desc_content:
-                        descripcion = desc_content.get_text(strip=True)
-            
-            # Si no se encontró, buscar por otros selectores comunes
-            if not descripcion:
-                # Buscar en párrafos largos (probable descripción)
-                paragrafos = soup.find_all('p')
-                for p in paragrafos:
-                    texto = p.get_text(strip=True)
-                    if len(texto) > 100:  # Párrafos largos probablemente sean descripción
-                        descripcion += " " + texto
-            
-            # También buscar en divs que contengan mucho texto
-            if not descripcion:
-                divs = soup.find_all('div')
-                for div in divs:
-                    texto = div.get_text(strip=True)
-                    if len(texto) > 200 and 'ubicación' in texto.lower():
-                        descripcion = texto
-                        break
-            
-            return descripcion.strip()
+            return self.parse_pool.parse(descripcion_nouaire, url_inmueble, response.content)['description']
             
         except Exception as e:
             print(f"Error al obtener descripción de {url_inmueble}: {e}")
@@ -296,19 +226,6 @@ class NouaireScraper:
                 precio_text = precio_div.get_text(strip=True)
                 precio = extraer_precio(precio_text)
             
-            # FILTRO 1: Saltar propiedades con precio mayor a 450,000€
-            if precio > 450000:
-                print(f"⚠️ Propiedad filtrada por precio alto: {precio:,.0f}€ > 450,000€")
-                return None
-            
-            # FILTRO 2: Verificar que la propiedad esté en Andorra ANTES de detectar poblaciones especiales
-            if not self.is_andorra_location(poblacion):
-                print(f"🌍 Propiedad filtrada por estar fuera de Andorra: {poblacion}")
-                return None
-                
-            # FILTRO 3: Detectar poblaciones especiales DESPUÉS de confirmar que está en Andorra
-            poblacion = self.detect_special_locations(poblacion, url_inmueble)
-            
             # Extraer habitaciones (div con icono fa-bed visible-xs-inline)
             habitaciones_divs = propiedad.find_all('div', class_='col-xs-6 col-sm-1 strong text-right')
             for div in habitaciones_divs:
@@ -332,7 +249,9 @@ class NouaireScraper:
                         baños = int(baños_match.group(1))
                     break
             
-            return {
+            # Filtros ordenados por coste: precio y Andorra antes de descargar
+            # la descripción para las poblaciones especiales
+            return self.filters.run({
                 'reference': referencia,
                 'operation': operacion,
                 'price': precio,
@@ -344,7 +263,7 @@ class NouaireScraper:
                 'address': 'N/A',
                 'url': url_inmueble,
                 'website': self.website
-            }
+            })
             
         except Exception as e:
             print(f"Error al extraer datos de propiedad: {e}")
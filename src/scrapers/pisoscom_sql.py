@@ -18,47 +18,47 @@ Fecha: Octubre 2025
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
-import time
-import random
+import threading
 from urllib.parse import urljoin, urlparse
 import logging
 from datetime import datetime
-from ..database.operations import PropertyRepository
-from ..database.connection import create_tables
+from ..parsing import parse_html, extract_structured_data
+from ..fetch import DetailFetcher
 from ..utils.text_cleaner import limpiar_texto
+from ..utils import gazetteer
+from .base import BaseScraper
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class PisoscomScraper:
+class PisoscomScraper(BaseScraper):
+    tag = 'PISOSCOM'
+
+    # Campos que se intentan leer del card antes de pedir la página de detalle
+    CARD_FIELDS = ('price', 'rooms', 'bathrooms', 'square_meters')
+
     def __init__(self):
+        super().__init__()
         self.base_url = "https://www.pisos.com"
         self.search_url = "https://www.pisos.com/venta/pisos-andorra/hasta-400000/"
         self.website = "pisos.com"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.max_pages = 10
+        self.last_page_count = 0
+        self.detail_fetcher = DetailFetcher()
+        # Páginas de detalle resueltas sólo con datos estructurados / con heurísticas DOM
+        # (se actualizan desde los hilos del DetailFetcher)
+        self.detail_structured_hits = 0
+        self.detail_dom_fallbacks = 0
+        self._detail_stats_lock = threading.Lock()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
-        })
-        
-        # Ubicaciones válidas de Andorra
-        self.andorra_keywords = [
-            'andorra', 'escaldes', 'engordany', 'sant julia', 'sant julià', 'encamp', 'canillo', 
-            'massana', 'la massana', 'ordino', 'pas de la casa', 'arinsal', 'bordes', 'envalira',
-            'tarter', 'el tarter', 'soldeu', 'incles', 'pal', 'serrat', 'el serrat', 'les bons', 
-            'santa coloma', 'erts', 'llorts', 'sispony', 'ransol', 'aixovall', 'nagol',
-            'bixessarri', 'aixàs', 'meritxell', 'vila', 'anyós', 'els cortals', 'centre',
-            'andorra la vella', 'escaldes engordany', 'la massana centro urbano', 'encamp centro urbano',
-            'canillo centro urbano', 'pas_de_la_casa', 'santa_coloma_distrito', 'andorra_la_vella_centre',
-            'escaldes_engordany_centro_urbano', 'la_massana_centro_urbano', 'encamp_centro_urbano',
-            'canillo_centro_urbano'
-        ]
+        }
         
     def extract_number(self, text):
         """Extrae números de un texto, preservando decimales."""
@@ -97,167 +97,185 @@ class PisoscomScraper:
         Returns:
             bool: True si es ubicación de Andorra, False si no
         """
-        if not location_text:
-            return False
-            
-        location_text = location_text.lower()
-        
-        # Verificar si alguna palabra clave está presente
-        for keyword in self.andorra_keywords:
-            if keyword in location_text:
-                return True
-                
-        return False
+        return gazetteer.is_andorra(location_text)
+
+    def location_from_url(self, url):
+        """Extrae la ubicación de la URL (/comprar/piso-encamp-123/) en una sola pasada."""
+        place = gazetteer.resolve(urlparse(url).path)
+        if place:
+            logger.info(f"Ubicación extraída de URL: {place.name}")
+            return place.name
+        return "Andorra"
 
     def extract_property_from_detail_page(self, url):
-        """Extrae datos completos de la página de detalle de una propiedad."""
+        """
+        Extrae datos completos de la página de detalle de una propiedad.
+        
+        Primero lee los datos estructurados (JSON-LD, microdata o JSON
+        embebido) directamente del HTML; sólo si falta alguno de los campos
+        numéricos, el título o la ubicación se construye el árbol DOM y se
+        usan las heurísticas.
+        """
         try:
             logger.info(f"Extrayendo detalles de: {url}")
-            response = self.session.get(url, timeout=10)
+            response = self.client.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            structured = extract_structured_data(response.content)
+            property_data = {
+                'title': structured.get('title'),
+                'price': structured.get('price'),
+                'location': None,
+                'rooms': structured.get('rooms'),
+                'bathrooms': structured.get('bathrooms'),
+                'square_meters': int(structured['surface']) if structured.get('surface') else None,
+                'description': structured.get('description'),
+                'url': url,
+                'image_url': urljoin(self.base_url, structured['image_url']) if structured.get('image_url') else None,
+                'source': self.website,
+                'scraped_at': datetime.now()
+            }
+            
+            # Ubicación: primero la URL, después la localidad de los datos estructurados
+            location = self.location_from_url(url)
+            if location == "Andorra" and self.is_andorra_location(structured.get('location')):
+                location = structured['location']
+            property_data['location'] = location
+            
+            # El árbol DOM también hace falta si los datos estructurados no traen el
+            # título (h1) o si ni la URL ni la localidad dan la ubicación
+            if (any(property_data[field] is None for field in self.CARD_FIELDS)
+                    or property_data['title'] is None or property_data['location'] == "Andorra"):
+                with self._detail_stats_lock:
+                    self.detail_dom_fallbacks += 1
+                self.fill_from_dom(parse_html(response.content), property_data)
+            else:
+                with self._detail_stats_lock:
+                    self.detail_structured_hits += 1
+                logger.info(f"Datos estructurados ({', '.join(structured['sources'])}) para: {url}")
             
-            # Título de la propiedad
+            price = property_data['price']
+            if not price or price > 450000:
+                logger.info(f"Propiedad descartada por precio: {price}")
+                return None
+            
+            # Verificar que la ubicación final sea válida
+            if not self.is_andorra_location(property_data['location']):
+                logger.info(f"Propiedad descartada por ubicación: {property_data['location']}")
+                return None
+            
+            if property_data['title'] is None:
+                property_data['title'] = "Propiedad en Andorra"
+            if property_data['description']:
+                property_data['description'] = limpiar_texto(property_data['description'][:300])
+            else:
+                property_data['description'] = f"Propiedad en {property_data['location']}"
+            if property_data['image_url'] is None:
+                property_data['image_url'] = ""
+            self.fill_defaults(property_data)
+            
+            logger.info(f"✓ Propiedad extraída: €{price:,} - {property_data['title'][:50]}...")
+            return property_data
+            
+        except Exception as e:
+            logger.error(f"Error extrayendo detalles de {url}: {e}")
+            return None
+
+    def fill_from_dom(self, soup, property_data):
+        """Heurísticas sobre el DOM para los campos que los datos estructurados no traen."""
+        # Título de la propiedad
+        if property_data['title'] is None:
             title_elem = (soup.find('h1') or 
                          soup.find('title') or
                          soup.find('h2', class_=re.compile(r'title|heading')))
-            title = self.clean_text(title_elem.get_text()) if title_elem else "Propiedad en Andorra"
-            
-            # Precio - buscar más agresivamente
+            if title_elem:
+                property_data['title'] = self.clean_text(title_elem.get_text())
+        
+        # Precio - buscar más agresivamente
+        if property_data['price'] is None:
             price_elem = (soup.find('span', class_=re.compile(r'price')) or
                          soup.find('div', class_=re.compile(r'price')) or
                          soup.find('strong', text=re.compile(r'\d+\.?\d*\s*€')) or
                          soup.find(text=re.compile(r'\d{3,6}\.?\d*\s*€')))
-            
-            price = None
             if price_elem:
                 if hasattr(price_elem, 'get_text'):
                     price_text = price_elem.get_text()
                 else:
                     price_text = str(price_elem)
-                price = self.extract_number(price_text)
-                logger.info(f"Precio encontrado: {price}")
-            
-            if not price or price > 450000:
-                logger.info(f"Propiedad descartada por precio: {price}")
-                return None
-            
-            # Ubicación - buscar más agresivamente
-            location = "Andorra"
-            
-            # Primero intentar extraer de la URL que suele contener la ubicación
-            url_parts = url.split('-')
-            for part in url_parts:
-                if self.is_andorra_location(part):
-                    location = part.replace('_', ' ').title()
-                    logger.info(f"Ubicación extraída de URL: {location}")
-                    break
+                property_data['price'] = self.extract_number(price_text)
+                logger.info(f"Precio encontrado: {property_data['price']}")
+        
+        # Ubicación: si la URL no la da, buscar en el HTML
+        if property_data['location'] == "Andorra":
+            location_elem = (soup.find('span', class_=re.compile(r'location|address|zona')) or
+                           soup.find('div', class_=re.compile(r'location|address|zona')) or
+                           soup.find('p', class_=re.compile(r'location|address|zona')) or
+                           soup.find('h2', text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes|[Ss]oldeu')) or
+                           soup.find(text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes|[Ss]oldeu')))
             
-            # Si no encontramos en URL, buscar en el HTML
-            if location == "Andorra":
-                location_elem = (soup.find('span', class_=re.compile(r'location|address|zona')) or
-                               soup.find('div', class_=re.compile(r'location|address|zona')) or
-                               soup.find('p', class_=re.compile(r'location|address|zona')) or
-                               soup.find('h2', text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes|[Ss]oldeu')) or
-                               soup.find(text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes|[Ss]oldeu')))
+            if location_elem:
+                if hasattr(location_elem, 'get_text'):
+                    location_text = location_elem.get_text()
+                else:
+                    location_text = str(location_elem)
                 
-                if location_elem:
-                    if hasattr(location_elem, 'get_text'):
-                        location_text = location_elem.get_text()
-                    else:
-                        location_text = str(location_elem)
-                    
-                    # Filtrar textos genéricos
-                    if "cerca de mi ubicación" not in location_text.lower():
-                        potential_location = self.clean_text(location_text)
-                        if self.is_andorra_location(potential_location):
-                            location = potential_location
-                            logger.info(f"Ubicación extraída de HTML: {location}")
-            
-            # Verificar que la ubicación final sea válida
-            if not self.is_andorra_location(location):
-                logger.info(f"Propiedad descartada por ubicación: {location}")
-                return None
-            
-            # Habitaciones, baños, metros cuadrados - buscar más agresivamente
-            rooms = 0
-            bathrooms = 0
-            square_meters = 0
-            
-            # Buscar datos en todo el HTML
+                # Filtrar textos genéricos
+                if "cerca de mi ubicación" not in location_text.lower():
+                    potential_location = self.clean_text(location_text)
+                    if self.is_andorra_location(potential_location):
+                        property_data['location'] = potential_location
+                        logger.info(f"Ubicación extraída de HTML: {potential_location}")
+        
+        # Habitaciones, baños, metros cuadrados: buscar en todo el texto
+        if any(property_data[field] is None for field in ('rooms', 'bathrooms', 'square_meters')):
             all_text = soup.get_text()
-            
-            # Habitaciones
-            room_matches = re.findall(r'(\d+)\s*(?:hab|habitacion|dormitor)', all_text, re.IGNORECASE)
-            if room_matches:
-                rooms = int(room_matches[0])
-            
-            # Baños
-            bath_matches = re.findall(r'(\d+)\s*baño', all_text, re.IGNORECASE)
-            if bath_matches:
-                bathrooms = int(bath_matches[0])
-            
-            # Metros cuadrados
-            sqm_matches = re.findall(r'(\d+)\s*m[²2]', all_text, re.IGNORECASE)
-            if sqm_matches:
-                square_meters = int(sqm_matches[0])
-            
-            # Descripción - buscar en varios elementos
+            patterns = {
+                'rooms': r'(\d+)\s*(?:hab|habitacion|dormitor)',
+                'bathrooms': r'(\d+)\s*baño',
+                'square_meters': r'(\d+)\s*m[²2]',
+            }
+            for field, pattern in patterns.items():
+                if property_data[field] is None:
+                    match = re.search(pattern, all_text, re.IGNORECASE)
+                    if match:
+                        property_data[field] = int(match.group(1))
+        
+        # Descripción - buscar en varios elementos
+        if not property_data['description']:
             desc_elem = (soup.find('div', class_=re.compile(r'description|content|detail|resumen')) or
                         soup.find('p', class_=re.compile(r'description|content|detail|resumen')) or
                         soup.find('section', class_=re.compile(r'description|content|detail')))
             
             if desc_elem:
-                description = limpiar_texto(desc_elem.get_text()[:300])
+                property_data['description'] = desc_elem.get_text()
             else:
                 # Buscar párrafos largos que puedan ser descripción
-                paragraphs = soup.find_all('p')
-                long_paragraphs = [p.get_text() for p in paragraphs if len(p.get_text()) > 50]
+                long_paragraphs = [p.get_text() for p in soup.find_all('p') if len(p.get_text()) > 50]
                 if long_paragraphs:
-                    description = limpiar_texto(long_paragraphs[0][:300])
-                else:
-                    description = f"Propiedad en {location}"
-            
-            # Imagen
+                    property_data['description'] = long_paragraphs[0]
+        
+        # Imagen
+        if property_data['image_url'] is None:
             img_elem = soup.find('img', src=True)
-            image_url = ""
             if img_elem and img_elem['src']:
-                image_url = urljoin(self.base_url, img_elem['src'])
-            
-            property_data = {
-                'title': title,
-                'price': price,
-                'location': location,
-                'rooms': rooms,
-                'bathrooms': bathrooms,
-                'square_meters': square_meters,
-                'description': description,
-                'url': url,
-                'image_url': image_url,
-                'source': self.website,
-                'scraped_at': datetime.now()
-            }
-            
-            logger.info(f"✓ Propiedad extraída: €{price:,} - {title[:50]}...")
-            return property_data
-            
-        except Exception as e:
-            logger.error(f"Error extrayendo detalles de {url}: {e}")
-            return None
+                property_data['image_url'] = urljoin(self.base_url, img_elem['src'])
 
-    def extract_property_details(self, property_card):
-        """Extrae los detalles de una propiedad del HTML del card."""
+    def extract_property_details(self, property_card, property_url):
+        """
+        Extrae los datos de una propiedad del HTML del card (sin peticiones).
+        
+        Devuelve None si el card no pasa los filtros de precio o de Andorra.
+        Los campos que el card no trae quedan a None para completarlos
+        después desde la página de detalle.
+        """
         try:
-            # URL de la propiedad
-            link_elem = property_card.find('a', href=True)
-            if not link_elem or not link_elem['href']:
-                return None
-            
-            property_url = urljoin(self.base_url, link_elem['href'])
-            
-            # Extraer datos básicos del card
-            title = self.clean_text(link_elem.get_text()) if link_elem.get_text() else "Propiedad"
+            # Título: el primer enlace con texto hacia la propiedad (el de la imagen suele estar vacío)
+            title = "Propiedad"
+            for link_elem in property_card.find_all('a', href=True):
+                link_text = self.clean_text(link_elem.get_text())
+                if link_text and urljoin(self.base_url, link_elem['href']) == property_url:
+                    title = link_text
+                    break
             
             # Precio del card
             price_elem = property_card.find(text=re.compile(r'\d+.*€'))
@@ -265,24 +283,24 @@ class PisoscomScraper:
             if price_elem:
                 price = self.extract_number(price_elem)
                 if not price or price > 450000:
+                    logger.info(f"Card descartado por precio: {price}")
                     return None
             
-            # Ubicación del card
-            location_elem = property_card.find(text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes'))
-            location = "Andorra"
-            if location_elem:
-                location = self.clean_text(str(location_elem))
-                if not self.is_andorra_location(location):
-                    return None
+            # Ubicación: primero de la URL, después del texto del card
+            location = self.location_from_url(property_url)
+            if location == "Andorra":
+                location_elem = property_card.find(text=re.compile(r'[Cc]anillo|[Ee]ncamp|[Aa]ndorra|[Mm]assana|[Ee]scaldes'))
+                if location_elem:
+                    location = self.clean_text(str(location_elem))
             
-            # Si no encontramos precio en el card, intentar obtener datos completos de la página de detalle
-            if not price:
-                return self.extract_property_from_detail_page(property_url)
+            if not self.is_andorra_location(location):
+                logger.info(f"Card descartado por ubicación: {location}")
+                return None
             
-            # Habitaciones, baños, metros del card
-            rooms = 0
-            bathrooms = 0
-            square_meters = 0
+            # Habitaciones, baños, metros del card (None = no aparece en el card)
+            rooms = None
+            bathrooms = None
+            square_meters = None
             
             characteristics = property_card.find_all(text=re.compile(r'\d+\s*(hab|baño|m²)'))
             for char in characteristics:
@@ -294,9 +312,6 @@ class PisoscomScraper:
                 elif 'm²' in char_text:
                     square_meters = int(self.extract_number(char_text) or 0)
             
-            # Descripción básica
-            description = f"Propiedad en {location}"
-            
             # Imagen
             img_elem = property_card.find('img', src=True)
             image_url = ""
@@ -310,7 +325,7 @@ class PisoscomScraper:
                 'rooms': rooms,
                 'bathrooms': bathrooms,
                 'square_meters': square_meters,
-                'description': description,
+                'description': f"Propiedad en {location}",
                 'url': property_url,
                 'image_url': image_url,
                 'source': self.website,
@@ -321,117 +336,134 @@ class PisoscomScraper:
             logger.error(f"Error extrayendo detalles de propiedad: {e}")
             return None
 
-    def scrape_page(self, url):
-        """Extrae propiedades de una página específica."""
-        try:
-            logger.info(f"Scrapeando página: {url}")
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            properties = []
-            
-            # Buscar enlaces que apunten a /comprar/ (propiedades individuales)
-            comprar_links = soup.find_all('a', href=re.compile(r'/comprar/'))
-            
-            logger.info(f"Encontrados {len(comprar_links)} enlaces de propiedades")
-            
-            for link in comprar_links:
-                try:
-                    # Extraer datos de la página de detalle
-                    property_url = urljoin(self.base_url, link['href'])
-                    property_data = self.extract_property_from_detail_page(property_url)
-                    
-                    if property_data:
-                        properties.append(property_data)
-                        logger.info(f"✓ Propiedad extraída: €{property_data['price']:,} - {property_data['title'][:50]}...")
-                    
-                    # Pausa entre extracciones
-                    time.sleep(random.uniform(0.5, 1.5))
-                    
-                except Exception as e:
-                    logger.error(f"Error procesando enlace {link.get('href', '')}: {e}")
-                    continue
-            
-            logger.info(f"Página procesada: {len(properties)} propiedades válidas extraídas")
-            return properties
-            
-        except requests.RequestException as e:
-            logger.error(f"Error de conexión scrapeando {url}: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error inesperado scrapeando {url}: {e}")
-            return []
+    def missing_card_fields(self, card_data):
+        """Campos que el card no ha podido rellenar."""
+        return [field for field in self.CARD_FIELDS if card_data.get(field) is None]
 
-    def run(self):
-        """Ejecuta el scraper completo y guarda en base de datos."""
-        create_tables()
+    def complete_from_detail_page(self, card_data):
+        """
+        Completa con la página de detalle sólo los campos que faltan en el card.
+        Los valores del card tienen prioridad sobre los del detalle.
+        """
+        detail_data = self.extract_property_from_detail_page(card_data['url'])
         
-        print(f"🏠 Iniciando scraper de {self.website}...")
-        print("=" * 50)
+        if detail_data is None:
+            # Sin precio en el card no hay nada que guardar
+            if card_data.get('price') is None:
+                return None
+            detail_data = {}
         
-        all_properties = []
-        page = 1
-        max_pages = 10
+        merged = dict(card_data)
+        for field in self.CARD_FIELDS:
+            if merged.get(field) is None:
+                merged[field] = detail_data.get(field)
+        if detail_data.get('description'):
+            merged['description'] = detail_data['description']
         
-        while page <= max_pages:
-            if page == 1:
-                url = self.search_url
-            else:
-                url = f"{self.search_url}{page}/"
+        return self.fill_defaults(merged)
+
+    def fill_defaults(self, property_data):
+        """Convierte los campos que siguen sin valor en 0."""
+        for field in ('rooms', 'bathrooms', 'square_meters'):
+            if property_data.get(field) is None:
+                property_data[field] = 0
+        return property_data
+
+    def find_property_card(self, link):
+        """Contenedor (card) de un enlace /comprar/."""
+        card = link.find_parent(['div', 'article', 'li'], class_=re.compile(r'ad-preview|card|item|property'))
+        return card or link.parent
+
+    def fetch(self):
+        """Páginas del listado hasta max_pages o hasta la primera sin propiedades válidas."""
+        for page in range(1, self.max_pages + 1):
+            url = self.search_url if page == 1 else f"{self.search_url}{page}/"
+            
+            try:
+                logger.info(f"Scrapeando página: {url}")
+                response = self.client.get(url, headers=self.headers, timeout=10)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"Error de conexión scrapeando {url}: {e}")
+                break
             
-            properties = self.scrape_page(url)
+            yield response.content
             
-            if not properties:
+            if not self.last_page_count:
                 logger.info(f"No se encontraron más propiedades en página {page}. Finalizando.")
                 break
-            
-            all_properties.extend(properties)
-            logger.info(f"Página {page}: {len(properties)} propiedades | Total acumulado: {len(all_properties)}")
-            
-            page += 1
-            
-            # Pausa entre páginas
-            time.sleep(random.uniform(2, 4))
+            logger.info(f"Página {page}: {self.last_page_count} propiedades")
+
+    def parse(self, page):
+        """
+        Extrae las propiedades de una página del listado.
         
-        # Guardar en base de datos
-        if all_properties:
-            repo = PropertyRepository()
-            saved_count = 0
-            
-            for prop in all_properties:
-                try:
-                    # Adaptar los datos al formato esperado por PropertyRepository
-                    property_data = {
-                        'reference': f"pisos.com-{prop['url'].split('/')[-2]}" if prop['url'] else 'N/A',
-                        'operation': 'venta',
-                        'price': prop['price'],
-                        'rooms': prop['rooms'],
-                        'bathrooms': prop['bathrooms'],
-                        'surface': prop['square_meters'],
-                        'title': prop['title'],
-                        'location': prop['location'],
-                        'address': prop['location'],
-                        'url': prop['url'],
-                        'website': prop['source']
-                    }
-                    
-                    success = repo.save_property(property_data)
-                    if success:
-                        saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error guardando propiedad: {e}")
-                    continue
-            
-            print(f"\n📊 Resultados del scraping de {self.website}:")
-            print(f"Total de propiedades encontradas: {len(all_properties)}")
-            print(f"Propiedades guardadas en BD: {saved_count}")
-            
-        else:
-            print(f"❌ No se encontraron propiedades en {self.website}")
+        Modo card-first: cada propiedad se lee del card del listado y sólo se
+        pide la página de detalle cuando al card le falta algún campo.
+        """
+        self.last_page_count = 0
+        soup = parse_html(page)
+        properties = []
+        
+        # Buscar enlaces que apunten a /comprar/ (propiedades individuales)
+        comprar_links = soup.find_all('a', href=re.compile(r'/comprar/'))
+        
+        # Un card suele repetir el enlace (imagen + título): deduplicar por URL
+        cards_by_url = {}
+        for link in comprar_links:
+            property_url = urljoin(self.base_url, link['href'])
+            if property_url not in cards_by_url:
+                cards_by_url[property_url] = self.find_property_card(link)
+        
+        logger.info(f"Encontrados {len(comprar_links)} enlaces de propiedades ({len(cards_by_url)} únicas)")
         
-        logger.info(f"Scraping de {self.website} completado. Total: {len(all_properties)} propiedades")
+        # Filtrar y extraer desde los cards; los incompletos van a detalle
+        incomplete = {}
+        rejected = 0
+        for property_url, card in cards_by_url.items():
+            card_data = self.extract_property_details(card, property_url)
+            if card_data is None:
+                rejected += 1
+            elif self.missing_card_fields(card_data):
+                incomplete[property_url] = card_data
+            else:
+                properties.append(self.fill_defaults(card_data))
+        
+        logger.info(f"Cards: {len(properties)} completos, {len(incomplete)} requieren detalle, {rejected} descartados")
+        
+        # Completar en paralelo sólo los que lo necesitan (límite por host en DetailFetcher)
+        for _, property_data in self.detail_fetcher.fetch(
+                list(incomplete), lambda property_url: self.complete_from_detail_page(incomplete[property_url])):
+            properties.append(property_data)
+        
+        for property_data in properties:
+            logger.info(f"✓ Propiedad extraída: €{property_data['price']:,} - {property_data['title'][:50]}...")
+        
+        logger.info(f"Página procesada: {len(properties)} propiedades válidas extraídas")
+        self.last_page_count = len(properties)
+        return properties
+
+    def normalize(self, raw):
+        """Adapta los campos de pisos.com (square_meters, source) al esquema común."""
+        return super().normalize({
+            'reference': f"pisos.com-{raw['url'].split('/')[-2]}" if raw['url'] else 'N/A',
+            'operation': 'venta',
+            'price': raw['price'],
+            'rooms': raw['rooms'],
+            'bathrooms': raw['bathrooms'],
+            'surface': raw['square_meters'],
+            'title': raw['title'],
+            'location': raw['location'],
+            'address': raw['location'],
+            'url': raw['url'],
+            'website': raw['source']
+        })
+
+    def print_stats(self):
+        super().print_stats()
+        if self.detail_structured_hits or self.detail_dom_fallbacks:
+            print(f"Páginas de detalle: {self.detail_structured_hits} con datos estructurados, "
+                  f"{self.detail_dom_fallbacks} con heurísticas DOM")
 
 def main():
     """Función principal para testing."""
@@ -1,35 +1,291 @@
+"""
+Ejecución de todos los scrapers.
+
+Cada scraper corre en su propio proceso (en paralelo, hasta SCRAPER_PARALLEL
+a la vez) con su propio timeout y límite de memoria, de modo que un sitio
+lento o colgado no bloquea a los demás. Cada proceso devuelve un resultado
+estructurado (duración, páginas, filas, errores) y el código de salida
+refleja los fallos parciales.
+
+Configuración (.env):
+    SCRAPER_TIMEOUT=1800      # segundos por scraper
+    SCRAPER_MEMORY_MB=1024    # memoria virtual máxima por scraper (0 = sin límite)
+    SCRAPER_PARALLEL=6        # scrapers simultáneos
+    SCRAPER_TERMINATE_GRACE=15  # segundos tras SIGTERM para escribir los lotes pendientes
+
+Uso:
+    python -m src.scrapers.runner
+    python -m src.scrapers.runner --only ClausScraper NouaireScraper --timeout 600
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
 from .finquesmarques_sql import FinquesmarquesScraper
 from .nouaire_sql import NouaireScraper
 from .expofinques_sql import ExpofinquesScraper
 from .claus_sql import ClausScraper
 from .pisosad_sql import PisosAdScraper
 from .pisoscom_sql import PisoscomScraper
+from ..fetch import get_client, reset_client
+from ..parsing import reset_parse_pool
+from .sink import flush_on_sigterm
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Scrapers disponibles, en orden de ejecución
+SCRAPERS = [
+    FinquesmarquesScraper,
+    NouaireScraper,
+    ExpofinquesScraper,
+    ClausScraper,
+    PisosAdScraper,
+    PisoscomScraper
+]
+
+SCRAPER_TIMEOUT = int(os.getenv("SCRAPER_TIMEOUT", "1800"))
+SCRAPER_MEMORY_MB = int(os.getenv("SCRAPER_MEMORY_MB", "1024"))
+SCRAPER_PARALLEL = int(os.getenv("SCRAPER_PARALLEL", str(len(SCRAPERS))))
+# Segundos que tiene un scraper tras SIGTERM para escribir sus lotes pendientes
+SCRAPER_TERMINATE_GRACE = int(os.getenv("SCRAPER_TERMINATE_GRACE", "15"))
 
-def run_all_scrapers():
+# Estados de un resultado
+OK = 'ok'
+PARTIAL = 'parcial'  # terminó, pero algún lote no se pudo escribir
+ERROR = 'error'
+TIMEOUT = 'timeout'
+OUT_OF_MEMORY = 'memoria'
+CRASHED = 'caído'
+
+# Códigos de salida
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_FAILED = 2
+
+
+class _PrefixedStream:
     """
-    Ejecuta todos los scrapers disponibles
+    Antepone el nombre del scraper a cada línea de salida del proceso hijo
     """
-    scrapers = [
-        FinquesmarquesScraper(),
-        NouaireScraper(),
-        ExpofinquesScraper(),
-        ClausScraper(),
-        PisosAdScraper(),
-        PisoscomScraper()
-    ]
-    
-    print("Iniciando scrapers...")
-    
-    for scraper in scrapers:
+
+    def __init__(self, stream, prefix):
+        self.stream = stream
+        self.prefix = prefix
+        self._at_line_start = True
+
+    def write(self, text):
+        for line in text.splitlines(keepends=True):
+            if self._at_line_start:
+                self.stream.write(self.prefix)
+            self.stream.write(line)
+            self._at_line_start = line.endswith('\n')
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _limit_memory(memory_mb):
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _scraper_process(scraper_class, memory_mb, conn):
+    """
+    Proceso hijo: ejecuta un scraper y envía su resultado por conn
+    """
+    name = scraper_class.__name__
+    sys.stdout = _PrefixedStream(sys.stdout, f"[{name}] ")
+    sys.stderr = _PrefixedStream(sys.stderr, f"[{name}] ")
+
+    result = {'scraper': name, 'status': OK, 'pages': 0, 'rows': 0, 'http_errors': 0, 'errors': []}
+    try:
+        _limit_memory(memory_mb)
+        reset_client()
+        scraper = scraper_class()
+        result['rows'] = scraper.run() or 0
+        write_errors = getattr(scraper, 'write_errors', 0)
+        if write_errors:
+            result['status'] = PARTIAL if result['rows'] else ERROR
+            result['errors'].append(f"{write_errors} lotes no se pudieron escribir en la base de datos")
+    except MemoryError:
+        result['status'] = OUT_OF_MEMORY
+        result['errors'].append(f"Límite de memoria alcanzado ({memory_mb} MB)")
+    except Exception as e:
+        result['status'] = ERROR
+        result['errors'].append(f"{type(e).__name__}: {e}")
+
+    try:
+        client = get_client()
+        host_stats = client.stats().values()
+        result['pages'] = sum(stats['requests'] for stats in host_stats)
+        result['http_errors'] = sum(stats['errors'] for stats in host_stats)
+        client.print_stats()
+        reset_parse_pool()
+        reset_client()
+    except Exception as e:
+        result['errors'].append(f"Cierre: {type(e).__name__}: {e}")
+
+    conn.send(result)
+    conn.close()
+    sys.stdout.flush()
+
+
+def _finish(name, process, conn, started, timed_out=False):
+    """
+    Recoge el resultado de un proceso terminado (o el motivo por el que no lo hay)
+    """
+    result = None
+    if not timed_out and conn.poll():
+        try:
+            result = conn.recv()
+        except EOFError:
+            result = None
+    conn.close()
+
+    if result is None:
+        result = {'scraper': name, 'pages': 0, 'rows': 0, 'http_errors': 0}
+        if timed_out:
+            result['status'] = TIMEOUT
+            result['errors'] = ["Tiempo máximo agotado"]
+        else:
+            result['status'] = CRASHED
+            result['errors'] = [f"El proceso terminó sin resultado (código {process.exitcode})"]
+
+    result['duration'] = time.monotonic() - started
+    return result
+
+
+def _terminate(process):
+    """
+    SIGTERM (el scraper escribe sus lotes pendientes) y, pasado el margen, SIGKILL
+    """
+    process.terminate()
+    process.join(SCRAPER_TERMINATE_GRACE)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def run_scrapers(scraper_classes=None, timeout=SCRAPER_TIMEOUT, memory_mb=SCRAPER_MEMORY_MB,
+                 parallel=SCRAPER_PARALLEL):
+    """
+    Ejecuta los scrapers en procesos separados y devuelve un resultado por scraper,
+    en el orden de scraper_classes
+    """
+    scraper_classes = list(scraper_classes or SCRAPERS)
+    context = multiprocessing.get_context('spawn')
+    pending = list(scraper_classes)
+    running = {}
+    results = {}
+
+    with flush_on_sigterm():
         try:
-            print(f"Ejecutando {scraper.__class__.__name__}...")
-            scraper.run()
-            print(f"{scraper.__class__.__name__} completado.")
-        except Exception as e:
-            print(f"Error en {scraper.__class__.__name__}: {e}")
-            continue
-    
-    print("Todos los scrapers han terminado.")
+            _run_loop(pending, running, results, context, timeout, memory_mb, parallel)
+        finally:
+            # Si el runner recibe SIGTERM, los scrapers en marcha también lo reciben
+            for process, conn, _ in running.values():
+                _terminate(process)
+                conn.close()
+
+    return [results[scraper_class.__name__] for scraper_class in scraper_classes]
+
+
+def _run_loop(pending, running, results, context, timeout, memory_mb, parallel):
+    while pending or running:
+        while pending and len(running) < max(parallel, 1):
+            scraper_class = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_scraper_process, args=(scraper_class, memory_mb, sender),
+                                      name=scraper_class.__name__)
+            process.start()
+            sender.close()
+            running[scraper_class.__name__] = (process, receiver, time.monotonic())
+            print(f"▶️ {scraper_class.__name__} iniciado (pid {process.pid})")
+
+        for name, (process, conn, started) in list(running.items()):
+            # El hijo envía el resultado justo antes de salir: leerlo evita que se bloquee en la tubería
+            if conn.poll():
+                results[name] = _finish(name, process, conn, started)
+                process.join()
+            elif not process.is_alive():
+                process.join()
+                results[name] = _finish(name, process, conn, started)
+            elif time.monotonic() - started > timeout:
+                _terminate(process)
+                results[name] = _finish(name, process, conn, started, timed_out=True)
+            else:
+                continue
+
+            del running[name]
+            result = results[name]
+            print(f"⏹️ {name}: {result['status']} en {result['duration']:.0f}s, {result['rows']} filas")
+
+        time.sleep(0.2)
+
+
+def exit_code(results):
+    """0 si todos terminan bien, 1 si falla alguno (o sólo en parte), 2 si fallan todos"""
+    failed = [result for result in results if result['status'] != OK]
+    if not failed:
+        return EXIT_OK
+    if len(failed) == len(results) and all(result['status'] != PARTIAL for result in failed):
+        return EXIT_FAILED
+    return EXIT_PARTIAL
+
+
+def print_results(results):
+    print("\n📊 RESULTADOS POR SCRAPER:")
+    print(f"{'Scraper':<24}{'Estado':<10}{'Duración':>10}{'Páginas':>9}{'Filas':>8}{'Err. HTTP':>11}")
+    for result in results:
+        print(f"{result['scraper']:<24}{result['status']:<10}{result['duration']:>9.0f}s"
+              f"{result['pages']:>9}{result['rows']:>8}{result['http_errors']:>11}")
+        for error in result['errors']:
+            print(f"   ⚠️ {error}")
+
+
+def run_all_scrapers(scraper_classes=None, timeout=SCRAPER_TIMEOUT, memory_mb=SCRAPER_MEMORY_MB,
+                     parallel=SCRAPER_PARALLEL):
+    """
+    Ejecuta todos los scrapers disponibles y devuelve el código de salida
+    """
+    print("Iniciando scrapers...")
+    started = time.monotonic()
+
+    results = run_scrapers(scraper_classes, timeout=timeout, memory_mb=memory_mb, parallel=parallel)
+
+    print_results(results)
+    code = exit_code(results)
+    print(f"Todos los scrapers han terminado en {time.monotonic() - started:.0f}s (código {code}).")
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta todos los scrapers en procesos separados")
+    parser.add_argument('--only', nargs='+', help="Nombres de clase de los scrapers a ejecutar")
+    parser.add_argument('--timeout', type=int, default=SCRAPER_TIMEOUT, help="Segundos máximos por scraper")
+    parser.add_argument('--memory-mb', type=int, default=SCRAPER_MEMORY_MB, help="Memoria máxima por scraper (0 = sin límite)")
+    parser.add_argument('--parallel', type=int, default=SCRAPER_PARALLEL, help="Scrapers simultáneos")
+    args = parser.parse_args()
+
+    scraper_classes = SCRAPERS
+    if args.only:
+        wanted = {name.lower() for name in args.only}
+        scraper_classes = [cls for cls in SCRAPERS if cls.__name__.lower() in wanted]
+        if not scraper_classes:
+            parser.error(f"Ningún scraper coincide con {args.only}")
+
+    sys.exit(run_all_scrapers(scraper_classes, timeout=args.timeout, memory_mb=args.memory_mb,
+                              parallel=args.parallel))
+
 
 if __name__ == "__main__":
-    run_all_scrapers()
\ No newline at end of file
+    main()
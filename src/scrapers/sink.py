@@ -0,0 +1,97 @@
+"""
+Sink de registros con vaciado por lotes.
+
+Los scrapers entregan los registros a medida que los generan y el sink los
+escribe (con la función persist del scraper) cada SCRAPER_FLUSH_RECORDS
+registros o cada SCRAPER_FLUSH_SECONDS segundos, en lugar de acumular toda
+la ejecución en memoria. Al salir del bloque with se escribe lo pendiente,
+también cuando la salida se debe a un SIGTERM (ver flush_on_sigterm).
+
+Configuración (.env):
+    SCRAPER_FLUSH_RECORDS=200
+    SCRAPER_FLUSH_SECONDS=30
+"""
+
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+FLUSH_RECORDS = int(os.getenv("SCRAPER_FLUSH_RECORDS", "200"))
+FLUSH_SECONDS = float(os.getenv("SCRAPER_FLUSH_SECONDS", "30"))
+
+
+class RecordSink:
+    """
+    Acumula registros y llama a write(lote) -> guardados al llegar a
+    batch_size registros o al pasar flush_interval segundos desde el último
+    vaciado (se comprueba en cada add()).
+    """
+
+    def __init__(self, write, batch_size=FLUSH_RECORDS, flush_interval=FLUSH_SECONDS, name=None):
+        self.write = write
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.name = name
+        self.batch = []
+        self.received = 0
+        self.saved = 0
+        self.flushes = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, record):
+        self.batch.append(record)
+        self.received += 1
+        if (len(self.batch) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Escribe el lote pendiente"""
+        self._last_flush = time.monotonic()
+        if not self.batch:
+            return 0
+        batch, self.batch = self.batch, []
+        saved = self.write(batch) or 0
+        self.saved += saved
+        self.flushes += 1
+        print(f"💾 [{self.name or 'sink'}] Lote de {len(batch)} registros escrito ({saved} guardados)")
+        return saved
+
+    def close(self):
+        self.flush()
+        return self.saved
+
+    def print_stats(self):
+        print(f"🗄️ [{self.name or 'sink'}] {self.received} registros en {self.flushes} lotes, {self.saved} guardados")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Se escribe lo pendiente también si la salida es por una excepción o un SIGTERM
+        self.close()
+        return False
+
+
+@contextmanager
+def flush_on_sigterm():
+    """
+    Convierte SIGTERM en SystemExit mientras dura el bloque, para que los
+    with RecordSink(...) abiertos escriban sus lotes pendientes al salir.
+    Sólo tiene efecto en el hilo principal (signal lo exige).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle_sigterm(signum, frame):
+        print("🛑 SIGTERM recibido: escribiendo los lotes pendientes antes de salir")
+        raise SystemExit(128 + signum)
+
+    previous = signal.signal(signal.SIGTERM, handle_sigterm)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
@@ -0,0 +1,96 @@
+"""
+Pipeline de filtros ordenado por coste.
+
+Las etapas baratas (sobre los datos ya extraídos de la fila) se ejecutan
+siempre antes que las que necesitan red, de modo que no se descargan páginas
+de detalle de filas que luego se descartan. Cada etapa lleva la cuenta de
+cuántas filas ha descartado y el pipeline cuenta las descargas ahorradas.
+"""
+
+import threading
+
+CHEAP = 0
+NETWORK = 1
+
+
+def price_at_most(limit, tag, key='price'):
+    """Etapa: descarta filas con precio mayor que limit"""
+    def stage(row):
+        price = row.get(key) or 0
+        if price > limit:
+            print(f"⚠️ [{tag}] Propiedad filtrada por precio alto: {price:,.0f}€ > {limit:,.0f}€")
+            return False
+        return True
+    return stage
+
+
+def in_andorra(is_andorra_location, tag, key='location'):
+    """Etapa: descarta filas cuya ubicación no es de Andorra"""
+    def stage(row):
+        if not is_andorra_location(row.get(key)):
+            print(f"🌍 [{tag}] Propiedad filtrada por estar fuera de Andorra: {row.get(key)}")
+            return False
+        return True
+    return stage
+
+
+class FilterPipeline:
+    """
+    Etapas: (nombre, función, coste). La función recibe el dict de la fila y
+    devuelve True para conservarla (puede modificarla, p.ej. la ubicación).
+    needs_fetch(row) indica si la fila habría provocado una petición de red
+    en alguna etapa NETWORK; se usa para contar las descargas ahorradas.
+    """
+
+    def __init__(self, name, needs_fetch=None):
+        self.name = name
+        self.needs_fetch = needs_fetch
+        self.stages = []
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.passed = 0
+        self.fetches_saved = 0
+        self.dropped = {}
+
+    def add(self, stage_name, func, cost=CHEAP):
+        """Añade una etapa; el orden final es por coste y, dentro del mismo coste, por inserción"""
+        self.stages.append((stage_name, func, cost))
+        self.stages.sort(key=lambda stage: stage[2])
+        self.dropped.setdefault(stage_name, 0)
+        return self
+
+    def run(self, row):
+        """Aplica las etapas en orden; devuelve la fila o None si alguna la descarta"""
+        with self._lock:
+            self.seen += 1
+
+        for stage_name, func, cost in self.stages:
+            if func(row):
+                continue
+
+            with self._lock:
+                self.dropped[stage_name] += 1
+                if cost == CHEAP and self.needs_fetch and self.needs_fetch(row):
+                    self.fetches_saved += 1
+            return None
+
+        with self._lock:
+            self.passed += 1
+        return row
+
+    def stats(self):
+        return {
+            'seen': self.seen,
+            'passed': self.passed,
+            'dropped': dict(self.dropped),
+            'fetches_saved': self.fetches_saved,
+        }
+
+    def print_stats(self):
+        if not self.seen:
+            return
+        print(f"🧮 [{self.name}] Filtros: {self.seen} filas, {self.passed} aceptadas, "
+              f"{self.fetches_saved} descargas de detalle ahorradas")
+        for stage_name, _, cost in self.stages:
+            kind = "red" if cost == NETWORK else "fila"
+            print(f"   - {stage_name} ({kind}): {self.dropped[stage_name]} descartadas")
@@ -0,0 +1,133 @@
+"""
+Gazetteer de Andorra: parroquias y poblaciones.
+
+Todas las variantes (con/sin acentos, guiones, guiones bajos) se compilan en
+una única expresión regular al importar el módulo, y resolve() devuelve en
+una sola pasada la población canónica y su parroquia. Lo usan los scrapers
+(is_andorra_location) y el dashboard (agrupación por población).
+"""
+
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+Place = namedtuple('Place', ['name', 'parish', 'kind'])
+
+COUNTRY = 'country'
+PARISH = 'parish'
+VILLAGE = 'village'
+
+# Parroquia canónica -> variantes
+PARISHES = {
+    'Andorra la Vella': ['andorra la vella'],
+    'Escaldes-Engordany': ['escaldes', 'engordany', 'escaldes engordany'],
+    'Encamp': ['encamp'],
+    'Canillo': ['canillo'],
+    'La Massana': ['massana', 'la massana'],
+    'Ordino': ['ordino'],
+    'Sant Julia de Loria': ['sant julia', 'sant julia de loria', 'loria'],
+}
+
+# Población canónica -> (parroquia, variantes)
+VILLAGES = {
+    'Pas de la Casa': ('Encamp', ['pas de la casa']),
+    'Les Bons': ('Encamp', ['les bons']),
+    'Els Cortals': ('Encamp', ['els cortals']),
+    'Arinsal': ('La Massana', ['arinsal']),
+    'Pal': ('La Massana', ['pal']),
+    'Erts': ('La Massana', ['erts']),
+    'Sispony': ('La Massana', ['sispony']),
+    'Anyos': ('La Massana', ['anyos']),
+    "Bordes d'Envalira": ('Canillo', ['bordes', "bordes d'envalira", 'bordes denvalira', 'envalira']),
+    'El Tarter': ('Canillo', ['tarter', 'el tarter']),
+    'Soldeu': ('Canillo', ['soldeu']),
+    'Incles': ('Canillo', ['incles']),
+    'Ransol': ('Canillo', ['ransol']),
+    'Meritxell': ('Canillo', ['meritxell']),
+    'El Serrat': ('Ordino', ['serrat', 'el serrat']),
+    'Llorts': ('Ordino', ['llorts']),
+    'Santa Coloma': ('Andorra la Vella', ['santa coloma']),
+    'Aixovall': ('Sant Julia de Loria', ['aixovall']),
+    'Nagol': ('Sant Julia de Loria', ['nagol']),
+    'Bixessarri': ('Sant Julia de Loria', ['bixessarri']),
+    'Aixas': ('Sant Julia de Loria', ['aixas']),
+}
+
+# Poblaciones que el dashboard muestra por separado en lugar de agruparlas en su parroquia
+DASHBOARD_VILLAGES = {'Pas de la Casa', 'Arinsal', "Bordes d'Envalira"}
+
+# Más específico primero: población > parroquia > país
+_KIND_RANK = {VILLAGE: 0, PARISH: 1, COUNTRY: 2}
+
+
+def normalize(text):
+    """Minúsculas, sin acentos, con '_' y '-' como espacios y espacios colapsados"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace('’', "'")
+    text = re.sub(r'[_\-]+', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _build_index():
+    index = {'andorra': Place('Andorra', None, COUNTRY)}
+    for parish, variants in PARISHES.items():
+        for variant in variants:
+            index[normalize(variant)] = Place(parish, parish, PARISH)
+    for village, (parish, variants) in VILLAGES.items():
+        for variant in variants:
+            index[normalize(variant)] = Place(village, parish, VILLAGE)
+    return index
+
+
+_INDEX = _build_index()
+
+# Alternativas más largas primero para que 'andorra la vella' gane a 'andorra'
+_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(key) for key in sorted(_INDEX, key=len, reverse=True)) + r')\b'
+)
+
+
+@lru_cache(maxsize=4096)
+def resolve(text):
+    """
+    Devuelve el Place más específico mencionado en el texto (población,
+    luego parroquia, luego 'Andorra'), o None si no menciona Andorra.
+    """
+    if not text or text == 'N/A':
+        return None
+
+    best = None
+    for match in _PATTERN.finditer(normalize(text)):
+        place = _INDEX[match.group(1)]
+        if best is None or _KIND_RANK[place.kind] < _KIND_RANK[best.kind]:
+            best = place
+            if place.kind == VILLAGE:
+                break
+    return best
+
+
+def is_andorra(text):
+    """True si el texto menciona alguna parroquia, población o 'Andorra'"""
+    return resolve(text) is not None
+
+
+def parish_of(text):
+    """Parroquia canónica del texto, o None"""
+    place = resolve(text)
+    return place.parish if place else None
+
+
+def dashboard_location(text):
+    """
+    Nombre con el que el dashboard agrupa una ubicación: la parroquia,
+    salvo las poblaciones especiales que se muestran por separado.
+    None si no se puede asignar a ninguna parroquia.
+    """
+    place = resolve(text)
+    if place is None or place.parish is None:
+        return None
+    if place.name in DASHBOARD_VILLAGES:
+        return place.name
+    return place.parish
@@ -0,0 +1,145 @@
+"""
+Detección de poblaciones especiales (Pas de la Casa, Arinsal, Bordes d'Envalira)
+con caché persistente de descripciones.
+
+La descripción de cada URL se guarda una vez en property_descriptions junto con
+el hash de los datos del listado y el veredicto. En ejecuciones posteriores la
+página de detalle sólo se vuelve a descargar si los datos del listado cambian.
+"""
+
+import hashlib
+import json
+import threading
+
+from ..database.operations import DescriptionRepository
+from .text_cleaner import detectar_pas_de_la_casa, detectar_arinsal, detectar_bordes
+
+
+def location_trigger(*keywords, blank=False, exact=()):
+    """
+    Construye un disparador: la ubicación contiene alguna palabra clave,
+    coincide exactamente con alguna de exact, o (con blank) es 'N/A'
+    """
+    def trigger(location):
+        if location == 'N/A':
+            return blank
+        location_lower = location.lower()
+        return location_lower in exact or any(keyword in location_lower for keyword in keywords)
+    return trigger
+
+
+# (población especial, detector sobre la descripción, disparador sobre la ubicación del listado)
+DEFAULT_RULES = [
+    ("Pas de la Casa", detectar_pas_de_la_casa, location_trigger('encamp', 'andorra', blank=True)),
+    ("Arinsal", detectar_arinsal, location_trigger('massana', 'arinsal')),
+    ("Bordes d'Envalira", detectar_bordes, location_trigger('canillo', 'soldeu', 'incles', 'tarter', 'bordes')),
+]
+
+
+def content_hash(text):
+    """sha256 hex de un texto"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def card_hash(card_fields):
+    """sha256 hex de los datos del listado (independiente del orden de las claves)"""
+    return content_hash(json.dumps(card_fields, sort_keys=True, default=str))
+
+
+class SpecialLocationResolver:
+    """
+    Decide si una ubicación genérica es en realidad una población especial,
+    descargando la descripción sólo cuando no hay veredicto guardado o los
+    datos del listado han cambiado desde la última descarga.
+    """
+
+    def __init__(self, website, fetch_description, rules=None, tag=None, use_store=True):
+        self.website = website
+        self.fetch_description = fetch_description
+        self.rules = rules or DEFAULT_RULES
+        self.prefix = f"[{tag}] " if tag else ""
+        self.use_store = use_store
+        self._cache = None
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.cache_hits = 0
+
+    def _load(self):
+        with self._lock:
+            if self._cache is None:
+                self._cache = DescriptionRepository.get_descriptions_by_website(self.website) if self.use_store else {}
+                if self._cache:
+                    print(f"📚 {self.prefix}{len(self._cache)} descripciones en caché para {self.website}")
+        return self._cache
+
+    def rule_for(self, location):
+        """Regla que aplica a la ubicación, o None si no necesita verificación"""
+        if not location:
+            return None
+        for rule in self.rules:
+            if rule[2](location):
+                return rule
+        return None
+
+    def needs_check(self, location):
+        return self.rule_for(location) is not None
+
+    def resolve(self, location, url, card_fields):
+        """
+        Devuelve la ubicación final para el listado. card_fields son los datos
+        del listado que, si cambian, obligan a volver a mirar la descripción.
+        """
+        rule = self.rule_for(location)
+        if rule is None:
+            print(f"ℹ️ {self.prefix}Ubicación '{location}' no necesita verificación")
+            return location
+
+        special_name, detector, _ = rule
+        current_card_hash = card_hash(card_fields)
+
+        cached = self._load().get(url)
+        if cached and cached['card_hash'] == current_card_hash:
+            with self._lock:
+                self.cache_hits += 1
+            return cached['verdict'] or location
+
+        print(f"🔍 {self.prefix}Verificando descripción para posible {special_name}: {url}")
+        descripcion = self.fetch_description(url)
+        with self._lock:
+            self.fetches += 1
+
+        verdict = special_name if descripcion and detector(descripcion) else ''
+        if verdict:
+            print(f"✅ {self.prefix}¡Detectado {special_name} en descripción! Cambiando ubicación de '{location}' a '{special_name}'")
+        else:
+            print(f"❌ {self.prefix}No se detectó {special_name} en la descripción")
+
+        # Sin descripción (error de red) no se guarda nada: se reintenta en la próxima ejecución
+        if descripcion:
+            entry = {'card_hash': current_card_hash, 'content_hash': content_hash(descripcion), 'verdict': verdict}
+            with self._lock:
+                self._cache[url] = entry
+            if self.use_store:
+                DescriptionRepository.save_description(url, self.website, descripcion, entry['content_hash'],
+                                                       current_card_hash, verdict)
+
+        return verdict or location
+
+    def would_fetch(self, location, url, card_fields):
+        """True si resolve() tendría que descargar la descripción"""
+        if self.rule_for(location) is None:
+            return False
+        cached = self._load().get(url)
+        return not (cached and cached['card_hash'] == card_hash(card_fields))
+
+    def resolve_row(self, row, card_keys):
+        """Etapa de FilterPipeline: resuelve row['location'] y conserva siempre la fila"""
+        row['location'] = self.resolve(row['location'], row['url'], {key: row.get(key) for key in card_keys})
+        return True
+
+    def row_would_fetch(self, row, card_keys):
+        return self.would_fetch(row['location'], row['url'], {key: row.get(key) for key in card_keys})
+
+    def print_stats(self):
+        if self.fetches or self.cache_hits:
+            print(f"📚 {self.prefix}Descripciones: {self.fetches} descargadas, {self.cache_hits} desde caché")
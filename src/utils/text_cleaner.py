@@ -1,21 +1,40 @@
 import re
 import unicodedata
+from functools import lru_cache
+
+# Patrones compilados una sola vez al importar el módulo
+_CARACTERES_ESPECIALES = re.compile(r'[^\w\s.,€/-]')
+_ESPACIOS = re.compile(r'\s+')
+_NO_NUMERICO = re.compile(r'[^\d.,]')
+_ENTERO = re.compile(r'\d+')
+_DECIMAL = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+# Textos más largos que esto (descripciones) no se memorizan
+MAX_MEMO_LEN = 256
+
+@lru_cache(maxsize=8192)
+def _limpiar_texto(texto):
+    # Normalizar unicode
+    texto = unicodedata.normalize('NFKD', texto)
+    
+    # Remover caracteres especiales y múltiples espacios
+    texto = _CARACTERES_ESPECIALES.sub('', texto)
+    texto = _ESPACIOS.sub(' ', texto)
+    
+    return texto.strip()
 
 def limpiar_texto(texto):
     """
-    Limpia el texto eliminando caracteres especiales y normalizando
+    Limpia el texto eliminando caracteres especiales y normalizando.
+    Los textos cortos (ubicaciones, tipos, precios) se memorizan.
     """
     if not texto or texto == 'N/A':
         return 'N/A'
     
-    # Normalizar unicode
-    texto = unicodedata.normalize('NFKD', str(texto))
-    
-    # Remover caracteres especiales y múltiples espacios
-    texto = re.sub(r'[^\w\s.,€/-]', '', texto)
-    texto = re.sub(r'\s+', ' ', texto)
-    
-    return texto.strip()
+    texto = str(texto)
+    if len(texto) > MAX_MEMO_LEN:
+        return _limpiar_texto.__wrapped__(texto)
+    return _limpiar_texto(texto)
 
 def extraer_titulo(texto):
     """
@@ -40,8 +59,15 @@ def extraer_precio(texto):
     if not texto:
         return 0
     
+    texto = str(texto)
+    if len(texto) > MAX_MEMO_LEN:
+        return _extraer_precio.__wrapped__(texto)
+    return _extraer_precio(texto)
+
+@lru_cache(maxsize=8192)
+def _extraer_precio(texto):
     # Remover caracteres no numéricos excepto punto y coma
-    precio_limpio = re.sub(r'[^\d.,]', '', str(texto))
+    precio_limpio = _NO_NUMERICO.sub('', texto)
     
     # Si hay puntos y comas, asumir formato europeo (1.234,56)
     if '.' in precio_limpio and ',' in precio_limpio:
@@ -71,7 +97,7 @@ def convertir_a_entero_o_na(valor):
     """
     try:
         # Extraer solo números del texto
-        numeros = re.findall(r'\d+', str(valor))
+        numeros = _ENTERO.findall(str(valor))
         return int(numeros[0]) if numeros else 'N/A'
     except (ValueError, IndexError):
         return 'N/A'
@@ -80,17 +106,23 @@ def convertir_a_entero(valor):
     """
     Convierte un valor a entero o float, retorna 0 si no es posible
     """
+    valor = str(valor)
+    if len(valor) > MAX_MEMO_LEN:
+        return _convertir_a_entero.__wrapped__(valor)
+    return _convertir_a_entero(valor)
+
+@lru_cache(maxsize=8192)
+def _convertir_a_entero(valor):
     try:
         # Buscar números decimales primero (con coma o punto)
-        decimal_match = re.search(r'(\d+(?:[.,]\d+)?)', str(valor))
+        decimal_match = _DECIMAL.search(valor)
         if decimal_match:
             # Convertir coma a punto para decimales
             numero_str = decimal_match.group(1).replace(',', '.')
             return float(numero_str)
         
-        # Si no hay decimales, buscar solo enteros
-        numeros = re.findall(r'\d+', str(valor))
-        return int(numeros[0]) if numeros else 0
+        # Sin números no hay nada que convertir
+        return 0
     except (ValueError, IndexError):
         return 0
 
@@ -100,7 +132,7 @@ def convertir_a_entero_limpiar(valor):
     """
     try:
         valor_limpio = str(valor).replace('m2', '').replace('m²', '').replace('m', '').strip()
-        numeros = re.findall(r'\d+', valor_limpio)
+        numeros = _ENTERO.findall(valor_limpio)
         return int(numeros[0]) if numeros else 0
     except (ValueError, IndexError):
         return 0
@@ -117,6 +149,31 @@ def modificar_operacion(operacion):
     return limpiar_texto(operacion).title()
 
 
+# Patrones de poblaciones especiales fusionados en una sola expresión por población.
+# Todas las alternativas contienen la palabra clave, que se comprueba antes como
+# subcadena para descartar sin regex la gran mayoría de descripciones.
+_PAS_DE_LA_CASA = re.compile('|'.join([
+    r'pas\s+de\s+la\s+casa',  # "Pas de la Casa" (principal)
+    r'pas\s+casa',            # "Pas Casa" (abreviado)
+    r'paso\s+de\s+la\s+casa', # "Paso de la Casa" (español)
+    r'paso\s+casa',           # "Paso Casa" (español abreviado)
+    r'pas\s+de\s+casa',       # "Pas de Casa" (sin "la")
+]))
+
+_ARINSAL = re.compile('|'.join([
+    r'\barinsal\b',           # "Arinsal" como palabra completa
+    r'estació\s+arinsal',     # "estació Arinsal"
+    r'estacion\s+arinsal',    # "estacion Arinsal"
+    r'pistes\s+arinsal',      # "pistes Arinsal"
+    r'pistas\s+arinsal',      # "pistas Arinsal"
+]))
+
+_BORDES = re.compile('|'.join([
+    r"bordes\s+d[\'']?envalira",  # "Bordes d'Envalira"
+    r'bordes\s+de\s+envalira',    # "Bordes de Envalira"
+    r'bordes\s+envalira',         # "Bordes Envalira"
+    r'\bbordes\b',                # "Bordes" como palabra completa
+]))
 
 def detectar_pas_de_la_casa(texto):
     """
@@ -128,22 +185,9 @@ def detectar_pas_de_la_casa(texto):
     
     # Normalizar texto para búsqueda case-insensitive
     texto_normalizado = texto.lower()
-    
-    # Patrones para detectar SOLO referencias específicas a Pas de la Casa
-    patrones = [
-        r'pas\s+de\s+la\s+casa',  # "Pas de la Casa" (principal)
-        r'pas\s+casa',            # "Pas Casa" (abreviado)
-        r'paso\s+de\s+la\s+casa', # "Paso de la Casa" (español)
-        r'paso\s+casa',           # "Paso Casa" (español abreviado)
-        r'pas\s+de\s+casa',       # "Pas de Casa" (sin "la")
-    ]
-    
-    # Buscar cualquiera de los patrones
-    for patron in patrones:
-        if re.search(patron, texto_normalizado):
-            return True
-    
-    return False
+    if 'casa' not in texto_normalizado:
+        return False
+    return _PAS_DE_LA_CASA.search(texto_normalizado) is not None
 
 def detectar_arinsal(texto):
     """
@@ -155,22 +199,9 @@ def detectar_arinsal(texto):
     
     # Normalizar texto para búsqueda case-insensitive
     texto_normalizado = texto.lower()
-    
-    # Patrones para detectar referencias específicas a Arinsal
-    patrones = [
-        r'\barinsal\b',           # "Arinsal" como palabra completa
-        r'estació\s+arinsal',     # "estació Arinsal"
-        r'estacion\s+arinsal',    # "estacion Arinsal"
-        r'pistes\s+arinsal',      # "pistes Arinsal"
-        r'pistas\s+arinsal',      # "pistas Arinsal"
-    ]
-    
-    # Buscar cualquiera de los patrones
-    for patron in patrones:
-        if re.search(patron, texto_normalizado):
-            return True
-    
-    return False
+    if 'arinsal' not in texto_normalizado:
+        return False
+    return _ARINSAL.search(texto_normalizado) is not None
 
 def detectar_bordes(texto):
     """
@@ -182,18 +213,32 @@ def detectar_bordes(texto):
     
     # Normalizar texto para búsqueda case-insensitive
     texto_normalizado = texto.lower()
-    
-    # Patrones para detectar referencias específicas a Bordes
-    patrones = [
-        r"bordes\s+d[\'']?envalira",  # "Bordes d'Envalira"
-        r'bordes\s+de\s+envalira',    # "Bordes de Envalira"
-        r'bordes\s+envalira',         # "Bordes Envalira"
-        r'\bbordes\b',                # "Bordes" como palabra completa
-    ]
-    
-    # Buscar cualquiera de los patrones
-    for patron in patrones:
-        if re.search(patron, texto_normalizado):
-            return True
-    
-    return False
\ No newline at end of file
+    if 'bordes' not in texto_normalizado:
+        return False
+    return _BORDES.search(texto_normalizado) is not None
+
+
+def _aplicar_lote(funcion, valores):
+    """
+    Aplica funcion a una lista o a una pandas Series; en una Series cada
+    valor distinto se calcula una sola vez.
+    """
+    if hasattr(valores, 'unique') and hasattr(valores, 'map'):
+        resultados = {}
+        for valor in valores.unique():
+            if isinstance(valor, str):
+                resultados[valor] = funcion(valor)
+        return valores.map(lambda valor: resultados[valor] if isinstance(valor, str) else funcion(valor))
+    return [funcion(valor) for valor in valores]
+
+def limpiar_textos(valores):
+    """limpiar_texto sobre una lista o Series"""
+    return _aplicar_lote(limpiar_texto, valores)
+
+def extraer_precios(valores):
+    """extraer_precio sobre una lista o Series"""
+    return _aplicar_lote(extraer_precio, valores)
+
+def convertir_a_enteros(valores):
+    """convertir_a_entero sobre una lista o Series"""
+    return _aplicar_lote(convertir_a_entero, valores)
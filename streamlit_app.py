@@ -8,6 +8,8 @@ from datetime import datetime
 import time
 import hashlib
 
+from src.utils import gazetteer
+
 # Configuración de la página
 st.set_page_config(
     page_title="Propiedades en Andorra",
@@ -39,28 +41,12 @@ def load_data_force_no_cache():
         
         # Limpieza de datos
         if not df.empty:
-            # Filtrar SOLO ubicaciones de Andorra país (usando todas las parroquias y ciudades)
-            andorra_keywords = [
-                'Andorra la Vella', 'Escaldes-Engordany', 'Encamp', 'Ordino', 
-                'Canillo', 'La Massana', 'Sant Julia de Loria'
-            ]
-            
-            # Crear filtro para Andorra (incluir variantes y subcategorías)
-            andorra_pattern = '|'.join([
-                r'andorra\s+la\s+vella',
-                r'escaldes[-\s]*engordany', 
-                r'encamp',
-                r'ordino',
-                r'canillo',
-                r'la\s+massana',
-                r'sant\s+julia'
-            ])
-            
-            df = df[df['location'].str.contains(andorra_pattern, case=False, na=False, regex=True)]
+            # Filtrar SOLO ubicaciones de Andorra país (parroquias y poblaciones del gazetteer)
+            df['poblacion'] = df['location'].map(gazetteer.dashboard_location)
+            df = df[df['poblacion'].notna()]
             
             # Excluir explícitamente "Pas de la Casa" 
-            pas_casa_pattern = r'pas\s+de\s+la\s+casa'
-            df = df[~df['location'].str.contains(pas_casa_pattern, case=False, na=False, regex=True)]
+            df = df[df['poblacion'] != 'Pas de la Casa']
             
             # FILTRO PRINCIPAL: Solo propiedades de VENTA entre 10,000€ y 450,000€
             df = df[(df['price'] >= 10000) & (df['price'] <= 450000)]
@@ -135,33 +121,9 @@ def load_data_force_no_cache():
                 else:
                     return "Otros"
             
-            # ===== PROCESAMIENTO DE UBICACIONES DENTRO DEL CACHÉ =====
-            def clean_location_cached(location):
-                """Extrae el nombre principal de la población - dentro del caché"""
-                if pd.isna(location):
-                    return "Desconocida"
-                
-                main_locations = {
-                    'Andorra la Vella': ['andorra la vella', 'andorra_la_vella'],
-                    'Escaldes-Engordany': ['escaldes', 'engordany'],
-                    'Encamp': ['encamp'],
-                    'Ordino': ['ordino'],
-                    'Canillo': ['canillo', 'tarter'],
-                    'La Massana': ['massana'],
-                    'Sant Julia de Loria': ['sant julia', 'julia']
-                }
-                
-                location_lower = location.lower()
-                for main_loc, keywords in main_locations.items():
-                    if any(keyword in location_lower for keyword in keywords):
-                        return main_loc
-                
-                return location
-            
             # APLICAR TRANSFORMACIONES SIN CACHÉ
             print(f"🔄 Processing {len(df)} properties - Sept 27, 2025")
             df['tipo_propiedad'] = df['title'].apply(clean_title_cached)
-            df['poblacion'] = df['location'].apply(clean_location_cached)
             
             # Debug: mostrar algunos ejemplos del mapeo
             sample_mappings = df[['title', 'tipo_propiedad']].head(10)